@@ -4,16 +4,22 @@ Defines the core agent structure and interface.
 """
 from typing import Any, Dict, List, Optional
 import uuid
-from datetime import datetime
+
+from common.compact import SymbolField, TimestampField, now, to_iso
 
 class BaseAgent:
+    __slots__ = ('id', 'name', 'persona', 'skills', '_created_at', '_status')
+
+    status = SymbolField()
+    created_at = TimestampField()
+
     def __init__(self, name: str, persona: 'Persona', skills: Optional[List[str]] = None):
         self.id = str(uuid.uuid4())
         self.name = name
         self.persona = persona
         self.skills = skills or []
-        self.created_at = datetime.now()
-        self.status = 'offline'
+        self._created_at = now()
+        self._status = 'offline'
 
     def act(self, input_data: Any) -> Any:
         """Perform the agent's main action. To be implemented by subclasses."""
@@ -29,5 +35,5 @@ class BaseAgent:
             'persona': self.persona.get_info() if self.persona else None,
             'skills': self.skills,
             'status': self.status,
-            'created_at': self.created_at.isoformat(),
+            'created_at': to_iso(self._created_at),
         }
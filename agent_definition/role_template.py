@@ -2,7 +2,7 @@
 RoleTemplate class for the Creation AI Ecosystem.
 Represents predefined roles with required skills and responsibilities.
 """
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, FrozenSet, Iterable, List
 import uuid
 from datetime import datetime
 
@@ -18,6 +18,23 @@ class RoleTemplate:
         self.metadata: Dict[str, Any] = {}
         self.category = "General"
 
+    @property
+    def skills_required(self) -> List[str]:
+        return self._skills_required
+
+    @skills_required.setter
+    def skills_required(self, skills: List[str]) -> None:
+        self._skills_required = skills
+        self._required_skills = None
+
+    @property
+    def required_skills(self) -> FrozenSet[str]:
+        """skills_required as a frozenset, cached until a required skill is added, removed or reassigned."""
+        required = self._required_skills
+        if required is None:
+            required = self._required_skills = frozenset(self._skills_required)
+        return required
+
     def add_responsibility(self, responsibility: str) -> None:
         if responsibility not in self.responsibilities:
             self.responsibilities.append(responsibility)
@@ -33,11 +50,13 @@ class RoleTemplate:
     def add_required_skill(self, skill_name: str) -> None:
         if skill_name not in self.skills_required:
             self.skills_required.append(skill_name)
+            self._required_skills = None
             self.updated_at = datetime.now()
 
     def remove_required_skill(self, skill_name: str) -> bool:
         if skill_name in self.skills_required:
             self.skills_required.remove(skill_name)
+            self._required_skills = None
             self.updated_at = datetime.now()
             return True
         return False
@@ -50,8 +69,8 @@ class RoleTemplate:
         self.metadata[key] = value
         self.updated_at = datetime.now()
 
-    def is_compatible_with_agent(self, agent_skills: Set[str]) -> bool:
-        return set(self.skills_required).issubset(agent_skills)
+    def is_compatible_with_agent(self, agent_skills: Iterable[str]) -> bool:
+        return self.required_skills.issubset(agent_skills)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
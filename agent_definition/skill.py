@@ -2,10 +2,37 @@
 Skill class for the Creation AI Ecosystem.
 Represents agent capabilities, proficiency, and techniques.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Mapping, Optional, Tuple
+from types import MappingProxyType
+import weakref
+
+from common.compact import symbol
+
+# Attributes whose change alters the closure of the skill and of every skill containing it.
+CLOSURE_ATTRIBUTES = ('skill_name', 'proficiency_level', 'sub_skills')
+
+ClosureEntry = Tuple[int, Optional[str]]  # (depth, proficiency); plain skill names have no proficiency
+Closure = Mapping[str, ClosureEntry]
+
 
 class Skill:
+    """
+    A skill and its tree of sub-skills. closure() flattens the tree into a
+    mapping of every skill name in it to the depth and proficiency of its
+    shallowest occurrence; it is computed once and cached until the tree
+    below changes. Sub-skills keep weak references to the skills containing
+    them, so add_sub_skill()/remove_sub_skill(), reassigning sub_skills, or
+    renaming a skill or changing its proficiency clears the cached closures
+    of exactly that skill and its ancestors. Lists changed in place
+    (skill.sub_skills.append(...)) are not seen: call invalidate() afterwards.
+
+    Sub-skill trees are walked with explicit stacks, so to_dict() and
+    from_dict() handle trees of any depth.
+    """
     def __init__(self, skill_name: str, proficiency_level: str, description: str = ""):
+        self._closure: Optional[Closure] = None
+        self._watched = False  # some cached closure includes this skill
+        self._parents: List[weakref.ref] = []
         self.skill_name = skill_name
         self.proficiency_level = proficiency_level
         self.description = description
@@ -13,16 +40,95 @@ class Skill:
         self.techniques: List[str] = []
         self.metadata: Dict[str, Any] = {}
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in CLOSURE_ATTRIBUTES:
+            if name == 'sub_skills':
+                for sub_skill in self.__dict__.get('sub_skills', ()):
+                    sub_skill._detach(self)
+                for sub_skill in value:
+                    self._check_acyclic(sub_skill)
+                    sub_skill._attach(self)
+            elif name == 'skill_name':
+                value = symbol(value)
+            object.__setattr__(self, name, value)
+            self.invalidate()
+            return
+        object.__setattr__(self, name, value)
+
+    def invalidate(self) -> None:
+        """Drop the cached closures of this skill and of every skill containing it."""
+        stack = [self]
+        while stack:
+            skill = stack.pop()
+            if skill._closure is None and not skill._watched:
+                # Nothing above was computed from this skill since it was last cleared.
+                continue
+            skill._closure = None
+            skill._watched = False
+            stack.extend(parent for parent in (ref() for ref in skill._parents) if parent is not None)
+
+    def _attach(self, parent: 'Skill') -> None:
+        self._parents = [ref for ref in self._parents if ref() is not None]
+        if not any(ref() is parent for ref in self._parents):
+            self._parents.append(weakref.ref(parent))
+
+    def _detach(self, parent: 'Skill') -> None:
+        self._parents = [ref for ref in self._parents if ref() is not None and ref() is not parent]
+
+    def _check_acyclic(self, sub_skill: 'Skill') -> None:
+        if sub_skill is self or any(skill is self for skill in sub_skill.walk()):
+            raise ValueError(f"Skill {self.skill_name} cannot contain itself")
+
     def add_sub_skill(self, sub_skill: 'Skill') -> None:
+        self._check_acyclic(sub_skill)
         self.sub_skills.append(sub_skill)
+        sub_skill._attach(self)
+        self.invalidate()
 
     def remove_sub_skill(self, sub_skill_name: str) -> bool:
         for s in self.sub_skills:
             if s.skill_name == sub_skill_name:
                 self.sub_skills.remove(s)
+                if not any(other is s for other in self.sub_skills):
+                    s._detach(self)
+                self.invalidate()
                 return True
         return False
 
+    def walk(self) -> Iterable['Skill']:
+        """Every skill below this one, depth first. Skills shared by several branches appear once."""
+        stack, seen = list(reversed(self.sub_skills)), set()
+        while stack:
+            skill = stack.pop()
+            if id(skill) in seen:
+                continue
+            seen.add(id(skill))
+            yield skill
+            stack.extend(reversed(skill.sub_skills))
+
+    def closure(self) -> Closure:
+        """Read-only {skill name: (depth, proficiency)} of this skill (depth 0) and every skill below it."""
+        closure = self._closure
+        if closure is None:
+            flat: Dict[str, ClosureEntry] = {}
+            level, depth, seen = [self], 0, set()
+            while level:  # breadth first, so the first occurrence of a name is the shallowest
+                following = []
+                for skill in level:
+                    if id(skill) in seen:
+                        continue
+                    seen.add(id(skill))
+                    skill._watched = True
+                    flat.setdefault(skill.skill_name, (depth, skill.proficiency_level))
+                    following.extend(skill.sub_skills)
+                level, depth = following, depth + 1
+            closure = self._closure = MappingProxyType(flat)
+        return closure
+
+    def has_skill(self, skill_name: str) -> bool:
+        """Whether this skill or any skill below it is named `skill_name`."""
+        return skill_name in self.closure()
+
     def add_technique(self, technique: str) -> None:
         self.techniques.append(technique)
 
@@ -35,23 +141,75 @@ class Skill:
     def add_metadata(self, key: str, value: Any) -> None:
         self.metadata[key] = value
 
-    def to_dict(self) -> Dict[str, Any]:
+    def _fields(self) -> Dict[str, Any]:
         return {
             'skill_name': self.skill_name,
             'proficiency_level': self.proficiency_level,
             'description': self.description,
-            'sub_skills': [s.to_dict() for s in self.sub_skills],
+            'sub_skills': [],
             'techniques': self.techniques,
             'metadata': self.metadata
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        data = self._fields()
+        stack = [(self, data)]
+        while stack:
+            skill, skill_data = stack.pop()
+            for sub_skill in skill.sub_skills:
+                sub_data = sub_skill._fields()
+                skill_data['sub_skills'].append(sub_data)
+                stack.append((sub_skill, sub_data))
+        return data
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Skill':
-        skill = cls(data['skill_name'], data['proficiency_level'], data.get('description', ""))
-        skill.sub_skills = [cls.from_dict(s) for s in data.get('sub_skills', [])]
-        skill.techniques = data.get('techniques', [])
-        skill.metadata = data.get('metadata', {})
-        return skill
+        def build(item: Dict[str, Any]) -> 'Skill':
+            skill = cls(item['skill_name'], item['proficiency_level'], item.get('description', ""))
+            skill.techniques = item.get('techniques', [])
+            skill.metadata = item.get('metadata', {})
+            return skill
+
+        root = build(data)
+        stack = [(root, data)]
+        while stack:
+            skill, item = stack.pop()
+            sub_skills = [build(s) for s in item.get('sub_skills', [])]
+            # New skills: no closure to clear and no cycle to check.
+            object.__setattr__(skill, 'sub_skills', sub_skills)
+            for sub_skill in sub_skills:
+                sub_skill._attach(skill)
+            stack.extend(zip(sub_skills, item.get('sub_skills', [])))
+        return root
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Weak references cannot be pickled; parent links and closures are rebuilt on load.
+        state = dict(self.__dict__)
+        state['_closure'] = None
+        state['_watched'] = False
+        state['_parents'] = []
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        for sub_skill in self.sub_skills:
+            sub_skill._attach(self)
 
     def __str__(self) -> str:
         return f"Skill({self.skill_name}, {self.proficiency_level})"
+
+
+def skill_closure(skills: Iterable[Any]) -> Dict[str, ClosureEntry]:
+    """
+    Merged closure of a skill list holding Skill objects or plain names
+    (as BaseAgent.skills does); plain names get depth 0 and no proficiency.
+    """
+    merged: Dict[str, ClosureEntry] = {}
+    for skill in skills:
+        if isinstance(skill, Skill):
+            for name, entry in skill.closure().items():
+                if name not in merged or entry[0] < merged[name][0]:
+                    merged[name] = entry
+        else:
+            merged[symbol(skill)] = (0, None)
+    return merged
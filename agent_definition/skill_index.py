@@ -0,0 +1,235 @@
+"""
+SkillIndex class for the Creation AI Ecosystem.
+Packed skill bitsets of agents and role templates, answering which agents can
+fill a role and which roles fit an agent with vectorized subset checks.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import threading
+
+import numpy as np
+
+from .skill import skill_closure
+
+WORD_BITS = 64
+CHUNK_CELLS = 1 << 22  # agent x role cells compared per step of compatibility()
+
+
+def skill_names(skills: Iterable[Any]) -> List[str]:
+    """Names in a skill list holding skill name strings or Skill objects, with every sub-skill of the latter."""
+    return list(skill_closure(skills))
+
+
+class BitsetTable:
+    """
+    One packed bitset row per id, in a uint64 array that grows by doubling.
+    Removed rows are zeroed and reused.
+    """
+    def __init__(self, words: int = 1):
+        self.bits = np.zeros((16, words), dtype=np.uint64)
+        self.live = np.zeros(16, dtype=bool)
+        self.ids: List[Optional[str]] = [None] * 16
+        self.rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def widen(self, words: int) -> None:
+        if words > self.bits.shape[1]:
+            self.bits = np.pad(self.bits, ((0, 0), (0, words - self.bits.shape[1])))
+
+    def set(self, obj_id: str, bitset: np.ndarray) -> None:
+        row = self.rows.get(obj_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                if self._size == len(self.live):
+                    capacity = 2 * self._size
+                    self.bits = np.resize(self.bits, (capacity, self.bits.shape[1]))
+                    self.bits[self._size:] = 0
+                    self.live = np.concatenate([self.live, np.zeros(self._size, dtype=bool)])
+                    self.ids.extend([None] * self._size)
+                row = self._size
+                self._size += 1
+            self.rows[obj_id] = row
+            self.ids[row] = obj_id
+            self.live[row] = True
+        self.bits[row, :len(bitset)] = bitset
+        self.bits[row, len(bitset):] = 0
+
+    def remove(self, obj_id: str) -> bool:
+        row = self.rows.pop(obj_id, None)
+        if row is None:
+            return False
+        self.bits[row] = 0
+        self.live[row] = False
+        self.ids[row] = None
+        self._free.append(row)
+        return True
+
+    def view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(row numbers, bitsets) of the live rows."""
+        rows = np.flatnonzero(self.live[:self._size])
+        return rows, self.bits[rows]
+
+    def names(self, rows: np.ndarray) -> List[str]:
+        return [self.ids[row] for row in rows.tolist()]
+
+
+class SkillIndex:
+    """
+    Skill names are interned to integer ids, and every agent's skills and
+    every role's required skills are kept as a bitset of those ids packed
+    into uint64 words. "Has every required skill" is then
+    `required & ~skills == 0` on each word, evaluated for all rows at once.
+
+    Agents and roles are added with add_agent()/add_role() and updated by
+    adding them again. Given a storage, the index also follows its change
+    log and applies agent stores and deletes before each query, so agents
+    only need to be stored again after their skills change.
+    """
+    def __init__(self, storage: Any = None):
+        self.storage = storage
+        self._lock = threading.RLock()
+        self.skill_ids: Dict[str, int] = {}
+        self.skills: List[str] = []
+        self.agents = BitsetTable()
+        self.roles = BitsetTable()
+        if storage is not None:
+            self.rebuild()
+
+    # --- skill vocabulary ---
+
+    def intern(self, skill: Any) -> int:
+        """Integer id of a skill name or Skill object, assigning the next one for new names."""
+        name = getattr(skill, 'skill_name', skill)
+        skill_id = self.skill_ids.get(name)
+        if skill_id is None:
+            skill_id = self.skill_ids[name] = len(self.skills)
+            self.skills.append(name)
+            words = -(-len(self.skills) // WORD_BITS)
+            self.agents.widen(words)
+            self.roles.widen(words)
+        return skill_id
+
+    def encode(self, skills: Iterable[Any]) -> np.ndarray:
+        """Packed bitset of the given skills and their sub-skills."""
+        ids = np.fromiter((self.intern(name) for name in skill_names(skills)), dtype=np.int64)
+        words = np.zeros(self.agents.bits.shape[1], dtype=np.uint64)
+        np.bitwise_or.at(words, ids // WORD_BITS, np.left_shift(np.uint64(1), (ids % WORD_BITS).astype(np.uint64)))
+        return words
+
+    def decode(self, bitset: np.ndarray) -> List[str]:
+        bits = np.unpackbits(bitset.astype('<u8').view(np.uint8), bitorder='little')
+        return [self.skills[i] for i in np.flatnonzero(bits[:len(self.skills)])]
+
+    # --- updates ---
+
+    def add_agent(self, agent: Any) -> None:
+        """Index an agent's skills, replacing what was indexed for it before."""
+        with self._lock:
+            self.agents.set(agent.id, self.encode(agent.skills or ()))
+
+    def remove_agent(self, agent_id: str) -> bool:
+        with self._lock:
+            return self.agents.remove(agent_id)
+
+    def add_role(self, role: Any) -> None:
+        """Index a RoleTemplate's required skills, replacing what was indexed for it before."""
+        with self._lock:
+            self.roles.set(role.id, self.encode(role.required_skills))
+
+    def remove_role(self, role_id: str) -> bool:
+        with self._lock:
+            return self.roles.remove(role_id)
+
+    def rebuild(self) -> None:
+        """Re-index every stored agent."""
+        with self._lock:
+            self._position = self.storage.change_log.last_sequence
+            self._epoch = self.storage.change_log.epoch
+            self.agents = BitsetTable(self.agents.bits.shape[1])
+            for agent in self.storage.list_agents():
+                self.add_agent(agent)
+
+    def sync(self) -> None:
+        """Apply agent changes made in storage since the last sync."""
+        if self.storage is None:
+            return
+        with self._lock:
+            change_log = self.storage.change_log
+            try:
+                if change_log.epoch != self._epoch:
+                    raise KeyError(change_log.epoch)
+                changes = change_log.since(self._position)
+            except KeyError:
+                self.rebuild()
+                return
+            for change in changes:
+                self._position = change.sequence
+                if change.repository != 'agent_repository':
+                    continue
+                if change.op == 'store':
+                    self.add_agent(change.obj)
+                else:
+                    self.agents.remove(change.id)
+
+    # --- queries ---
+
+    def agents_with_skills(self, skills: Iterable[Any]) -> List[str]:
+        """Ids of the agents having every one of `skills`."""
+        with self._lock:
+            self.sync()
+            return self._covering(self.encode(skills))
+
+    def agents_for_role(self, role: Any) -> List[str]:
+        """Ids of the agents having every skill a RoleTemplate requires."""
+        with self._lock:
+            self.sync()
+            return self._covering(self.encode(role.required_skills))
+
+    def roles_for_agent(self, agent: Any) -> List[str]:
+        """Ids of the indexed roles whose required skills the agent all has."""
+        with self._lock:
+            self.sync()
+            skills = self.encode(agent.skills or ())
+            rows, required = self.roles.view()
+            fits = ~np.any(required & ~skills, axis=1)
+            return self.roles.names(rows[fits])
+
+    def compatibility(self) -> Tuple[List[str], List[str], np.ndarray]:
+        """
+        Agent ids, role ids, and a bool matrix whose [i, j] is True when
+        agent i has every skill role j requires.
+        """
+        with self._lock:
+            self.sync()
+            agent_rows, skills = self.agents.view()
+            role_rows, required = self.roles.view()
+            missing = ~skills
+            result = np.empty((len(agent_rows), len(role_rows)), dtype=bool)
+            step = max(1, CHUNK_CELLS // max(1, len(role_rows)))
+            for start in range(0, len(agent_rows), step):
+                chunk = missing[start:start + step]
+                fits = np.ones((len(chunk), len(role_rows)), dtype=bool)
+                for word in range(required.shape[1]):
+                    fits &= (chunk[:, word, None] & required[None, :, word]) == 0
+                result[start:start + step] = fits
+            return self.agents.names(agent_rows), self.roles.names(role_rows), result
+
+    def _covering(self, required: np.ndarray) -> List[str]:
+        rows, skills = self.agents.view()
+        fits = ~np.any(required & ~skills, axis=1)
+        return self.agents.names(rows[fits])
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            self.sync()
+            return {
+                'skills': len(self.skills),
+                'words': int(self.agents.bits.shape[1]),
+                'agents': len(self.agents),
+                'roles': len(self.roles),
+            }
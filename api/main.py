@@ -1,10 +1,23 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
 from data_storage.vector_db import DataStorage
+from data_storage.durable_storage import DurableDataStorage
+from data_storage.sqlite_storage import SQLiteDataStorage
+import asyncio
+import base64
+import binascii
+import copy
+import json
+import os
 import uuid
+import zlib
 from orchestration.orchestration_engine import OrchestrationEngine
+from project_management.assignment import Assignment
+from project_management.assignment_planner import SKILLS_KEY, AssignmentPlanner
+from project_management.serialization import encode_item, encode_items
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from datetime import timedelta, datetime
@@ -68,6 +81,7 @@ class TaskModel(BaseModel):
     subtasks: Optional[List[str]] = []
     dependencies: Optional[List[str]] = []
     tags: Optional[List[str]] = []
+    skills: Optional[List[str]] = []
 
 class AssignmentModel(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -75,6 +89,23 @@ class AssignmentModel(BaseModel):
     agent_id: str
     status: Optional[str] = "Assigned"
 
+class SubtaskModel(BaseModel):
+    id: str
+    description: str = ""
+    dependencies: List[str] = []
+    skills: List[str] = []
+    timeout: Optional[float] = Field(None, gt=0)
+
+class OrchestrationModel(BaseModel):
+    query: Optional[str] = None
+    subtasks: Optional[List[SubtaskModel]] = None
+
+class AssignmentPlanModel(BaseModel):
+    task_ids: List[str]
+    agent_ids: List[str]
+    slots: int = Field(1, ge=1)
+    dry_run: bool = False
+
 # --- FastAPI App Setup ---
 app = FastAPI(title="I-Creations Agent API", version="0.2.0")
 
@@ -87,25 +118,265 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-data_storage = DataStorage()
+# DATA_STORAGE_BACKEND selects where agents, projects, tasks and assignments live:
+#   memory  - process memory only (default without DATA_STORAGE_PATH)
+#   durable - in memory, with a write-ahead log and snapshots in the DATA_STORAGE_PATH directory
+#   sqlite  - SQLite database file at DATA_STORAGE_PATH
+DATA_STORAGE_PATH = os.environ.get("DATA_STORAGE_PATH")
+DATA_STORAGE_BACKEND = os.environ.get("DATA_STORAGE_BACKEND", "durable" if DATA_STORAGE_PATH else "memory")
+
+def create_data_storage(backend: str, path: Optional[str]):
+    if backend == "memory":
+        return DataStorage()
+    if not path:
+        raise RuntimeError(f"DATA_STORAGE_PATH is required for the '{backend}' storage backend")
+    if backend == "durable":
+        return DurableDataStorage(path)
+    if backend == "sqlite":
+        return SQLiteDataStorage(path)
+    raise RuntimeError(f"Unknown DATA_STORAGE_BACKEND '{backend}'")
+
+data_storage = create_data_storage(DATA_STORAGE_BACKEND, DATA_STORAGE_PATH)
 orchestration_engine = OrchestrationEngine()
 
+# --- Pagination ---
+# List endpoints take an opaque `cursor` and a `limit`; when more rows remain,
+# the cursor of the next page is returned in the X-Next-Cursor header. Clients
+# sending "Accept: application/x-ndjson" get one JSON object per line,
+# serialized lazily while the response streams. Responses are written from
+# the objects' cached JSON bytes (to_json()) where they have one, bypassing
+# response_model validation.
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(sequence: int) -> str:
+    return base64.urlsafe_b64encode(str(sequence).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def stream_ndjson(page: Callable, after: int, items: List[Any], next_after: Optional[int],
+                  follow: bool, filters: Dict[str, Any]) -> Iterator[bytes]:
+    while True:
+        for item in items:
+            yield encode_item(item) + b"\n"
+        if not follow or next_after is None:
+            return
+        items, next_after = page(next_after, MAX_PAGE_SIZE, **filters)
+
+def json_response(content: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=content, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+# --- Conditional GET ---
+# GET responses carry a strong ETag built from the storage version counters:
+# the object's version for single objects, the repository version plus the
+# query for lists. The version is read before the data, so a tag is never
+# newer than the body it comes with. A request whose If-None-Match holds the
+# current tag is answered 304 before anything is fetched or serialized.
+def etag(*parts: Any) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+def not_modified(request: Request, tag: Optional[str]) -> Optional[Response]:
+    header = request.headers.get("if-none-match")
+    if tag is None or not header:
+        return None
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    if "*" in tags or tag in tags:
+        return Response(status_code=304, headers={"ETag": tag})
+    return None
+
+def get_item(request: Request, repository: str, obj_id: str, get: Callable, name: str) -> Response:
+    version = data_storage.object_version(repository, obj_id)
+    tag = etag(data_storage.version_epoch, version) if version is not None else None
+    cached = not_modified(request, tag)
+    if cached is not None:
+        return cached
+    obj = get(obj_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    return json_response(encode_item(obj), {"ETag": tag} if tag else None)
+
+def list_page(request: Request, repository: str, page: Callable, cursor: Optional[str], limit: Optional[int],
+              **filters: Any):
+    """
+    One page of a repository. Without a limit, JSON responses hold every
+    remaining row and NDJSON responses stream them page by page.
+    """
+    query = f"{request.url.query}|{request.headers.get('accept', '')}".encode()
+    tag = etag(data_storage.version_epoch, data_storage.version(repository), zlib.crc32(query))
+    cached = not_modified(request, tag)
+    if cached is not None:
+        return cached
+    after = decode_cursor(cursor)
+    stream = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    items, next_after = page(after, limit or (MAX_PAGE_SIZE if stream else None), **filters)
+    headers = {"ETag": tag}
+    if limit and next_after is not None:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(next_after)
+    if stream:
+        return StreamingResponse(stream_ndjson(page, after, items, next_after, limit is None, filters),
+                                 media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    return json_response(encode_items(items), headers)
+
+# --- Batch Helpers ---
+# Batch endpoints take a JSON array, or one JSON value per line with
+# "Content-Type: application/x-ndjson". Every item is validated before
+# anything is written. With atomic=true (the default) one bad item rejects
+# the batch with 422 and the per-item errors; with atomic=false the valid
+# items are applied and every item gets its own result. Everything applied,
+# including assignment side effects, goes to storage in one apply_batch().
+MAX_BATCH_SIZE = 10000
+
+REPOSITORIES = {AgentModel: "agent_repository", TaskModel: "task_repository",
+                AssignmentModel: "assignment_repository"}
+
+class BatchItemError(Exception):
+    def __init__(self, status_code: int, detail: Any):
+        self.status_code = status_code
+        self.detail = detail
+
+async def read_batch(request: Request) -> List[Any]:
+    body = await request.body()
+    try:
+        if NDJSON_MEDIA_TYPE in request.headers.get("content-type", ""):
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body or b"[]")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid batch body: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array or NDJSON")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batches are limited to {MAX_BATCH_SIZE} items")
+    return items
+
+def parse_item(model: Type[BaseModel], item: Any) -> BaseModel:
+    if not isinstance(item, dict):
+        raise BatchItemError(422, "Expected a JSON object")
+    try:
+        return model(**item)
+    except ValidationError as e:
+        raise BatchItemError(422, e.errors())
+
+def existing_item(repository: str, item_id: Any) -> Any:
+    get = getattr(data_storage, "get_" + repository[:-len("_repository")])
+    obj = get(item_id) if isinstance(item_id, str) else None
+    if obj is None:
+        raise BatchItemError(404, "Not found")
+    return obj
+
+def run_batch(items: List[Any], plan: Callable[[Any], Tuple[str, List[Tuple[str, str, Any]]]],
+              atomic: bool, side_effects: Optional[Callable[[List[Any]], List[Tuple[str, str, Any]]]] = None):
+    """
+    Validate every item with `plan`, which returns the item's id and storage
+    operations or raises BatchItemError, then apply the valid items' operations
+    and their side effects in one storage batch.
+    """
+    results, operations, accepted = [], [], []
+    for index, item in enumerate(items):
+        try:
+            item_id, item_operations = plan(item)
+        except BatchItemError as e:
+            results.append({"index": index, "status": e.status_code, "detail": e.detail})
+            continue
+        results.append({"index": index, "id": item_id, "status": 200})
+        operations.extend(item_operations)
+        accepted.append(item_operations)
+    errors = [result for result in results if result["status"] != 200]
+    if atomic and errors:
+        raise HTTPException(status_code=422, detail={"errors": errors})
+    if side_effects is not None:
+        operations.extend(side_effects(accepted))
+    data_storage.apply_batch(operations)
+    return {"applied": len(results) - len(errors), "failed": len(errors), "results": results}
+
+def apply_update(obj: Any, update: BaseModel) -> None:
+    """Copy an update onto a stored object; domain Tasks keep their skills in metadata."""
+    values = update.dict()
+    if SKILLS_KEY in values and not hasattr(obj, SKILLS_KEY) and hasattr(obj, "metadata"):
+        obj.metadata = {**obj.metadata, SKILLS_KEY: values.pop(SKILLS_KEY)}
+    for k, v in values.items():
+        setattr(obj, k, v)
+
+def create_plan(model: Type[BaseModel]):
+    def plan(item: Any):
+        obj = parse_item(model, item)
+        return obj.id, [("store", REPOSITORIES[model], obj)]
+    return plan
+
+def update_plan(model: Type[BaseModel]):
+    def plan(item: Any):
+        if not isinstance(item, dict) or "id" not in item:
+            raise BatchItemError(422, "Updates need an id")
+        update = parse_item(model, item)
+        obj = copy.copy(existing_item(REPOSITORIES[model], update.id))
+        apply_update(obj, update)
+        return update.id, [("store", REPOSITORIES[model], obj)]
+    return plan
+
+def delete_plan(model: Type[BaseModel]):
+    def plan(item_id: Any):
+        existing_item(REPOSITORIES[model], item_id)
+        return item_id, [("delete", REPOSITORIES[model], item_id)]
+    return plan
+
+def assignment_plan(item: Any):
+    assignment = item if isinstance(item, AssignmentModel) else parse_item(AssignmentModel, item)
+    assignment_obj = Assignment.from_dict(assignment.dict())
+    assignment_obj.id = assignment.id
+    return assignment.id, [("store", "assignment_repository", assignment_obj)]
+
+def assignment_side_effects(accepted: List[List[Tuple[str, str, Any]]]) -> List[Tuple[str, str, Any]]:
+    """Mark the agents and tasks of new assignments as assigned, storing each once."""
+    agents, tasks = {}, {}
+    for item_operations in accepted:
+        for _, _, assignment in item_operations:
+            if assignment.agent_id not in agents:
+                agents[assignment.agent_id] = data_storage.get_agent(assignment.agent_id)
+            if assignment.task_id not in tasks:
+                tasks[assignment.task_id] = data_storage.get_task(assignment.task_id)
+    operations = []
+    for repository, objs in (("agent_repository", agents), ("task_repository", tasks)):
+        for obj in objs.values():
+            if obj:
+                obj = copy.copy(obj)
+                obj.status = "assigned"
+                operations.append(("store", repository, obj))
+    return operations
+
 # --- Agent Endpoints ---
 @app.get("/agents", response_model=List[AgentModel])
-def list_agents():
-    return [a.to_dict() for a in data_storage.agent_repository.values()]
+def list_agents(request: Request, cursor: Optional[str] = None,
+                limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)):
+    return list_page(request, "agent_repository", data_storage.page_agents, cursor, limit)
 
 @app.post("/agents", response_model=AgentModel)
 def create_agent(agent: AgentModel):
     data_storage.store_agent(agent)
     return agent
 
+@app.post("/agents/batch")
+def create_agents(items: List[Any] = Depends(read_batch), atomic: bool = True):
+    return run_batch(items, create_plan(AgentModel), atomic)
+
+@app.put("/agents/batch")
+def update_agents(items: List[Any] = Depends(read_batch), atomic: bool = True):
+    return run_batch(items, update_plan(AgentModel), atomic)
+
+@app.post("/agents/batch/delete")
+def delete_agents(items: List[Any] = Depends(read_batch), atomic: bool = True):
+    return run_batch(items, delete_plan(AgentModel), atomic)
+
 @app.get("/agents/{agent_id}", response_model=AgentModel)
-def get_agent(agent_id: str):
-    agent = data_storage.get_agent(agent_id)
-    if not agent:
-        raise HTTPException(status_code=404, detail="Agent not found")
-    return agent.to_dict()
+def get_agent(agent_id: str, request: Request):
+    return get_item(request, "agent_repository", agent_id, data_storage.get_agent, "Agent")
 
 @app.put("/agents/{agent_id}", response_model=AgentModel)
 def update_agent(agent_id: str, agent_update: AgentModel):
@@ -125,8 +396,9 @@ def delete_agent(agent_id: str):
 
 # --- Project Endpoints ---
 @app.get("/projects", response_model=List[ProjectModel])
-def list_projects():
-    return [p.to_dict() for p in data_storage.project_repository.values()]
+def list_projects(request: Request, cursor: Optional[str] = None,
+                limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)):
+    return list_page(request, "project_repository", data_storage.page_projects, cursor, limit)
 
 @app.post("/projects", response_model=ProjectModel)
 def create_project(project: ProjectModel):
@@ -134,11 +406,8 @@ def create_project(project: ProjectModel):
     return project
 
 @app.get("/projects/{project_id}", response_model=ProjectModel)
-def get_project(project_id: str):
-    project = data_storage.get_project(project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return project.to_dict()
+def get_project(project_id: str, request: Request):
+    return get_item(request, "project_repository", project_id, data_storage.get_project, "Project")
 
 @app.put("/projects/{project_id}", response_model=ProjectModel)
 def update_project(project_id: str, project_update: ProjectModel):
@@ -158,28 +427,39 @@ def delete_project(project_id: str):
 
 # --- Task Endpoints ---
 @app.get("/tasks", response_model=List[TaskModel])
-def list_tasks():
-    return [t.to_dict() for t in data_storage.list_tasks()]
+def list_tasks(request: Request, status: Optional[str] = None,
+               priority: Optional[str] = None, tag: Optional[str] = None, cursor: Optional[str] = None,
+               limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)):
+    return list_page(request, "task_repository", data_storage.page_tasks, cursor, limit,
+                     status=status, priority=priority, tag=tag)
 
 @app.post("/tasks", response_model=TaskModel)
 def create_task(task: TaskModel):
     data_storage.store_task(task)
     return task
 
+@app.post("/tasks/batch")
+def create_tasks(items: List[Any] = Depends(read_batch), atomic: bool = True):
+    return run_batch(items, create_plan(TaskModel), atomic)
+
+@app.put("/tasks/batch")
+def update_tasks(items: List[Any] = Depends(read_batch), atomic: bool = True):
+    return run_batch(items, update_plan(TaskModel), atomic)
+
+@app.post("/tasks/batch/delete")
+def delete_tasks(items: List[Any] = Depends(read_batch), atomic: bool = True):
+    return run_batch(items, delete_plan(TaskModel), atomic)
+
 @app.get("/tasks/{task_id}", response_model=TaskModel)
-def get_task(task_id: str):
-    task = data_storage.get_task(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    return task.to_dict()
+def get_task(task_id: str, request: Request):
+    return get_item(request, "task_repository", task_id, data_storage.get_task, "Task")
 
 @app.put("/tasks/{task_id}", response_model=TaskModel)
 def update_task(task_id: str, task_update: TaskModel):
     task = data_storage.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    for k, v in task_update.dict().items():
-        setattr(task, k, v)
+    apply_update(task, task_update)
     data_storage.store_task(task)
     return task.to_dict()
 
@@ -191,47 +471,156 @@ def delete_task(task_id: str):
 
 # --- Assignment Endpoints ---
 @app.get("/assignments", response_model=List[AssignmentModel])
-def list_assignments():
-    return [a.to_dict() for a in data_storage.list_assignments()]
+def list_assignments(request: Request, agent_id: Optional[str] = None,
+                     task_id: Optional[str] = None, status: Optional[str] = None,
+                     cursor: Optional[str] = None, limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)):
+    return list_page(request, "assignment_repository", data_storage.page_assignments, cursor, limit,
+                     agent_id=agent_id, task_id=task_id, status=status)
 
 @app.get("/assignments/{assignment_id}", response_model=AssignmentModel)
-def get_assignment(assignment_id: str):
-    assignment = data_storage.get_assignment(assignment_id)
-    if not assignment:
-        raise HTTPException(status_code=404, detail="Assignment not found")
-    return assignment.to_dict()
+def get_assignment(assignment_id: str, request: Request):
+    return get_item(request, "assignment_repository", assignment_id, data_storage.get_assignment, "Assignment")
 
 @app.post("/assignments", response_model=AssignmentModel)
 def create_assignment(assignment: AssignmentModel, user=Depends(get_current_user)):
-    from assignment import Assignment
-    assignment_obj = Assignment.from_dict(assignment.dict())
-    data_storage.store_assignment(assignment_obj)
-    agent = data_storage.get_agent(assignment.agent_id)
-    if agent:
-        agent.status = "assigned"
-        data_storage.store_agent(agent)
-    task = data_storage.get_task(assignment.task_id)
-    if task:
-        task.status = "assigned"
-        data_storage.store_task(task)
+    _, operations = assignment_plan(assignment)
+    data_storage.apply_batch(operations + assignment_side_effects([operations]))
     return assignment
 
+@app.post("/assignments/batch")
+def create_assignments(items: List[Any] = Depends(read_batch), atomic: bool = True,
+                       user=Depends(get_current_user)):
+    return run_batch(items, assignment_plan, atomic, assignment_side_effects)
+
+@app.post("/assignments/plan")
+def plan_assignments(request: AssignmentPlanModel, user=Depends(get_current_user)):
+    """Match the tasks to the agents at minimum cost and create the assignments, unless dry_run."""
+    tasks = [data_storage.get_task(task_id) for task_id in request.task_ids]
+    agents = [data_storage.get_agent(agent_id) for agent_id in request.agent_ids]
+    missing = [i for i, obj in zip(request.task_ids + request.agent_ids, tasks + agents) if obj is None]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Not found: {', '.join(missing)}")
+    assignments = AssignmentPlanner(data_storage).plan(tasks, agents, request.slots)
+    if not request.dry_run:
+        operations = [("store", "assignment_repository", a) for a in assignments]
+        data_storage.apply_batch(operations + assignment_side_effects([operations]))
+    return [a.to_dict() for a in assignments]
+
+@app.put("/assignments/batch")
+def update_assignments(items: List[Any] = Depends(read_batch), atomic: bool = True,
+                       user=Depends(get_current_user)):
+    return run_batch(items, update_plan(AssignmentModel), atomic)
+
+@app.post("/assignments/batch/delete")
+def delete_assignments(items: List[Any] = Depends(read_batch), atomic: bool = True):
+    return run_batch(items, delete_plan(AssignmentModel), atomic)
+
 @app.delete("/assignments/{assignment_id}")
 def delete_assignment(assignment_id: str):
     if not data_storage.delete_assignment(assignment_id):
         raise HTTPException(status_code=404, detail="Assignment not found")
     return {"result": "deleted"}
 
+# --- Change Feed ---
+# GET /changes streams every store and delete as Server-Sent Events, and
+# /changes/ws sends the same events as JSON over a WebSocket. Event ids are
+# "<epoch>:<sequence>"; a client resumes by sending the last id it saw as
+# Last-Event-ID (or ?after=), and without one it starts at the current end.
+# Consumers only hold a position in the storage change log, so a slow client
+# costs no memory: once it falls out of the log, or resumes from another
+# epoch (the server restarted), it gets a "resync" event and should re-list
+# the resources before continuing from that event's id.
+CHANGE_FEED_BATCH = 500
+CHANGE_FEED_POLL_SECONDS = 0.25
+CHANGE_FEED_HEARTBEAT_SECONDS = 15.0
+RESOURCES = {"agent_repository": "agents", "project_repository": "projects",
+             "task_repository": "tasks", "assignment_repository": "assignments"}
+
+def change_position(change_log: Any, after: Optional[str]) -> Optional[int]:
+    """Sequence to resume after, or None if the client has to resync."""
+    if not after:
+        return change_log.last_sequence
+    epoch, _, sequence = after.rpartition(":")
+    if epoch != change_log.epoch or not sequence.isdigit():
+        return None
+    return int(sequence)
+
+async def change_events(resources: Set[str], after: Optional[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Change and resync events after a position; a heartbeat event while idle."""
+    change_log = data_storage.change_log
+    position = change_position(change_log, after)
+    idle = 0.0
+    while True:
+        if position is None:
+            position = change_log.last_sequence
+            yield {"event": "resync", "id": f"{change_log.epoch}:{position}"}
+        try:
+            changes = change_log.since(position, CHANGE_FEED_BATCH)
+        except KeyError:
+            position = None
+            continue
+        if not changes:
+            await asyncio.sleep(CHANGE_FEED_POLL_SECONDS)
+            idle += CHANGE_FEED_POLL_SECONDS
+            if idle >= CHANGE_FEED_HEARTBEAT_SECONDS:
+                idle = 0.0
+                yield {"event": "heartbeat", "id": f"{change_log.epoch}:{position}"}
+            continue
+        idle = 0.0
+        for change in changes:
+            position = change.sequence
+            resource = RESOURCES[change.repository]
+            if resources and resource not in resources:
+                continue
+            yield {"event": "change", "id": f"{change_log.epoch}:{change.sequence}", "op": change.op,
+                   "resource": resource, "item_id": change.id,
+                   "data": json.loads(encode_item(change.obj)) if change.obj is not None else None}
+
+async def server_sent_events(events: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for event in events:
+        if event["event"] == "heartbeat":
+            yield b": heartbeat\n\n"
+        else:
+            data = json.dumps(event, default=str)
+            yield f"event: {event['event']}\nid: {event['id']}\ndata: {data}\n\n".encode()
+
+@app.get("/changes")
+def change_feed(request: Request, after: Optional[str] = None, resource: Optional[List[str]] = Query(None)):
+    after = after or request.headers.get("last-event-id")
+    return StreamingResponse(server_sent_events(change_events(set(resource or ()), after)),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.websocket("/changes/ws")
+async def change_feed_ws(websocket: WebSocket, after: Optional[str] = None,
+                         resource: Optional[List[str]] = Query(None)):
+    await websocket.accept()
+    try:
+        async for event in change_events(set(resource or ()), after):
+            await websocket.send_text(json.dumps(event, default=str))
+    except WebSocketDisconnect:
+        pass
+
 # --- Orchestration Endpoints ---
 @app.post("/orchestrate")
-def orchestrate(payload: Dict[str, Any], user=Depends(get_current_user)):
-    query = payload.get("query")
-    if not query:
+async def orchestrate(payload: OrchestrationModel, user=Depends(get_current_user)):
+    """
+    Plan a query (or the given "subtasks") over the stored agents and run it; steps run concurrently.
+    Stored agents act through the engine's agent with the same id, and the request is rejected
+    when none of them can act.
+    """
+    if not payload.query:
         raise HTTPException(status_code=400, detail="Missing query")
-    agents = list(data_storage.agent_repository.values())
-    plan = orchestration_engine.create_execution_plan(query, agents)
-    result = orchestration_engine.execute_plan(plan)
-    return {"plan": plan, "result": result}
+    agents = orchestration_engine.resolve_agents(data_storage.list_agents())
+    if not agents:
+        raise HTTPException(status_code=400, detail="No stored agent can act")
+    subtasks = [subtask.dict() for subtask in payload.subtasks] if payload.subtasks is not None else None
+    try:
+        plan = orchestration_engine.create_execution_plan(payload.query, agents, subtasks)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    plan = await orchestration_engine.run_plan(plan["id"])
+    return {"plan": plan, "result": {step["id"]: step["result"] for step in plan["steps"]}}
 
 # --- Auth Endpoints ---
 @app.post("/token")
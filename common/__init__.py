@@ -0,0 +1 @@
+# This file marks the common directory as a Python package.
@@ -0,0 +1,101 @@
+"""
+Compact field helpers for the Creation AI Ecosystem.
+Slotted objects keep timestamps as integer microseconds since the epoch and
+share one interned string per distinct status or priority. Shared by the agent
+and project management layers.
+"""
+from typing import Any, Optional, Union
+from datetime import datetime, timedelta, timezone
+import sys
+import time
+
+TimeValue = Union[datetime, int, str, None]
+
+
+class ZonedTimestamp(int):
+    """
+    Timestamp of a timezone-aware value. It compares and sorts as the instant
+    like any other timestamp and remembers the UTC offset, so the value reads
+    back with the offset it was written with.
+    """
+    def __new__(cls, value: int, offset: timedelta) -> 'ZonedTimestamp':
+        obj = super().__new__(cls, value)
+        obj.offset = offset
+        return obj
+
+    def __getnewargs__(self):
+        return int(self), self.offset
+
+
+def now() -> int:
+    """Current time in microseconds since the epoch. Read once per mutation."""
+    return time.time_ns() // 1000
+
+
+def to_timestamp(value: TimeValue) -> Optional[int]:
+    """
+    Microseconds since the epoch from a datetime, an ISO string or an int.
+    Timezone-aware values give a ZonedTimestamp that keeps their UTC offset.
+    """
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    timestamp = int(value.replace(microsecond=0).timestamp()) * 1000000 + value.microsecond
+    offset = value.utcoffset()
+    return ZonedTimestamp(timestamp, offset) if offset is not None else timestamp
+
+
+def to_datetime(value: Optional[int]) -> Optional[datetime]:
+    """
+    Datetime of a timestamp: aware with the original offset for a
+    ZonedTimestamp, otherwise local naive, as datetime.now() would have
+    returned it.
+    """
+    if value is None:
+        return None
+    seconds, micros = divmod(value, 1000000)
+    if isinstance(value, ZonedTimestamp):
+        return datetime.fromtimestamp(seconds, timezone(value.offset)).replace(microsecond=micros)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros)
+
+
+def to_iso(value: Optional[int]) -> Optional[str]:
+    return to_datetime(value).isoformat() if value is not None else None
+
+
+def symbol(value: Any) -> Any:
+    """Intern strings so every object with the same status or priority shares one."""
+    return sys.intern(value) if type(value) is str else value
+
+
+class TimestampField:
+    """
+    Datetime attribute stored as an int in the slot named after it with a
+    leading underscore. Reads convert lazily; writes accept a datetime, an
+    ISO string or an int.
+    """
+    def __set_name__(self, owner: type, name: str):
+        self.slot = f"_{name}"
+
+    def __get__(self, obj: Any, owner: type = None) -> Any:
+        if obj is None:
+            return self
+        return to_datetime(getattr(obj, self.slot))
+
+    def __set__(self, obj: Any, value: TimeValue) -> None:
+        setattr(obj, self.slot, to_timestamp(value))
+
+
+class SymbolField:
+    """String attribute interned on assignment, stored in the slot named after it with a leading underscore."""
+    def __set_name__(self, owner: type, name: str):
+        self.slot = f"_{name}"
+
+    def __get__(self, obj: Any, owner: type = None) -> Any:
+        if obj is None:
+            return self
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        setattr(obj, self.slot, symbol(value))
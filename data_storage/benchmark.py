@@ -0,0 +1,205 @@
+"""
+Vector search benchmark for the Creation AI Ecosystem.
+Measures recall@k, throughput, latency, build time and memory of VectorDB configurations
+on synthetic clustered embeddings and prints the results as JSON.
+
+Usage:
+    python -m data_storage.benchmark --rows 100000 --dim 128 \\
+        --config index=flat --config index=ivf,nlist=1024,nprobe=16 \\
+        --config index=hnsw,M=16,ef_search=64 --config index=ivf,nlist=1024,codec=pq,m=16,rerank=100
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from .scoring import batch_top_k, score
+from .vector_db import INDEX_TYPES, VectorDB
+
+QUERY_PARAMS = ('nprobe', 'ef_search', 'rerank')
+CODEC_PARAMS = ('m',)
+
+
+def generate_dataset(rows: int, dim: int, clusters: int = 100, queries: int = 1000, spread: float = 0.3,
+                     seed: int = 0, chunk: int = 100000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gaussian blobs around `clusters` random centres. Queries are drawn from
+    the same distribution, so they have near neighbours. Rows are generated
+    in chunks to keep temporaries bounded for multi-million-row datasets.
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    data = np.empty((rows, dim), dtype=np.float32)
+    for start in range(0, rows, chunk):
+        stop = min(start + chunk, rows)
+        labels = rng.integers(0, clusters, stop - start)
+        data[start:stop] = centres[labels] + spread * rng.standard_normal((stop - start, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, queries)
+    query_data = centres[labels] + spread * rng.standard_normal((queries, dim), dtype=np.float32)
+    return data, query_data
+
+
+def ground_truth(data: np.ndarray, queries: np.ndarray, k: int, metric: str,
+                 chunk: int = 65536) -> np.ndarray:
+    """Exact top-k rows of every query, shape (queries, k), computed in row chunks."""
+    if metric == 'cosine':
+        data = data / np.maximum(np.linalg.norm(data, axis=1, keepdims=True), 1e-12)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    best_rows = np.empty((queries.shape[0], 0), dtype=np.int64)
+    best_scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+    for start in range(0, data.shape[0], chunk):
+        vectors = data[start:start + chunk]
+        scores = score(queries, vectors, np.einsum('ij,ij->i', vectors, vectors), metric)
+        top = batch_top_k(scores, k)
+        rows = np.concatenate([best_rows, top + start], axis=1)
+        scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+        top = batch_top_k(scores, k)
+        best_rows = np.take_along_axis(rows, top, axis=1)
+        best_scores = np.take_along_axis(scores, top, axis=1)
+    return best_rows
+
+
+def resident_memory() -> int:
+    """Current resident set size in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def parse_config(spec: str) -> Dict[str, Any]:
+    """Parse 'index=ivf,nlist=1024,nprobe=16' into a config dict with typed values."""
+    config: Dict[str, Any] = {}
+    for item in filter(None, spec.split(',')):
+        key, _, value = item.partition('=')
+        if not value:
+            raise ValueError(f"Expected key=value in config '{spec}', got '{item}'")
+        for convert in (int, float):
+            try:
+                config[key.strip()] = convert(value)
+                break
+            except ValueError:
+                continue
+        else:
+            config[key.strip()] = value.strip()
+    config.setdefault('index', 'flat')
+    return config
+
+
+def run_config(config: Dict[str, Any], data: np.ndarray, queries: np.ndarray, truth: np.ndarray,
+               k: int, metric: str, batch_size: int = 10000, path: Optional[str] = None) -> Dict[str, Any]:
+    """Build one VectorDB configuration, query it and return its measurements."""
+    options = dict(config)
+    index = options.pop('index')
+    codec = options.pop('codec', 'none')
+    search = {key: options.pop(key) for key in QUERY_PARAMS if key in options}
+    codec_options = {key: options.pop(key) for key in CODEC_PARAMS if key in options}
+    memory_before = resident_memory()
+    started = time.perf_counter()
+    db = VectorDB('benchmark', dim=data.shape[1], metric=metric, path=path, index=index,
+                  index_options=options, codec=codec, codec_options=codec_options,
+                  initial_capacity=data.shape[0] if path is None else 1024)
+    for start in range(0, data.shape[0], batch_size):
+        stop = min(start + batch_size, data.shape[0])
+        db.add_embeddings(range(start, stop), data[start:stop])
+    insert_seconds = time.perf_counter() - started
+    db.train_codec()
+    if hasattr(INDEX_TYPES[index], 'train'):
+        db.train_index()
+    build_seconds = time.perf_counter() - started
+    memory_after = resident_memory()
+
+    latencies = np.empty(queries.shape[0])
+    hits = 0
+    for i, query in enumerate(queries):
+        started = time.perf_counter()
+        results = db.query(query, k, **search)
+        latencies[i] = time.perf_counter() - started
+        hits += len({result['id'] for result in results} & set(truth[i].tolist()))
+    started = time.perf_counter()
+    db.query_batch(queries, k, packed=True, **search)
+    batch_seconds = time.perf_counter() - started
+    info = db.get_info()
+    db.close()
+    return {
+        'config': config,
+        'recall_at_k': hits / (k * queries.shape[0]),
+        'qps': queries.shape[0] / latencies.sum(),
+        'batch_qps': queries.shape[0] / batch_seconds,
+        'latency_ms': {
+            'mean': float(latencies.mean() * 1000),
+            'p50': float(np.percentile(latencies, 50) * 1000),
+            'p99': float(np.percentile(latencies, 99) * 1000),
+        },
+        'insert_seconds': insert_seconds,
+        'build_seconds': build_seconds,
+        'rss_delta_bytes': memory_after - memory_before,
+        'rss_bytes': memory_after,
+        'bytes_per_vector': info['bytes_per_vector'],
+        'code_bytes_per_vector': info['code_bytes_per_vector'],
+        'index': info['index'],
+    }
+
+
+def run_benchmark(rows: int, dim: int, configs: List[Dict[str, Any]], k: int = 10, queries: int = 1000,
+                  clusters: int = 100, metric: str = 'cosine', seed: int = 0,
+                  persistent: bool = False) -> Dict[str, Any]:
+    """Generate a dataset, compute its ground truth and run every configuration on it."""
+    started = time.perf_counter()
+    data, query_data = generate_dataset(rows, dim, clusters, queries, seed=seed)
+    truth = ground_truth(data, query_data, k, metric)
+    report: Dict[str, Any] = {
+        'dataset': {'rows': rows, 'dim': dim, 'clusters': clusters, 'queries': queries, 'k': k,
+                    'metric': metric, 'seed': seed, 'persistent': persistent,
+                    'setup_seconds': time.perf_counter() - started},
+        'environment': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'results': [],
+    }
+    for config in configs:
+        if persistent:
+            with tempfile.TemporaryDirectory(prefix='vectordb-benchmark-') as path:
+                result = run_config(config, data, query_data, truth, k, metric, path=path)
+        else:
+            result = run_config(config, data, query_data, truth, k, metric)
+        report['results'].append(result)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark VectorDB backends on synthetic data.")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=128)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--clusters', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--metric', default='cosine', choices=('cosine', 'dot', 'l2'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--persistent', action='store_true', help="store segments in a temporary directory")
+    parser.add_argument('--config', action='append', dest='configs',
+                        help="comma-separated key=value VectorDB settings, repeatable (default: index=flat)")
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+    configs = [parse_config(spec) for spec in (args.configs or ['index=flat'])]
+    report = run_benchmark(args.rows, args.dim, configs, k=args.k, queries=args.queries,
+                           clusters=args.clusters, metric=args.metric, seed=args.seed,
+                           persistent=args.persistent)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
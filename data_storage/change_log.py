@@ -0,0 +1,68 @@
+"""
+ChangeLog class for the Creation AI Ecosystem.
+Bounded, sequenced log of DataStorage mutations that change-feed consumers resume from.
+"""
+from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+import threading
+import uuid
+
+
+@dataclass
+class Change:
+    """One store or delete. `obj` is the stored object, or None for a delete."""
+    sequence: int
+    op: str
+    repository: str
+    id: str
+    obj: Any = None
+
+
+class ChangeLog:
+    """
+    Ring buffer of the last `capacity` changes, numbered 1, 2, ... in the
+    order they were applied. Consumers keep their own position and pull
+    with since(); nothing is buffered per consumer, so a slow consumer
+    costs no memory. One that falls more than `capacity` changes behind gets
+    a KeyError and must resync from the repositories, then resume from
+    last_sequence. Sequence numbers are only meaningful within one log:
+    `epoch` is random per instance, so a consumer can tell that the log was
+    recreated (for instance by a restart) and resync.
+    """
+    def __init__(self, capacity: int = 10000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._changes: 'deque[Change]' = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.epoch = uuid.uuid4().hex[:12]
+        self.last_sequence = 0
+
+    def append(self, op: str, repository: str, obj_id: str, obj: Any = None) -> int:
+        """Record a change and return its sequence number."""
+        with self._lock:
+            self.last_sequence += 1
+            self._changes.append(Change(self.last_sequence, op, repository, obj_id, obj))
+            return self.last_sequence
+
+    def since(self, after: int, limit: Optional[int] = None) -> List[Change]:
+        """
+        Up to `limit` changes with a sequence number above `after`, oldest
+        first. Raises KeyError when some of them were already evicted, or
+        when `after` is ahead of the log (for instance after a restart).
+        """
+        with self._lock:
+            if after > self.last_sequence:
+                raise KeyError(f"Sequence {after} is ahead of the change log ({self.last_sequence})")
+            first = self.last_sequence - len(self._changes) + 1
+            if after + 1 < first:
+                raise KeyError(f"Changes after {after} were evicted; the oldest kept is {first}")
+            start = after + 1 - first
+            stop = None if limit is None else start + limit
+            return list(islice(self._changes, start, stop))
+
+    def get_info(self) -> Dict[str, Any]:
+        return {'epoch': self.epoch, 'capacity': self.capacity, 'size': len(self._changes),
+                'last_sequence': self.last_sequence}
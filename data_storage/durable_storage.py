@@ -0,0 +1,290 @@
+"""
+DurableDataStorage class for the Creation AI Ecosystem.
+Write-ahead logged, snapshotted variant of the in-memory DataStorage.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os
+import pickle
+import re
+import struct
+import threading
+import zlib
+
+from .change_log import ChangeLog
+from .vector_db import REPOSITORIES, DataStorage
+
+FRAME_HEADER = struct.Struct('<II')  # payload length, crc32 of the payload
+WAL_PATTERN = re.compile(r'^wal-(\d{6})\.log$')
+SNAPSHOT_PATTERN = re.compile(r'^snapshot-(\d{6})\.pkl$')
+
+
+def _fsync_dir(path: str) -> None:
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def frame(payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_frames(path: str) -> Tuple[List[bytes], int]:
+    """Return the payloads of every intact frame in a log and the byte length they cover."""
+    payloads: List[bytes] = []
+    with open(path, 'rb') as f:
+        data = f.read()
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(data):
+        length, crc = FRAME_HEADER.unpack_from(data, offset)
+        payload = data[offset + FRAME_HEADER.size:offset + FRAME_HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        payloads.append(payload)
+        offset += FRAME_HEADER.size + length
+    return payloads, offset
+
+
+class DurableDataStorage(DataStorage):
+    """
+    DataStorage whose mutations survive restarts. Directory layout:
+        wal-NNNNNN.log       one frame per group commit: a pickled list of
+                             ('store', repository, object) and
+                             ('delete', repository, id) records
+        snapshot-NNNNNN.pkl  the four repositories as of the start of wal-NNNNNN
+
+    Mutations are applied in memory and their records appended to a buffer;
+    a flusher thread pickles, writes and fsyncs the buffer every
+    `commit_interval` seconds, so one fsync covers every record of the
+    interval (group commit) and writers never pay for serialization. An
+    object stored and then changed in place before the flush is logged with
+    its newer state, which is what memory holds anyway. With wait_for_commit=True each mutation returns only once its
+    record is on disk; otherwise at most `commit_interval` of writes can be
+    lost on a crash. After `snapshot_interval` records the WAL is rotated
+    and a snapshot written on a background thread, so pickling it never
+    holds up group commit; recovery loads the newest snapshot and replays
+    the WAL segments after it, stopping at a torn or corrupt tail frame. The records of one apply_batch() share a frame, so a
+    batch is recovered whole or not at all.
+    """
+    def __init__(self, path: str, commit_interval: float = 0.005, wait_for_commit: bool = False,
+                 snapshot_interval: int = 100000, change_log_size: int = 10000):
+        super().__init__(change_log_size=change_log_size)
+        self.path = path
+        self.commit_interval = commit_interval
+        self.wait_for_commit = wait_for_commit
+        self.snapshot_interval = snapshot_interval
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._buffer: List[Tuple[str, str, Any]] = []
+        self._failure: Optional[BaseException] = None
+        self._appended = 0
+        self._durable = 0
+        self._since_snapshot = 0
+        self._snapshot_due = False
+        self._closed = False
+        self._snapshot_thread: Optional[threading.Thread] = None
+        os.makedirs(path, exist_ok=True)
+        self._segment = self._recover()
+        # Replayed records are not changes consumers have missed.
+        self.change_log = ChangeLog(change_log_size)
+        self._wal = open(self._wal_path(self._segment), 'ab')
+        self._flusher = threading.Thread(target=self._flush_loop, name='data-storage-wal', daemon=True)
+        self._flusher.start()
+
+    def _wal_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"wal-{segment:06d}.log")
+
+    def _snapshot_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"snapshot-{segment:06d}.pkl")
+
+    def _files(self, pattern: re.Pattern) -> List[int]:
+        return sorted(int(m.group(1)) for m in map(pattern.match, os.listdir(self.path)) if m)
+
+    def _recover(self) -> int:
+        """Load the newest snapshot, replay the WAL after it and return the segment to append to."""
+        segment = 1
+        for snapshot in reversed(self._files(SNAPSHOT_PATTERN)):
+            try:
+                with open(self._snapshot_path(snapshot), 'rb') as f:
+                    state = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                continue
+            for repository in REPOSITORIES:
+                for obj in state.get(repository, {}).values():
+                    DataStorage._store(self, repository, obj)
+            segment = snapshot
+            break
+        wals = [wal for wal in self._files(WAL_PATTERN) if wal >= segment]
+        for wal in wals:
+            path = self._wal_path(wal)
+            payloads, size = read_frames(path)
+            for payload in payloads:
+                for op, repository, value in pickle.loads(payload):
+                    if op == 'store':
+                        DataStorage._store(self, repository, value)
+                    else:
+                        DataStorage._delete(self, repository, value)
+            if size != os.path.getsize(path):
+                os.truncate(path, size)
+            segment = wal
+        return segment
+
+    def _log(self, records: List[Tuple[str, str, Any]], apply: Any) -> Any:
+        """
+        Apply mutations and append their records, keeping WAL order equal to
+        apply order. The records land in the same frame, so recovery replays
+        all of them or none.
+        """
+        with self._cond:
+            self._check_open()
+            result = apply()
+            self._buffer.extend(records)
+            self._appended += len(records)
+            sequence = self._appended
+            self._since_snapshot += len(records)
+            if self._since_snapshot >= self.snapshot_interval:
+                self._snapshot_due = True
+                self._cond.notify_all()
+            if self.wait_for_commit:
+                while self._durable < sequence and not self._closed and self._failure is None:
+                    self._cond.wait()
+                if self._durable < sequence:
+                    self._check_open()
+        return result
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("DurableDataStorage is closed")
+        if self._failure is not None:
+            raise IOError(f"Write-ahead log failed: {self._failure!r}") from self._failure
+
+    def _store(self, repository: str, obj: Any) -> None:
+        self._log([('store', repository, obj)], lambda: DataStorage._store(self, repository, obj))
+
+    def _delete(self, repository: str, obj_id: str) -> bool:
+        if obj_id not in getattr(self, repository):
+            return False
+        return self._log([('delete', repository, obj_id)], lambda: DataStorage._delete(self, repository, obj_id))
+
+    def apply_batch(self, operations: Sequence[Tuple[str, str, Any]]) -> List[Any]:
+        operations = list(operations)
+        self._check_operations(operations)
+        return self._log(operations, lambda: self._apply_operations(operations))
+
+    def _write_pending(self) -> None:
+        """Write and fsync every buffered record. Caller holds _io_lock."""
+        with self._cond:
+            batch, self._buffer = self._buffer, []
+            target = self._appended
+        self._write_batch(batch, target)
+
+    def _write_batch(self, batch: List[Tuple[str, str, Any]], target: int) -> None:
+        """Write and fsync records taken from the buffer, up to append count `target`. Caller holds _io_lock."""
+        if batch:
+            try:
+                self._wal.write(frame(pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)))
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+            except Exception as e:
+                with self._cond:
+                    self._failure = e
+                    self._cond.notify_all()
+                raise
+        with self._cond:
+            self._durable = max(self._durable, target)
+            self._cond.notify_all()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(self.commit_interval)
+                closed = self._closed
+                snapshot_due = self._snapshot_due
+            with self._io_lock:
+                if self._wal.closed:
+                    return
+                self._write_pending()
+            if snapshot_due and not closed:
+                self._start_snapshot()
+            if closed:
+                return
+
+    def _start_snapshot(self) -> None:
+        if self._snapshot_thread is None or not self._snapshot_thread.is_alive():
+            self._snapshot_thread = threading.Thread(target=self.snapshot, name='data-storage-snapshot',
+                                                     daemon=True)
+            self._snapshot_thread.start()
+
+    def flush(self) -> None:
+        """Write and fsync every mutation made so far."""
+        with self._io_lock:
+            if not self._wal.closed:
+                self._write_pending()
+        if self._failure is not None:
+            raise IOError(f"Write-ahead log failed: {self._failure!r}") from self._failure
+
+    def snapshot(self) -> None:
+        """
+        Rotate the WAL and write a snapshot of the current state. Writers are
+        blocked only while the repositories are shallow-copied and the records
+        buffered so far are taken for the old segment, in one critical
+        section, so every record in the old segment is covered by the
+        snapshot; pickling runs outside the lock. Objects changed after the
+        copy are replayed from the new WAL segment, so the snapshot may safely
+        include newer state.
+        """
+        with self._io_lock:
+            if self._wal.closed:
+                return
+            with self._cond:
+                state = {repository: dict(getattr(self, repository)) for repository in REPOSITORIES}
+                batch, self._buffer = self._buffer, []
+                target = self._appended
+                self._since_snapshot = 0
+                self._snapshot_due = False
+            self._write_batch(batch, target)
+            self._wal.close()
+            self._segment += 1
+            segment = self._segment
+            self._wal = open(self._wal_path(segment), 'ab')
+        target = self._snapshot_path(segment)
+        tmp = target + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+        _fsync_dir(self.path)
+        for wal in self._files(WAL_PATTERN):
+            if wal < segment:
+                os.remove(self._wal_path(wal))
+        for snapshot in self._files(SNAPSHOT_PATTERN):
+            if snapshot < segment:
+                os.remove(self._snapshot_path(snapshot))
+
+    def close(self) -> None:
+        """Flush pending records and stop the flusher thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        with self._io_lock:
+            if not self._wal.closed:
+                self._write_pending()
+                self._wal.close()
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'segment': self._segment,
+            'appended': self._appended,
+            'durable': self._durable,
+            'since_snapshot': self._since_snapshot,
+        }
@@ -0,0 +1,451 @@
+"""
+HNSWIndex class for the Creation AI Ecosystem.
+Hierarchical navigable small world graph index used by VectorDB.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import math
+
+import numpy as np
+
+from .ivf_index import minibatch_kmeans, nearest_centroids
+from .scoring import batch_top_k, score
+
+MAX_LEVEL = 16
+
+
+class HNSWIndex:
+    """
+    HNSW graph (Malkov & Yashunin, 2018) over VectorDB rows, stored in flat arrays:
+        levels        int8 top layer of every row, -1 if the row is not in the graph
+        links0        int32 (rows, 2*M) layer-0 neighbours, padded with -1
+        upper_offset  int64 first slot of a row in `upper`, -1 for layer-0-only rows
+        upper         int32 (slots, M) neighbours on layers 1..level, one slot per layer
+
+    Deleted rows stay in the graph as tombstones: they are still traversed so
+    the graph remains navigable, but only live rows are returned. Vectors are
+    never copied into the index; they are fetched with `source.gather(rows)`.
+
+    Rows added one by one (batches under `bulk_rows`) go through the classic
+    insert, which runs in Python at a few milliseconds per row, so that path
+    suits appends of up to some tens of thousands of rows. Larger batches,
+    including train_index() and rebuilds, are linked layer by layer with
+    array operations: candidate neighbours are scored exactly against pools
+    of up to `exact_pool_rows` rows, and against the `bulk_nprobe` nearest
+    k-means cells of larger pools. That builds about 10k rows per second at
+    d=32 (100k clustered rows in ~10 s, recall@10 0.98 at ef_search=50), at
+    slightly lower recall than one-by-one inserts on hard, unclustered data.
+    Past a few million rows build time and the graph's memory favour 'ivf'.
+    """
+    SEARCH_PARAMS = ('ef_search',)
+
+    def __init__(self, metric: str, M: int = 16, ef_construction: int = 200, ef_search: int = 50,
+                 seed: int = 0, initial_capacity: int = 1024, bulk_rows: int = 1024,
+                 exact_pool_rows: int = 8192, bulk_nprobe: int = 16):
+        if M < 2:
+            raise ValueError("M must be at least 2")
+        self.metric = metric
+        self.M = M
+        self.M0 = 2 * M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+        self.bulk_rows = bulk_rows
+        self.exact_pool_rows = exact_pool_rows
+        self.bulk_nprobe = bulk_nprobe
+        self._level_mult = 1.0 / math.log(M)
+        self._rng = np.random.default_rng(seed)
+        self._initial_capacity = max(1, initial_capacity)
+        self.reset()
+
+    @property
+    def trained(self) -> bool:
+        return True
+
+    def reset(self) -> None:
+        """Drop the whole graph."""
+        capacity = self._initial_capacity
+        self.levels = np.full(capacity, -1, dtype=np.int8)
+        self.links0 = np.full((capacity, self.M0), -1, dtype=np.int32)
+        self.upper_offset = np.full(capacity, -1, dtype=np.int64)
+        self.upper = np.full((max(1, capacity // self.M), self.M), -1, dtype=np.int32)
+        self._upper_size = 0
+        self.entry_point = -1
+        self.max_level = -1
+        self.count = 0
+
+    def _reserve(self, row: int, level: int) -> None:
+        if row >= self.levels.shape[0]:
+            capacity = max(row + 1, 2 * self.levels.shape[0])
+            levels = np.full(capacity, -1, dtype=np.int8)
+            levels[:self.levels.shape[0]] = self.levels
+            links0 = np.full((capacity, self.M0), -1, dtype=np.int32)
+            links0[:self.links0.shape[0]] = self.links0
+            upper_offset = np.full(capacity, -1, dtype=np.int64)
+            upper_offset[:self.upper_offset.shape[0]] = self.upper_offset
+            self.levels, self.links0, self.upper_offset = levels, links0, upper_offset
+        if self._upper_size + level > self.upper.shape[0]:
+            upper = np.full((max(self._upper_size + level, 2 * self.upper.shape[0]), self.M), -1,
+                            dtype=np.int32)
+            upper[:self._upper_size] = self.upper[:self._upper_size]
+            self.upper = upper
+
+    def _links(self, row: int, layer: int) -> np.ndarray:
+        if layer == 0:
+            return self.links0[row]
+        return self.upper[self.upper_offset[row] + layer - 1]
+
+    def _neighbours(self, row: int, layer: int) -> np.ndarray:
+        links = self._links(row, layer)
+        return links[links >= 0]
+
+    def _set_links(self, row: int, layer: int, rows: np.ndarray) -> None:
+        links = self._links(row, layer)
+        links[:] = -1
+        links[:rows.shape[0]] = rows
+
+    def _greedy(self, query: np.ndarray, entry: int, entry_score: float, layer: int,
+                source: Any) -> Tuple[int, float]:
+        while True:
+            neighbours = self._neighbours(entry, layer)
+            if neighbours.shape[0] == 0:
+                return entry, entry_score
+            scores = score(query, *source.gather(neighbours), self.metric)
+            best = int(np.argmax(scores))
+            if scores[best] <= entry_score:
+                return entry, entry_score
+            entry, entry_score = int(neighbours[best]), float(scores[best])
+
+    def _search_layer(self, query: np.ndarray, entries: List[Tuple[float, int]], ef: int, layer: int,
+                      source: Any, live: Optional[np.ndarray] = None) -> List[Tuple[float, int]]:
+        """Best-first search of one layer. Returns up to `ef` (score, row) pairs, unordered."""
+        visited = {row for _, row in entries}
+        candidates = [(-s, row) for s, row in entries]
+        heapq.heapify(candidates)
+        results = [(s, row) for s, row in entries if self._is_live(row, live)]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+        while candidates:
+            negative, row = heapq.heappop(candidates)
+            if len(results) >= ef and -negative < results[0][0]:
+                break
+            fresh = [n for n in self._links(row, layer).tolist() if n >= 0 and n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            fresh_rows = np.array(fresh, dtype=np.int64)
+            fresh_scores = score(query, *source.gather(fresh_rows), self.metric)
+            if len(results) >= ef:
+                # The bar only rises while the layer is searched, so rows below it now never make it.
+                keep = fresh_scores > results[0][0]
+                fresh_rows, fresh_scores = fresh_rows[keep], fresh_scores[keep]
+            for neighbour, s in zip(fresh_rows.tolist(), fresh_scores.tolist()):
+                if len(results) < ef or s > results[0][0]:
+                    heapq.heappush(candidates, (-s, neighbour))
+                    if self._is_live(neighbour, live):
+                        heapq.heappush(results, (s, neighbour))
+                        if len(results) > ef:
+                            heapq.heappop(results)
+        return results
+
+    @staticmethod
+    def _is_live(row: int, live: Optional[np.ndarray]) -> bool:
+        return live is None or (row < live.shape[0] and bool(live[row]))
+
+    def _select(self, candidates: List[Tuple[float, int]], m: int, source: Any) -> np.ndarray:
+        """
+        Neighbour selection heuristic: walk candidates best first and keep one
+        only if it is closer to the base vector than to every neighbour kept so
+        far. Pruned candidates fill any remaining slots.
+        """
+        candidates = sorted(candidates, reverse=True)
+        if len(candidates) <= m:
+            return np.array([row for _, row in candidates], dtype=np.int32)
+        rows = np.array([row for _, row in candidates], dtype=np.int64)
+        scores = np.array([s for s, _ in candidates], dtype=np.float32)
+        vectors, sq_norms = source.gather(rows)
+        # closer[i, j]: candidate i is closer to candidate j than to the base vector.
+        closer = score(vectors, vectors, sq_norms, self.metric) > scores[:, np.newaxis]
+        blocked = np.zeros(rows.shape[0], dtype=bool)
+        selected: List[int] = []
+        position = 0
+        while len(selected) < m:
+            free = np.flatnonzero(~blocked[position:])
+            if free.shape[0] == 0:
+                position = rows.shape[0]
+                break
+            position += int(free[0])
+            selected.append(position)
+            blocked |= closer[:, position]
+            position += 1
+        if len(selected) < m:
+            chosen = np.zeros(rows.shape[0], dtype=bool)
+            chosen[selected] = True
+            selected.extend(np.flatnonzero(~chosen[:position])[:m - len(selected)].tolist())
+        return rows[selected].astype(np.int32)
+
+    def _connect(self, row: int, neighbour: int, layer: int, source: Any) -> None:
+        links = self._links(neighbour, layer)
+        free = np.flatnonzero(links < 0)
+        if free.shape[0]:
+            links[free[0]] = row
+            return
+        rows = np.append(links, row).astype(np.int64)
+        base, _ = source.gather(np.array([neighbour]))
+        scores = score(base[0], *source.gather(rows), self.metric).tolist()
+        self._set_links(neighbour, layer, self._select(list(zip(scores, rows.tolist())),
+                                                        links.shape[0], source))
+
+    def _draw_levels(self, count: int) -> np.ndarray:
+        draws = -np.log(1.0 - self._rng.random(count)) * self._level_mult
+        return np.minimum(draws.astype(np.int64), MAX_LEVEL)
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray, source: Any) -> None:
+        """
+        Insert rows. Batches of at least `bulk_rows` rows are linked layer by
+        layer with array operations (_bulk_link); smaller ones are inserted
+        one by one.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.shape[0] == 0:
+            return
+        levels = self._draw_levels(rows.shape[0])
+        if rows.shape[0] < self.bulk_rows:
+            for row, vector, level in zip(rows.tolist(), vectors, levels.tolist()):
+                self._insert(row, vector, level, source)
+            return
+        self._reserve(int(rows.max()), int(levels.sum()))
+        if (self.levels[rows] >= 0).any():
+            raise ValueError("Some rows are already in the graph")
+        self.levels[rows] = levels
+        upper = levels > 0
+        self.upper_offset[rows[upper]] = self._upper_size + np.cumsum(levels[upper]) - levels[upper]
+        self._upper_size += int(levels.sum())
+        self.count += rows.shape[0]
+        for layer in range(int(levels.max()), -1, -1):
+            members = levels >= layer
+            self._bulk_link(rows[members], vectors[members], layer, source)
+        top = int(np.argmax(levels))
+        if self.entry_point < 0 or levels[top] > self.max_level:
+            self.entry_point, self.max_level = int(rows[top]), int(levels[top])
+
+    def _insert(self, row: int, vector: np.ndarray, level: int, source: Any) -> None:
+        self._reserve(row, level)
+        if self.levels[row] >= 0:
+            raise ValueError(f"Row {row} is already in the graph")
+        self.levels[row] = level
+        if level > 0:
+            self.upper_offset[row] = self._upper_size
+            self._upper_size += level
+        self.count += 1
+        if self.entry_point < 0:
+            self.entry_point, self.max_level = row, level
+            return
+        entry = self.entry_point
+        entry_score = float(score(vector, *source.gather(np.array([entry])), self.metric)[0])
+        for layer in range(self.max_level, level, -1):
+            entry, entry_score = self._greedy(vector, entry, entry_score, layer, source)
+        entries = [(entry_score, entry)]
+        for layer in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(vector, entries, self.ef_construction, layer, source)
+            neighbours = self._select(found, self.M, source)
+            self._set_links(row, layer, neighbours)
+            for neighbour in neighbours.tolist():
+                self._connect(row, neighbour, layer, source)
+            entries = found
+        if level > self.max_level:
+            self.entry_point, self.max_level = row, level
+
+    def _bulk_link(self, rows: np.ndarray, vectors: np.ndarray, layer: int, source: Any,
+                   block: int = 512) -> None:
+        """
+        Link a batch of rows on one layer with array operations. Candidate
+        neighbours come from _candidates() over every row on the layer, each
+        row keeps up to M of them chosen by the _select() heuristic, evaluated
+        a block of rows at a time, and every kept link is mirrored into the
+        neighbour's free slots, best links first. On layer 0 pruned candidates
+        fill the M links, leaving the other M slots for mirrored links; upper
+        layers keep only the heuristic's choices so mirrored links fit.
+        """
+        table = self.links0 if layer == 0 else self.upper
+
+        def slots(of: np.ndarray) -> np.ndarray:
+            return of if layer == 0 else self.upper_offset[of] + layer - 1
+
+        pool = np.flatnonzero(self.levels >= layer)
+        count = min(pool.shape[0] - 1, max(self.M, min(self.ef_construction, 4 * self.M)))
+        if count <= 0:
+            return
+        candidates, candidate_scores = self._candidates(rows, vectors, pool, source, count)
+        links = np.full((rows.shape[0], self.M), -1, dtype=np.int64)
+        link_scores = np.zeros((rows.shape[0], self.M), dtype=np.float32)
+        for start in range(0, rows.shape[0], block):
+            stop = min(start + block, rows.shape[0])
+            chosen = self._select_block(candidates[start:stop], candidate_scores[start:stop], source,
+                                        fill=layer == 0)
+            columns = np.maximum(chosen, 0)
+            links[start:stop] = np.where(chosen >= 0, np.take_along_axis(candidates[start:stop], columns, axis=1), -1)
+            link_scores[start:stop] = np.take_along_axis(candidate_scores[start:stop], columns, axis=1)
+        table[slots(rows)] = -1
+        table[slots(rows), :self.M] = links
+        sources = np.repeat(rows, self.M)
+        targets, edge_scores = links.ravel(), link_scores.ravel()
+        keep = targets >= 0
+        sources, targets, edge_scores = sources[keep], targets[keep], edge_scores[keep]
+        linked = np.concatenate([np.zeros(0, dtype=bool)] + [
+            (table[slots(targets[start:start + 65536])] == sources[start:start + 65536, np.newaxis]).any(axis=1)
+            for start in range(0, targets.shape[0], 65536)])
+        sources, targets, edge_scores = sources[~linked], targets[~linked], edge_scores[~linked]
+        order = np.lexsort((-edge_scores, targets))
+        sources, targets = sources[order], targets[order]
+        filled = (table[slots(targets)] >= 0).sum(axis=1)
+        slot = filled + np.arange(targets.shape[0]) - np.searchsorted(targets, targets)
+        keep = slot < table.shape[1]
+        table[slots(targets[keep]), slot[keep]] = sources[keep]
+
+    def _candidates(self, rows: np.ndarray, vectors: np.ndarray, pool: np.ndarray, source: Any,
+                    count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best `count` (rows, scores) of `pool` for every row, excluding itself,
+        best first. Pools up to `exact_pool_rows` are scanned exactly; larger
+        ones are split into k-means cells and each row scans its
+        `bulk_nprobe` nearest cells.
+        """
+        best_rows = np.full((rows.shape[0], count), -1, dtype=np.int64)
+        best_scores = np.full((rows.shape[0], count), -np.inf, dtype=np.float32)
+
+        def merge(queries: np.ndarray, members: np.ndarray) -> None:
+            member_vectors, member_norms = source.gather(members)
+            scores = score(vectors[queries], member_vectors, member_norms, self.metric)
+            scores[rows[queries][:, np.newaxis] == members[np.newaxis, :]] = -np.inf
+            merged_scores = np.concatenate([best_scores[queries], scores], axis=1)
+            merged_rows = np.concatenate([best_rows[queries], np.broadcast_to(members, scores.shape)], axis=1)
+            top = batch_top_k(merged_scores, count)
+            best_scores[queries] = np.take_along_axis(merged_scores, top, axis=1)
+            best_rows[queries] = np.take_along_axis(merged_rows, top, axis=1)
+
+        if pool.shape[0] <= self.exact_pool_rows:
+            for start in range(0, rows.shape[0], 1024):
+                queries = np.arange(start, min(start + 1024, rows.shape[0]))
+                for pool_start in range(0, pool.shape[0], 16384):
+                    merge(queries, pool[pool_start:pool_start + 16384])
+        else:
+            cells = int(math.sqrt(pool.shape[0]))
+            sample = np.sort(self._rng.choice(pool, min(pool.shape[0], 64 * cells), replace=False))
+            centroids = minibatch_kmeans(source.gather(sample)[0], cells, self.metric, iterations=20,
+                                         seed=self.seed)
+            owner = np.concatenate([nearest_centroids(source.gather(pool[start:start + 65536])[0], centroids,
+                                                      self.metric)[:, 0]
+                                    for start in range(0, pool.shape[0], 65536)])
+            probes = nearest_centroids(vectors, centroids, self.metric, min(self.bulk_nprobe, cells))
+            pool_order = np.argsort(owner, kind='stable')
+            pool_bounds = np.searchsorted(owner[pool_order], np.arange(cells + 1))
+            probe_cells = probes.ravel()
+            probe_order = np.argsort(probe_cells, kind='stable')
+            probe_bounds = np.searchsorted(probe_cells[probe_order], np.arange(cells + 1))
+            for cell in range(cells):
+                queries = probe_order[probe_bounds[cell]:probe_bounds[cell + 1]] // probes.shape[1]
+                members = pool[pool_order[pool_bounds[cell]:pool_bounds[cell + 1]]]
+                if queries.shape[0] and members.shape[0]:
+                    merge(queries, members)
+        return best_rows, best_scores
+
+    def _select_block(self, candidates: np.ndarray, scores: np.ndarray, source: Any,
+                      fill: bool = True) -> np.ndarray:
+        """
+        _select() for a block of rows at once. Takes (rows, count) candidates
+        sorted best first, -1 padded, and returns (rows, M) column indices into
+        them, -1 padded. Without `fill` pruned candidates are not used.
+        """
+        rows, count = candidates.shape
+        valid = candidates >= 0
+        vectors, sq_norms = source.gather(np.maximum(candidates, 0).ravel())
+        vectors = vectors.reshape(rows, count, -1)
+        pairwise = vectors @ vectors.transpose(0, 2, 1)
+        if self.metric == 'l2':
+            sq_norms = sq_norms.reshape(rows, count)
+            pairwise = 2.0 * pairwise - sq_norms[:, :, np.newaxis] - sq_norms[:, np.newaxis, :]
+        # closer[r, i, j]: candidate i of row r is closer to candidate j than to the row itself.
+        closer = pairwise > scores[:, :, np.newaxis]
+        blocked = ~valid
+        chosen = np.zeros((rows, count), dtype=bool)
+        position = np.zeros(rows, dtype=np.int64)
+        columns = np.arange(count)
+        index = np.arange(rows)
+        for _ in range(self.M):
+            free = ~blocked & (columns >= position[:, np.newaxis])
+            found = free.any(axis=1)
+            first = np.argmax(free, axis=1)
+            chosen[index[found], first[found]] = True
+            blocked[found] |= closer[index[found], :, first[found]]
+            position = np.where(found, first + 1, count)
+        if fill:
+            # Pruned candidates that were passed over fill the remaining slots.
+            pruned = valid & ~chosen & (columns < position[:, np.newaxis])
+            need = self.M - chosen.sum(axis=1)
+            chosen |= pruned & (np.cumsum(pruned, axis=1) <= need[:, np.newaxis])
+        order = np.argsort(~chosen, axis=1, kind='stable')[:, :self.M]
+        selected = np.full((rows, self.M), -1, dtype=np.int64)
+        selected[:, :order.shape[1]] = np.where(np.take_along_axis(chosen, order, axis=1), order, -1)
+        return selected
+
+    def search(self, query: np.ndarray, top_k: int, source: Any, live: np.ndarray,
+               ef_search: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return up to max(ef_search, top_k) live (rows, scores), unordered."""
+        if self.entry_point < 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        ef = max(ef_search or self.ef_search, top_k)
+        entry = self.entry_point
+        entry_score = float(score(query, *source.gather(np.array([entry])), self.metric)[0])
+        for layer in range(self.max_level, 0, -1):
+            entry, entry_score = self._greedy(query, entry, entry_score, layer, source)
+        found = self._search_layer(query, [(entry_score, entry)], ef, 0, source, live)
+        rows = np.array([row for _, row in found], dtype=np.int64)
+        scores = np.array([s for s, _ in found], dtype=np.float32)
+        return rows, scores
+
+    def save(self, file: Any, **extra: Any) -> None:
+        """Write the graph arrays in .npz format; `extra` values are stored alongside."""
+        size = self.indexed_rows
+        np.savez(file, levels=self.levels[:size], links0=self.links0[:size],
+                 upper_offset=self.upper_offset[:size], upper=self.upper[:self._upper_size],
+                 header=np.array([self.M, self.entry_point, self.max_level, self.count], dtype=np.int64),
+                 **{key: np.asarray(value) for key, value in extra.items()})
+
+    @classmethod
+    def load(cls, path: str, metric: str, **options: Any) -> Tuple['HNSWIndex', Dict[str, np.ndarray]]:
+        """Read a graph written by save(). Returns the index and the stored extra values."""
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        M, entry_point, max_level, count = (int(v) for v in arrays.pop('header'))
+        options['M'] = M
+        index = cls(metric, **options)
+        size = arrays['levels'].shape[0]
+        index._reserve(max(size - 1, 0), arrays['upper'].shape[0])
+        index.levels[:size] = arrays.pop('levels')
+        index.links0[:size] = arrays.pop('links0')
+        index.upper_offset[:size] = arrays.pop('upper_offset')
+        upper = arrays.pop('upper')
+        index.upper[:upper.shape[0]] = upper
+        index._upper_size = upper.shape[0]
+        index.entry_point, index.max_level, index.count = entry_point, max_level, count
+        return index, arrays
+
+    @property
+    def indexed_rows(self) -> int:
+        """One past the highest row in the graph."""
+        return int(np.flatnonzero(self.levels >= 0).max()) + 1 if self.count else 0
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            'type': 'hnsw',
+            'M': self.M,
+            'ef_construction': self.ef_construction,
+            'ef_search': self.ef_search,
+            'bulk_rows': self.bulk_rows,
+            'nodes': self.count,
+            'max_level': self.max_level,
+            'graph_bytes': int(self.levels.nbytes + self.links0.nbytes + self.upper_offset.nbytes
+                               + self.upper.nbytes),
+        }
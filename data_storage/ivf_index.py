@@ -0,0 +1,135 @@
+"""
+IVFIndex class for the Creation AI Ecosystem.
+Inverted-file approximate nearest neighbour index used by VectorDB.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .scoring import score
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, metric: str, count: int = 1) -> np.ndarray:
+    """Return the `count` best centroid indices for every vector, best first."""
+    scores = score(vectors, centroids, np.einsum('ij,ij->i', centroids, centroids), metric)
+    if count == 1:
+        return np.argmax(scores, axis=1)[:, np.newaxis]
+    count = min(count, centroids.shape[0])
+    best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+    order = np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1)
+    return np.take_along_axis(best, order, axis=1)
+
+
+def minibatch_kmeans(data: np.ndarray, k: int, metric: str, iterations: int = 50,
+                     batch_size: int = 4096, seed: int = 0) -> np.ndarray:
+    """
+    Mini-batch k-means (Sculley, 2010) with per-centroid learning rates.
+    Centroids are kept unit-length for the cosine metric (spherical k-means).
+    """
+    rng = np.random.default_rng(seed)
+    n = data.shape[0]
+    if n < k:
+        raise ValueError(f"Need at least {k} training vectors, got {n}")
+    centroids = data[rng.choice(n, k, replace=False)].astype(np.float32, copy=True)
+    counts = np.zeros(k, dtype=np.float64)
+    for _ in range(iterations):
+        batch = data[rng.choice(n, min(batch_size, n), replace=False)]
+        assign = nearest_centroids(batch, centroids, metric)[:, 0]
+        batch_counts = np.bincount(assign, minlength=k)
+        order = np.argsort(assign, kind='stable')
+        present = np.flatnonzero(batch_counts)
+        starts = np.concatenate(([0], np.cumsum(batch_counts[present])[:-1]))
+        sums = np.add.reduceat(batch[order], starts, axis=0)
+        counts[present] += batch_counts[present]
+        rate = (batch_counts[present] / counts[present])[:, np.newaxis]
+        means = sums / batch_counts[present][:, np.newaxis]
+        centroids[present] += (rate * (means - centroids[present])).astype(np.float32)
+        empty = counts == 0
+        if empty.any():
+            centroids[empty] = data[rng.choice(n, int(empty.sum()), replace=False)]
+        if metric == 'cosine':
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids /= norms
+    return centroids
+
+
+class IVFIndex:
+    """
+    Inverted-file index: k-means centroids, each owning a posting list of
+    VectorDB rows. A query scores only the rows of the `nprobe` closest lists.
+    Posting lists are growable int64 arrays, so inserts after training are
+    appended incrementally. The index never stores vectors itself; candidate
+    rows are scored with `source.score_rows`, which uses VectorDB's codec
+    when one is trained.
+    """
+    SEARCH_PARAMS = ('nprobe',)
+
+    def __init__(self, metric: str, nlist: int = 1024, nprobe: int = 8, iterations: int = 50,
+                 batch_size: int = 4096, seed: int = 0):
+        self.metric = metric
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.batch_size = batch_size
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._sizes = np.zeros(0, dtype=np.int64)
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def train(self, sample: np.ndarray) -> None:
+        """Fit the centroids on a sample of vectors and clear the posting lists."""
+        nlist = min(self.nlist, sample.shape[0])
+        self.centroids = minibatch_kmeans(sample, nlist, self.metric, self.iterations,
+                                          self.batch_size, self.seed)
+        self.reset()
+
+    def reset(self) -> None:
+        """Empty every posting list while keeping the trained centroids."""
+        nlist = self.centroids.shape[0]
+        self._lists = [np.empty(16, dtype=np.int64) for _ in range(nlist)]
+        self._sizes = np.zeros(nlist, dtype=np.int64)
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray, source: Any = None) -> None:
+        """Append rows to the posting list of their nearest centroid."""
+        if rows.shape[0] == 0:
+            return
+        assign = nearest_centroids(vectors, self.centroids, self.metric)[:, 0]
+        order = np.argsort(assign, kind='stable')
+        lists, starts, counts = np.unique(assign[order], return_index=True, return_counts=True)
+        for lst, start, count in zip(lists, starts, counts):
+            size = self._sizes[lst]
+            postings = self._lists[lst]
+            if size + count > postings.shape[0]:
+                grown = np.empty(max(size + count, 2 * postings.shape[0]), dtype=np.int64)
+                grown[:size] = postings[:size]
+                self._lists[lst] = postings = grown
+            postings[size:size + count] = rows[order[start:start + count]]
+            self._sizes[lst] = size + count
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Return the rows stored in the `nprobe` lists closest to the query."""
+        probe = nearest_centroids(query[np.newaxis, :], self.centroids, self.metric,
+                                  nprobe or self.nprobe)[0]
+        return np.concatenate([self._lists[lst][:self._sizes[lst]] for lst in probe])
+
+    def search(self, query: np.ndarray, top_k: int, source: Any, live: np.ndarray,
+               nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Score the live rows of the probed lists. Returns unordered (rows, scores)."""
+        rows = self.candidates(query, nprobe)
+        rows = rows[rows < live.shape[0]]
+        rows = rows[live[rows]]
+        return rows, source.score_rows(query, rows)
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            'type': 'ivf',
+            'trained': self.trained,
+            'nlist': 0 if self.centroids is None else self.centroids.shape[0],
+            'nprobe': self.nprobe,
+            'indexed_rows': int(self._sizes.sum()),
+        }
@@ -0,0 +1,138 @@
+"""
+LexicalIndex class for the Creation AI Ecosystem.
+BM25 inverted index over a text field of VectorDB metadata, used for hybrid retrieval.
+"""
+from typing import Dict, List, Optional, Tuple
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+# Identifiers such as "ERR_CONN_RESET", "pkg.module:func" or "v1.2-rc" are
+# kept whole, and their word parts are indexed as well.
+TOKEN_PATTERN = re.compile(r"\w+(?:[.\-:/]\w+)*")
+PART_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase tokens of a text, with compound identifiers followed by their parts."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = PART_PATTERN.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class TermPostings:
+    """
+    Rows containing one term and the term's frequency in each, as growable
+    int64/float32 arrays. Only the writer appends; each append publishes the
+    filled prefixes of both arrays as one tuple, so lock-free readers get a
+    matching, immutable pair and never race an append.
+    """
+    __slots__ = ('_rows', '_tfs', '_size', '_published')
+
+    def __init__(self):
+        self._rows = np.empty(4, dtype=np.int64)
+        self._tfs = np.empty(4, dtype=np.float32)
+        self._size = 0
+        self._published = (self._rows[:0], self._tfs[:0])
+
+    def append(self, row: int, tf: int) -> None:
+        if self._size == self._rows.shape[0]:
+            rows = np.empty(2 * self._size, dtype=np.int64)
+            tfs = np.empty(2 * self._size, dtype=np.float32)
+            rows[:self._size] = self._rows[:self._size]
+            tfs[:self._size] = self._tfs[:self._size]
+            self._rows, self._tfs = rows, tfs
+        self._rows[self._size] = row
+        self._tfs[self._size] = tf
+        self._size += 1
+        self._published = (self._rows[:self._size], self._tfs[:self._size])
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self._published
+
+
+class LexicalIndex:
+    """
+    Okapi BM25 over row texts. Documents are added incrementally; removing a
+    row updates the collection statistics (document frequencies, average
+    length) immediately, while its postings stay until the owner rebuilds the
+    index and are masked out at search time by the caller's live mask.
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.reset()
+
+    def reset(self) -> None:
+        self._postings: Dict[str, TermPostings] = {}
+        self._doc_freq: Dict[str, int] = {}
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._documents = 0
+        self._total_length = 0
+
+    def add(self, row: int, text: Optional[str]) -> None:
+        """Index the text of a row. Rows without text are skipped."""
+        if not isinstance(text, str):
+            return
+        counts = Counter(tokenize(text))
+        if not counts:
+            return
+        if row >= self._lengths.shape[0]:
+            lengths = np.zeros(max(row + 1, 2 * self._lengths.shape[0]), dtype=np.float32)
+            lengths[:self._lengths.shape[0]] = self._lengths
+            self._lengths = lengths
+        length = sum(counts.values())
+        self._lengths[row] = length
+        self._documents += 1
+        self._total_length += length
+        for term, tf in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = TermPostings()
+            postings.append(row, tf)
+            self._doc_freq[term] = self._doc_freq.get(term, 0) + 1
+
+    def remove(self, row: int, text: Optional[str]) -> None:
+        """Drop a row's text from the collection statistics."""
+        if not isinstance(text, str):
+            return
+        counts = Counter(tokenize(text))
+        if not counts:
+            return
+        self._documents -= 1
+        self._total_length -= sum(counts.values())
+        for term in counts:
+            self._doc_freq[term] -= 1
+
+    def search(self, text: str, live: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (rows, BM25 scores) of every row set in `live` that shares a term with `text`."""
+        terms = [term for term in dict.fromkeys(tokenize(text)) if self._doc_freq.get(term, 0) > 0]
+        if not terms or self._documents == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        average = self._total_length / self._documents
+        all_rows, all_scores = [], []
+        for term in terms:
+            rows, tfs = self._postings[term].arrays()
+            keep = rows < live.shape[0]
+            keep[keep] = live[rows[keep]]
+            rows, tfs = rows[keep], tfs[keep]
+            df = self._doc_freq[term]
+            idf = math.log(1.0 + (self._documents - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self._lengths[rows] / average)
+            all_rows.append(rows)
+            all_scores.append(idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+        rows = np.concatenate(all_rows)
+        if len(all_rows) == 1:
+            return rows, all_scores[0].astype(np.float32)
+        rows, inverse = np.unique(rows, return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(all_scores), minlength=rows.shape[0])
+        return rows, scores.astype(np.float32)
+
+    def get_info(self) -> Dict[str, int]:
+        return {'documents': self._documents, 'terms': len(self._postings)}
@@ -0,0 +1,104 @@
+"""
+MetadataIndex class for the Creation AI Ecosystem.
+Inverted index from metadata key/value pairs to VectorDB rows, used for query filters.
+"""
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+
+class Postings:
+    """
+    Sorted rows that carry one key/value pair, in a growable int64 array.
+    VectorDB assigns rows in increasing order, so appends keep it sorted.
+    Only the writer appends; each append publishes the filled prefix with a
+    single assignment, so lock-free readers get a complete, immutable prefix
+    and never race an append.
+    """
+    __slots__ = ('_rows', '_size', '_published')
+
+    def __init__(self):
+        self._rows = np.empty(8, dtype=np.int64)
+        self._size = 0
+        self._published = self._rows[:0]
+
+    def append(self, row: int) -> None:
+        if self._size == self._rows.shape[0]:
+            rows = np.empty(2 * self._size, dtype=np.int64)
+            rows[:self._size] = self._rows[:self._size]
+            self._rows = rows
+        self._rows[self._size] = row
+        self._size += 1
+        self._published = self._rows[:self._size]
+
+    def rows(self) -> np.ndarray:
+        return self._published
+
+    def __len__(self) -> int:
+        return self._published.shape[0]
+
+
+class MetadataIndex:
+    """
+    Maps metadata key -> value -> Postings. Scalar values are indexed as is;
+    list, tuple and set values are indexed once per element, so {'tags': ['a', 'b']}
+    matches both tags='a' and tags='b'. Unhashable values such as nested
+    dicts are not indexed.
+
+    Postings are never shrunk on delete: callers intersect the result with
+    their live mask, and VectorDB rebuilds the index when it compacts.
+    """
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, Postings]] = {}
+
+    def reset(self) -> None:
+        self._postings = {}
+
+    @staticmethod
+    def _values(value: Any) -> List[Hashable]:
+        values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        return list(dict.fromkeys(v for v in values if isinstance(v, Hashable)))
+
+    def add(self, row: int, metadata: Optional[Dict[str, Any]]) -> None:
+        """Index every key/value pair of a row's metadata."""
+        if not metadata:
+            return
+        for key, value in metadata.items():
+            by_value = self._postings.setdefault(key, {})
+            for v in self._values(value):
+                postings = by_value.get(v)
+                if postings is None:
+                    postings = by_value[v] = Postings()
+                postings.append(row)
+
+    def lookup(self, key: str, value: Any) -> np.ndarray:
+        """Sorted rows whose `key` equals `value`, or any of the values if a list is given."""
+        by_value = self._postings.get(key, {})
+        if isinstance(value, (list, tuple, set, frozenset)):
+            parts = [by_value[v].rows() for v in self._values(value) if v in by_value]
+            if not parts:
+                return np.empty(0, dtype=np.int64)
+            return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+        if not isinstance(value, Hashable):
+            raise ValueError(f"Unsupported filter value for '{key}': {value!r}")
+        postings = by_value.get(value)
+        return postings.rows() if postings is not None else np.empty(0, dtype=np.int64)
+
+    def match(self, filter: Dict[str, Any]) -> np.ndarray:
+        """
+        Sorted rows matching every key of `filter` (AND across keys, OR within
+        a list of values). Postings are intersected smallest first.
+        """
+        parts = sorted((self.lookup(key, value) for key, value in filter.items()), key=len)
+        rows = parts[0]
+        for other in parts[1:]:
+            if rows.shape[0] == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            'keys': len(self._postings),
+            'postings': sum(len(by_value) for by_value in self._postings.values()),
+        }
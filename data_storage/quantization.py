@@ -0,0 +1,255 @@
+"""
+Vector codecs for the Creation AI Ecosystem.
+Scalar (int8) and product quantization used by VectorDB to shrink stored embeddings.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .ivf_index import minibatch_kmeans, nearest_centroids
+
+
+class VectorCodec:
+    """
+    Base class for codecs. A codec is trained on a sample, then keeps one
+    fixed-width code per VectorDB row and scores queries against the codes
+    with asymmetric distance computation: the query stays in float32 and only
+    the stored side is quantized. Scores follow VectorDB's "higher is better"
+    convention for the configured metric.
+    """
+    name = 'none'
+
+    def __init__(self, metric: str, initial_capacity: int = 1024):
+        self.metric = metric
+        self._initial_capacity = max(1, initial_capacity)
+        self.codes = np.empty((0, 0), dtype=np.uint8)
+        self.code_size = 0
+
+    @property
+    def trained(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.code_size
+
+    def train(self, sample: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def _query_state(self, query: np.ndarray) -> Any:
+        """Precompute whatever a query needs before scoring many codes (e.g. distance tables)."""
+        raise NotImplementedError
+
+    def _score_codes(self, state: Any, codes: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Drop every stored code while keeping the trained codebook."""
+        self.codes = np.zeros((self._initial_capacity, self.code_size), dtype=np.uint8)
+
+    def _reserve(self, rows: int) -> None:
+        if rows > self.codes.shape[0]:
+            codes = np.zeros((max(rows, 2 * self.codes.shape[0]), self.code_size), dtype=np.uint8)
+            codes[:self.codes.shape[0]] = self.codes
+            self.codes = codes
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray, source: Any = None) -> None:
+        """Encode vectors and store their codes at the given rows."""
+        if rows.shape[0] == 0:
+            return
+        self._reserve(int(rows.max()) + 1)
+        self.codes[rows] = self.encode(vectors)
+
+    def score_rows(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return self._score_codes(self._query_state(query), self.codes[rows], rows)
+
+    def score_prefix(self, query: np.ndarray, size: int, chunk: int = 65536) -> np.ndarray:
+        """Score the first `size` rows in chunks, keeping temporaries bounded."""
+        state = self._query_state(query)
+        scores = np.empty(size, dtype=np.float32)
+        for start in range(0, size, chunk):
+            stop = min(start + chunk, size)
+            scores[start:stop] = self._score_codes(state, self.codes[start:stop], np.arange(start, stop))
+        return scores
+
+    def _arrays(self, rows: int) -> Dict[str, np.ndarray]:
+        """Codebook arrays plus any per-row arrays beyond the codes, truncated to `rows`."""
+        raise NotImplementedError
+
+    def _restore(self, arrays: Dict[str, np.ndarray]) -> None:
+        """Pop the codebook arrays written by _arrays()."""
+        raise NotImplementedError
+
+    def _restore_rows(self, arrays: Dict[str, np.ndarray]) -> None:
+        """Pop the per-row arrays written by _arrays(), after the codes are loaded."""
+
+    def save(self, file: Any, rows: int = 0, **extra: Any) -> None:
+        """Write the codebook and the codes of the first `rows` rows in .npz format."""
+        np.savez(file, codes=self.codes[:rows], rows=np.asarray(rows), **self._arrays(rows),
+                 **{key: np.asarray(value) for key, value in extra.items()})
+
+    @classmethod
+    def load(cls, path: str, metric: str, **options: Any) -> Tuple['VectorCodec', Dict[str, np.ndarray]]:
+        """Read a codec written by save(). Returns the codec and the stored extra values."""
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        codec = cls(metric, **options)
+        codec._restore(arrays)
+        codes = arrays.pop('codes')
+        codec.reset()
+        codec._reserve(codes.shape[0])
+        codec.codes[:codes.shape[0]] = codes
+        codec._restore_rows(arrays)
+        return codec, arrays
+
+    def get_info(self) -> Dict[str, Any]:
+        return {'codec': self.name, 'trained': self.trained, 'bytes_per_vector': self.bytes_per_vector}
+
+
+class ScalarQuantizer(VectorCodec):
+    """
+    8-bit scalar quantizer: each dimension is mapped linearly onto 0..255
+    between its trained minimum and maximum. A query is scored as
+    q . (lo + scale * c) = q . lo + (q * scale) . c, so no code is decoded.
+    For l2 the squared norm of each reconstructed row is kept as well.
+    """
+    name = 'sq8'
+
+    def __init__(self, metric: str, initial_capacity: int = 1024):
+        super().__init__(metric, initial_capacity)
+        self.lower: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self.sq_norms = np.empty(0, dtype=np.float32)
+
+    @property
+    def trained(self) -> bool:
+        return self.lower is not None
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.code_size + (4 if self.metric == 'l2' else 0)
+
+    def train(self, sample: np.ndarray) -> None:
+        self.lower = sample.min(axis=0).astype(np.float32)
+        scale = (sample.max(axis=0) - self.lower) / 255.0
+        scale[scale == 0] = 1.0
+        self.scale = scale.astype(np.float32)
+        self.code_size = sample.shape[1]
+        self.reset()
+
+    def reset(self) -> None:
+        super().reset()
+        self.sq_norms = np.zeros(self.codes.shape[0], dtype=np.float32)
+
+    def _reserve(self, rows: int) -> None:
+        super()._reserve(rows)
+        if self.codes.shape[0] > self.sq_norms.shape[0]:
+            sq_norms = np.zeros(self.codes.shape[0], dtype=np.float32)
+            sq_norms[:self.sq_norms.shape[0]] = self.sq_norms
+            self.sq_norms = sq_norms
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint((vectors - self.lower) / self.scale), 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return self.lower + codes.astype(np.float32) * self.scale
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray, source: Any = None) -> None:
+        super().add(rows, vectors, source)
+        if self.metric == 'l2' and rows.shape[0]:
+            decoded = self.decode(self.codes[rows])
+            self.sq_norms[rows] = np.einsum('ij,ij->i', decoded, decoded)
+
+    def _query_state(self, query: np.ndarray) -> Tuple[np.ndarray, float, float]:
+        return query * self.scale, float(query @ self.lower), float(query @ query)
+
+    def _score_codes(self, state: Tuple[np.ndarray, float, float], codes: np.ndarray,
+                     rows: np.ndarray) -> np.ndarray:
+        scaled_query, offset, q_sq = state
+        dots = codes.astype(np.float32) @ scaled_query + offset
+        if self.metric == 'l2':
+            return 2.0 * dots - self.sq_norms[rows] - q_sq
+        return dots
+
+    def _arrays(self, rows: int) -> Dict[str, np.ndarray]:
+        return {'lower': self.lower, 'scale': self.scale, 'sq_norms': self.sq_norms[:rows]}
+
+    def _restore(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.lower = arrays.pop('lower')
+        self.scale = arrays.pop('scale')
+        self.code_size = self.lower.shape[0]
+
+    def _restore_rows(self, arrays: Dict[str, np.ndarray]) -> None:
+        sq_norms = arrays.pop('sq_norms')
+        self.sq_norms[:sq_norms.shape[0]] = sq_norms
+
+
+class ProductQuantizer(VectorCodec):
+    """
+    Product quantizer (Jegou et al., 2011): vectors are split into `m`
+    sub-vectors, each replaced by the id of its nearest of 256 k-means
+    centroids, so a row costs `m` bytes. A query builds an (m, 256) table of
+    partial scores once and every code is scored with m table lookups.
+    """
+    name = 'pq'
+    KSUB = 256
+
+    def __init__(self, metric: str, m: int = 8, iterations: int = 25, seed: int = 0,
+                 initial_capacity: int = 1024):
+        super().__init__(metric, initial_capacity)
+        self.m = m
+        self.iterations = iterations
+        self.seed = seed
+        self.codebooks: Optional[np.ndarray] = None
+        self.code_size = m
+
+    @property
+    def trained(self) -> bool:
+        return self.codebooks is not None
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.reshape(vectors.shape[0], self.m, -1)
+
+    def train(self, sample: np.ndarray) -> None:
+        if sample.shape[1] % self.m:
+            raise ValueError(f"Dimension {sample.shape[1]} is not divisible by m={self.m}")
+        ksub = min(self.KSUB, sample.shape[0])
+        parts = self._split(sample)
+        self.codebooks = np.stack([
+            minibatch_kmeans(np.ascontiguousarray(parts[:, j]), ksub, 'l2', self.iterations, seed=self.seed + j)
+            for j in range(self.m)
+        ])
+        self.reset()
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        parts = self._split(vectors)
+        codes = np.empty((vectors.shape[0], self.m), dtype=np.uint8)
+        for j in range(self.m):
+            codes[:, j] = nearest_centroids(np.ascontiguousarray(parts[:, j]), self.codebooks[j], 'l2')[:, 0]
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        parts = self.codebooks[np.arange(self.m), codes]
+        return parts.reshape(codes.shape[0], -1)
+
+    def _query_state(self, query: np.ndarray) -> np.ndarray:
+        parts = query.reshape(self.m, -1)
+        table = np.einsum('jd,jkd->jk', parts, self.codebooks)
+        if self.metric == 'l2':
+            table = 2.0 * table - np.einsum('jkd,jkd->jk', self.codebooks, self.codebooks) \
+                - np.einsum('jd,jd->j', parts, parts)[:, np.newaxis]
+        return table.astype(np.float32)
+
+    def _score_codes(self, state: np.ndarray, codes: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return state[np.arange(self.m), codes].sum(axis=1)
+
+    def _arrays(self, rows: int) -> Dict[str, np.ndarray]:
+        return {'codebooks': self.codebooks}
+
+    def _restore(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.codebooks = arrays.pop('codebooks')
+        self.m = self.codebooks.shape[0]
+        self.code_size = self.m
@@ -0,0 +1,45 @@
+"""
+Scoring helpers for the Creation AI Ecosystem vector search.
+Shared by VectorDB and its index backends so every path ranks rows identically.
+"""
+import numpy as np
+
+METRICS = ('cosine', 'dot', 'l2')
+
+
+def score(queries: np.ndarray, vectors: np.ndarray, sq_norms: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Score stored vectors against one query (d,) or a query matrix (b, d).
+    Higher is better: dot product (cosine vectors are stored unit-length) or
+    the negated squared euclidean distance for l2.
+    """
+    scores = queries @ vectors.T
+    if metric == 'l2':
+        if queries.ndim == 2:
+            q_sq = np.einsum('ij,ij->i', queries, queries)[:, np.newaxis]
+        else:
+            q_sq = float(queries @ queries)
+        scores = 2.0 * scores - sq_norms - q_sq
+    return scores
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the k highest scores, best first."""
+    if k <= 0 or scores.shape[0] == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(scores.shape[0])
+    return idx[np.argsort(-scores[idx], kind='stable')]
+
+
+def batch_top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the column indices of the k highest scores of every row of (b, n) scores, best first."""
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(scores.shape[1]), scores.shape).copy()
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(idx, order, axis=1)
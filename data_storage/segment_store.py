@@ -0,0 +1,312 @@
+"""
+SegmentStore class for the Creation AI Ecosystem.
+Append-only on-disk segment format backing VectorDB's persistent mode.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import os
+
+import numpy as np
+
+MANIFEST_FILE = 'manifest.json'
+DELETES_FILE = 'deletes.log'
+FORMAT_VERSION = 1
+
+
+def _fsync(handle) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+class SegmentStore:
+    """
+    Directory layout:
+        manifest.json     dim, metric and the ordered list of segments
+        seg-NNNNNN.vec    fixed-width float32 rows (rows * dim * 4 bytes)
+        seg-NNNNNN.norm   float32 squared norm of every row
+        seg-NNNNNN.meta   sidecar index, one JSON [doc_id, metadata] line per row
+        deletes.log       global row number of every deleted row, one per line;
+                          compaction starts a new deletes-NNNNNN.log and
+                          switches to it in the manifest
+
+    Global rows are numbered across segments in manifest order. Sealed
+    segments are immutable and opened with numpy.memmap, so processes reading
+    the same directory share pages through the OS cache. Only the trailing
+    active segment is appended to, and only by a single writer process.
+    """
+    def __init__(self, path: str, segment_rows: int = 65536, read_only: bool = False):
+        if segment_rows <= 0:
+            raise ValueError("segment_rows must be positive")
+        self.path = path
+        self.segment_rows = segment_rows
+        self.read_only = read_only
+        self.dim: Optional[int] = None
+        self.metric: Optional[str] = None
+        self.segments: List[Dict[str, Any]] = []
+        self._next_segment = 1
+        self._deletes_generation = 0
+        self._active_rows = 0
+        self._vec_file = None
+        self._norm_file = None
+        self._meta_file = None
+        self._deletes_file = None
+        if not read_only:
+            os.makedirs(path, exist_ok=True)
+        manifest = os.path.join(path, MANIFEST_FILE)
+        if os.path.exists(manifest):
+            with open(manifest, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.dim = data['dim']
+            self.metric = data['metric']
+            self.segments = data['segments']
+            self._next_segment = data['next_segment']
+            self._deletes_generation = data.get('deletes_generation', 0)
+
+    def _file(self, name: str, suffix: str) -> str:
+        return os.path.join(self.path, f"{name}.{suffix}")
+
+    def _deletes_path(self, generation: Optional[int] = None) -> str:
+        generation = self._deletes_generation if generation is None else generation
+        return os.path.join(self.path, f"deletes-{generation:06d}.log" if generation else DELETES_FILE)
+
+    def _write_manifest(self) -> None:
+        data = {
+            'format_version': FORMAT_VERSION,
+            'dim': self.dim,
+            'metric': self.metric,
+            'segments': self.segments,
+            'next_segment': self._next_segment,
+            'deletes_generation': self._deletes_generation,
+        }
+        target = os.path.join(self.path, MANIFEST_FILE)
+        tmp = target + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            _fsync(f)
+        os.replace(tmp, target)
+
+    def _new_segment(self) -> Dict[str, Any]:
+        segment = {'name': f"seg-{self._next_segment:06d}", 'rows': 0, 'sealed': False}
+        self._next_segment += 1
+        return segment
+
+    @property
+    def initialized(self) -> bool:
+        return self.dim is not None
+
+    def initialize(self, dim: int, metric: str) -> None:
+        """Create the manifest and an empty active segment for a new database."""
+        self.dim = dim
+        self.metric = metric
+        self.segments = [self._new_segment()]
+        self._write_manifest()
+        self._open_active()
+
+    def _open_active(self) -> None:
+        if self.read_only:
+            return
+        name = self.segments[-1]['name']
+        self._vec_file = open(self._file(name, 'vec'), 'ab')
+        self._norm_file = open(self._file(name, 'norm'), 'ab')
+        self._meta_file = open(self._file(name, 'meta'), 'ab')
+        if self._deletes_file is None:
+            self._deletes_file = open(self._deletes_path(), 'ab')
+
+    def _read_meta(self, name: str, rows: Optional[int] = None) -> Tuple[List[Any], int]:
+        """Read up to `rows` complete sidecar lines, returning records and their byte length."""
+        records: List[Any] = []
+        size = 0
+        path = self._file(name, 'meta')
+        if not os.path.exists(path):
+            return records, size
+        with open(path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n') or (rows is not None and len(records) >= rows):
+                    break
+                records.append(json.loads(line))
+                size += len(line)
+        return records, size
+
+    def _recover_active(self) -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+        """Load the active segment, trimming a partially written trailing row."""
+        name = self.segments[-1]['name']
+        vec_path, norm_path = self._file(name, 'vec'), self._file(name, 'norm')
+        vec_rows = os.path.getsize(vec_path) // (4 * self.dim) if os.path.exists(vec_path) else 0
+        norm_rows = os.path.getsize(norm_path) // 4 if os.path.exists(norm_path) else 0
+        records, meta_size = self._read_meta(name, min(vec_rows, norm_rows))
+        rows = len(records)
+        if rows:
+            vectors = np.fromfile(vec_path, dtype=np.float32, count=rows * self.dim).reshape(rows, self.dim)
+            norms = np.fromfile(norm_path, dtype=np.float32, count=rows)
+        else:
+            vectors = np.empty((0, self.dim), dtype=np.float32)
+            norms = np.empty(0, dtype=np.float32)
+        if not self.read_only:
+            for path, size in ((vec_path, rows * self.dim * 4), (norm_path, rows * 4),
+                               (self._file(name, 'meta'), meta_size)):
+                if os.path.exists(path) and os.path.getsize(path) != size:
+                    os.truncate(path, size)
+        self._active_rows = rows
+        return vectors, norms, records
+
+    def _map_segment(self, segment: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        rows = segment['rows']
+        if rows == 0:
+            return np.empty((0, self.dim), dtype=np.float32), np.empty(0, dtype=np.float32)
+        vectors = np.memmap(self._file(segment['name'], 'vec'), dtype=np.float32, mode='r',
+                            shape=(rows, self.dim))
+        norms = np.memmap(self._file(segment['name'], 'norm'), dtype=np.float32, mode='r',
+                          shape=(rows,))
+        return vectors, norms
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Open every segment. Returns the memory-mapped sealed segments, the
+        in-memory copy of the active segment, the sidecar records of all rows
+        in global order and the list of deleted global rows.
+        """
+        sealed = []
+        records: List[Any] = []
+        for segment in self.segments[:-1]:
+            sealed.append(self._map_segment(segment))
+            segment_records, _ = self._read_meta(segment['name'], segment['rows'])
+            records.extend(segment_records)
+        active_vectors, active_norms, active_records = self._recover_active()
+        records.extend(active_records)
+        deleted: List[int] = []
+        deletes_path = self._deletes_path()
+        if os.path.exists(deletes_path):
+            with open(deletes_path, 'rb') as f:
+                deleted = [int(line) for line in f if line.endswith(b'\n')]
+        self._open_active()
+        return {
+            'sealed': sealed,
+            'active': (active_vectors, active_norms),
+            'records': records,
+            'deleted': deleted,
+        }
+
+    def segment_names(self) -> List[str]:
+        return [segment['name'] for segment in self.segments]
+
+    @property
+    def active_rows(self) -> int:
+        return self._active_rows
+
+    def append(self, vectors: np.ndarray, norms: np.ndarray, records: List[Any]) -> None:
+        """Append rows to the active segment. The caller seals it once it is full."""
+        if self._active_rows + len(records) > self.segment_rows:
+            raise ValueError("Append would overflow the active segment")
+        self._vec_file.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self._norm_file.write(np.ascontiguousarray(norms, dtype=np.float32).tobytes())
+        self._meta_file.write(b''.join(
+            json.dumps(record, default=str).encode('utf-8') + b'\n' for record in records))
+        for handle in (self._vec_file, self._norm_file, self._meta_file):
+            handle.flush()
+        self._active_rows += len(records)
+
+    def delete(self, row: int) -> None:
+        """Record a deleted global row."""
+        self._deletes_file.write(f"{row}\n".encode('ascii'))
+        self._deletes_file.flush()
+
+    def seal(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Seal the active segment, start a new one and return the sealed segment's memmaps."""
+        for handle in (self._vec_file, self._norm_file, self._meta_file):
+            _fsync(handle)
+            handle.close()
+        segment = self.segments[-1]
+        segment['rows'] = self._active_rows
+        segment['sealed'] = True
+        self.segments.append(self._new_segment())
+        self._write_manifest()
+        self._active_rows = 0
+        self._open_active()
+        return self._map_segment(segment)
+
+    def flush(self) -> None:
+        """Force appended rows and deletes to stable storage."""
+        for handle in (self._vec_file, self._norm_file, self._meta_file, self._deletes_file):
+            if handle is not None:
+                _fsync(handle)
+
+    def compact(self, live: np.ndarray, min_segment_rows: int) -> int:
+        """
+        Seal the active segment, then rewrite every sealed segment that is
+        smaller than `min_segment_rows` or contains deleted rows into new,
+        densely packed segments. Returns the number of rows dropped.
+        """
+        if self._active_rows:
+            self.seal()
+        bases = np.cumsum([0] + [s['rows'] for s in self.segments[:-1]])
+        keep, merge = [], []
+        for segment, base in zip(self.segments[:-1], bases):
+            segment_live = live[base:base + segment['rows']]
+            if segment['rows'] < min_segment_rows or not segment_live.all():
+                merge.append((segment, segment_live))
+            else:
+                keep.append(segment)
+        if not merge:
+            return 0
+        dropped = 0
+        written: List[Dict[str, Any]] = []
+        current = None
+        for segment, segment_live in merge:
+            vectors, norms = self._map_segment(segment)
+            records, _ = self._read_meta(segment['name'], segment['rows'])
+            rows = np.flatnonzero(segment_live)
+            dropped += segment['rows'] - rows.shape[0]
+            while rows.shape[0]:
+                if current is None or current['rows'] == self.segment_rows:
+                    if current is not None:
+                        self._close_output(current)
+                    current = self._new_segment()
+                    current['files'] = [open(self._file(current['name'], s), 'wb')
+                                        for s in ('vec', 'norm', 'meta')]
+                    written.append(current)
+                take = rows[:self.segment_rows - current['rows']]
+                vec_f, norm_f, meta_f = current['files']
+                vec_f.write(np.ascontiguousarray(vectors[take]).tobytes())
+                norm_f.write(np.ascontiguousarray(norms[take]).tobytes())
+                meta_f.write(b''.join(json.dumps(records[r], default=str).encode('utf-8') + b'\n'
+                                      for r in take))
+                current['rows'] += take.shape[0]
+                rows = rows[take.shape[0]:]
+            del vectors, norms
+        if current is not None:
+            self._close_output(current)
+        for segment in written:
+            segment['sealed'] = True
+        for handle in (self._vec_file, self._norm_file, self._meta_file, self._deletes_file):
+            handle.close()
+        # The new segments hold no deleted rows. Switch to an empty deletes log
+        # in the same manifest write, so a crash never pairs the renumbered
+        # segments with the old log's row numbers.
+        old_deletes = self._deletes_path()
+        with open(self._deletes_path(self._deletes_generation + 1), 'wb') as f:
+            _fsync(f)
+        active = self.segments[-1]
+        self.segments = keep + written + [active]
+        self._deletes_generation += 1
+        self._write_manifest()
+        self._deletes_file = None
+        if os.path.exists(old_deletes):
+            os.remove(old_deletes)
+        for segment, _ in merge:
+            for suffix in ('vec', 'norm', 'meta'):
+                path = self._file(segment['name'], suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+        self._open_active()
+        return dropped
+
+    def _close_output(self, segment: Dict[str, Any]) -> None:
+        for handle in segment.pop('files'):
+            _fsync(handle)
+            handle.close()
+
+    def close(self) -> None:
+        for handle in (self._vec_file, self._norm_file, self._meta_file, self._deletes_file):
+            if handle is not None and not handle.closed:
+                _fsync(handle)
+                handle.close()
@@ -0,0 +1,416 @@
+"""
+SQLiteDataStorage class for the Creation AI Ecosystem.
+SQLite-backed drop-in for DataStorage that keeps agents, projects, tasks and assignments on disk.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+import pickle
+import queue
+import sqlite3
+import threading
+import uuid
+
+from .change_log import ChangeLog
+from .vector_db import SECONDARY_INDEXES
+
+TABLES = {
+    'agent_repository': 'agents',
+    'project_repository': 'projects',
+    'task_repository': 'tasks',
+    'assignment_repository': 'assignments',
+}
+# Indexed attributes holding lists get a (value, owner_id) side table instead of a column.
+LIST_ATTRIBUTES = ('tags',)
+
+
+def _column_value(value: Any) -> Any:
+    return value if value is None or isinstance(value, (str, int, float)) else str(value)
+
+
+class SQLiteDataStorage:
+    """
+    Same store_/get_/delete_/list_/find_/page_ surface as DataStorage,
+    persisted in SQLite; page cursors are rowids. Each repository is a table of pickled objects keyed by id, with
+    the SECONDARY_INDEXES attributes as indexed columns (list attributes such
+    as tags in a side table), so find_tasks()/find_assignments() run as
+    indexed SQL queries and only matching rows are unpickled.
+
+    The database runs in WAL journal mode: writes go through one connection
+    under a lock, reads borrow connections from a small pool and are not
+    blocked by the writer. SQL text is built once per table so every
+    connection's statement cache reuses the prepared statements. The
+    store_<repository>s() methods insert many objects in one transaction
+    with executemany. Planner statistics are refreshed with ANALYZE every
+    `analyze_every` written rows, so filters on tags and status pick the
+    more selective index.
+
+    get_*() returns a fresh copy of the stored object; store it again after
+    changing it. Repository write counters and per-row versions are kept in
+    the database, so version() and object_version() are consistent across
+    processes and restarts; `version_epoch` identifies the database. Committed writes made through this instance are appended to
+    `change_log` in commit order; writes by other processes are not seen.
+    """
+    def __init__(self, path: str, pool_size: int = 4, cached_statements: int = 256,
+                 analyze_every: int = 10000, change_log_size: int = 10000):
+        self.path = path
+        self.change_log = ChangeLog(change_log_size)
+        self._cached_statements = cached_statements
+        self.analyze_every = analyze_every
+        self._unanalyzed = 0
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._sql: Dict[str, Dict[str, str]] = {}
+        self._create_schema()
+        self._pool: 'queue.Queue[sqlite3.Connection]' = queue.Queue()
+        self._readers = [self._connect() for _ in range(max(1, pool_size))]
+        for connection in self._readers:
+            self._pool.put(connection)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                                     cached_statements=self._cached_statements)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('PRAGMA busy_timeout=5000')
+        return connection
+
+    @staticmethod
+    def _attributes(repository: str) -> Tuple[List[str], List[str]]:
+        attributes = SECONDARY_INDEXES.get(repository, ())
+        return ([a for a in attributes if a not in LIST_ATTRIBUTES],
+                [a for a in attributes if a in LIST_ATTRIBUTES])
+
+    def _create_schema(self) -> None:
+        # storage_meta holds the database's version epoch and one write counter per repository.
+        self._writer.execute("CREATE TABLE IF NOT EXISTS storage_meta (key TEXT PRIMARY KEY, value NOT NULL)")
+        self._writer.execute("INSERT OR IGNORE INTO storage_meta (key, value) VALUES ('epoch', ?)",
+                             (uuid.uuid4().hex[:12],))
+        self.version_epoch = self._writer.execute(
+            "SELECT value FROM storage_meta WHERE key = 'epoch'").fetchone()[0]
+        for repository, table in TABLES.items():
+            columns, lists = self._attributes(repository)
+            self._writer.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, "
+                + ''.join(f"{column} TEXT, " for column in columns)
+                + "version INTEGER NOT NULL DEFAULT 0, data BLOB NOT NULL)")
+            if 'version' not in {row[1] for row in self._writer.execute(f"PRAGMA table_info({table})")}:
+                self._writer.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+            self._writer.execute("INSERT OR IGNORE INTO storage_meta (key, value) VALUES (?, 0)", (repository,))
+            for column in columns:
+                self._writer.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})")
+            for attribute in lists:
+                self._writer.execute(f"CREATE TABLE IF NOT EXISTS {table}_{attribute} "
+                                     f"(value TEXT NOT NULL, owner_id TEXT NOT NULL)")
+                self._writer.execute(f"CREATE INDEX IF NOT EXISTS {table}_{attribute}_value "
+                                     f"ON {table}_{attribute} (value, owner_id)")
+                self._writer.execute(f"CREATE INDEX IF NOT EXISTS {table}_{attribute}_owner "
+                                     f"ON {table}_{attribute} (owner_id)")
+            names = ['id'] + columns + ['version', 'data']
+            sql = {
+                'upsert': f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+                          f"ON CONFLICT(id) DO UPDATE SET "
+                          + ', '.join(f"{name} = excluded.{name}" for name in names[1:]),
+                'get': f"SELECT data FROM {table} WHERE id = ?",
+                'version': f"SELECT version FROM {table} WHERE id = ?",
+                'delete': f"DELETE FROM {table} WHERE id = ?",
+                'list': f"SELECT data FROM {table} ORDER BY rowid",
+            }
+            for attribute in lists:
+                sql[f"clear_{attribute}"] = f"DELETE FROM {table}_{attribute} WHERE owner_id = ?"
+                sql[f"add_{attribute}"] = f"INSERT INTO {table}_{attribute} (value, owner_id) VALUES (?, ?)"
+            self._sql[repository] = sql
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    @contextmanager
+    def _transaction(self, rows: int = 1) -> Iterator[List[Tuple[str, str, str, Any]]]:
+        """
+        Yield a list to append (op, repository, id, object) changes to while
+        writing with self._writer; they reach the change log once committed.
+        """
+        changes: List[Tuple[str, str, str, Any]] = []
+        with self._write_lock:
+            self._writer.execute('BEGIN IMMEDIATE')
+            try:
+                yield changes
+            except BaseException:
+                self._writer.execute('ROLLBACK')
+                raise
+            self._writer.execute('COMMIT')
+            for change in changes:
+                self.change_log.append(*change)
+            self._unanalyzed += rows
+            if self._unanalyzed >= self.analyze_every:
+                self._writer.execute('ANALYZE')
+                self._unanalyzed = 0
+
+    def _row(self, repository: str, obj: Any) -> Tuple[Any, ...]:
+        columns, _ = self._attributes(repository)
+        return ((obj.id,) + tuple(_column_value(getattr(obj, column, None)) for column in columns)
+                + (pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL),))
+
+    def _bump(self, connection: sqlite3.Connection, repository: str, writes: int) -> int:
+        """Add `writes` to a repository's write counter and return its previous value."""
+        version = connection.execute("SELECT value FROM storage_meta WHERE key = ?", (repository,)).fetchone()[0]
+        connection.execute("UPDATE storage_meta SET value = ? WHERE key = ?", (version + writes, repository))
+        return version
+
+    def _write_many(self, connection: sqlite3.Connection, repository: str, objs: Sequence[Any],
+                    rows: List[Tuple[Any, ...]]) -> None:
+        """
+        Upsert pre-built rows and the objects' list attributes, giving each
+        row the next value of the repository's write counter as its version.
+        Caller holds a transaction.
+        """
+        sql = self._sql[repository]
+        version = self._bump(connection, repository, len(rows))
+        connection.executemany(sql['upsert'], [row[:-1] + (version + i + 1, row[-1])
+                                               for i, row in enumerate(rows)])
+        for attribute in self._attributes(repository)[1]:
+            connection.executemany(sql[f"clear_{attribute}"], [(obj.id,) for obj in objs])
+            connection.executemany(sql[f"add_{attribute}"], [
+                (_column_value(value), obj.id)
+                for obj in objs for value in dict.fromkeys(getattr(obj, attribute, None) or ())])
+
+    def _write_delete(self, connection: sqlite3.Connection, repository: str, obj_id: str) -> bool:
+        sql = self._sql[repository]
+        deleted = connection.execute(sql['delete'], (obj_id,)).rowcount > 0
+        if deleted:
+            self._bump(connection, repository, 1)
+        for attribute in self._attributes(repository)[1]:
+            connection.execute(sql[f"clear_{attribute}"], (obj_id,))
+        return deleted
+
+    def _store_many(self, repository: str, objs: Sequence[Any]) -> None:
+        """Upsert objects and their list attributes in one transaction."""
+        rows = [self._row(repository, obj) for obj in objs]
+        with self._transaction(len(rows)) as changes:
+            self._write_many(self._writer, repository, objs, rows)
+            changes.extend(('store', repository, obj.id, obj) for obj in objs)
+
+    def _get(self, repository: str, obj_id: str) -> Optional[Any]:
+        with self._reader() as connection:
+            row = connection.execute(self._sql[repository]['get'], (obj_id,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def _delete(self, repository: str, obj_id: str) -> bool:
+        with self._transaction() as changes:
+            deleted = self._write_delete(self._writer, repository, obj_id)
+            if deleted:
+                changes.append(('delete', repository, obj_id, None))
+        return deleted
+
+    def apply_batch(self, operations: Sequence[Tuple[str, str, Any]]) -> List[Any]:
+        """
+        Apply ('store', repository, object) and ('delete', repository, id)
+        operations in order in one transaction. Consecutive stores to the same
+        repository share an executemany. Returns each operation's result (None
+        for a store, whether the id existed for a delete).
+        """
+        runs: List[Tuple[str, str, List[Any], List[Tuple[Any, ...]]]] = []
+        for op, repository, value in operations:
+            if op not in ('store', 'delete'):
+                raise ValueError(f"Unknown batch operation '{op}'")
+            if repository not in TABLES:
+                raise ValueError(f"Unknown repository '{repository}'")
+            if op == 'store' and runs and runs[-1][0] == 'store' and runs[-1][1] == repository:
+                runs[-1][2].append(value)
+                runs[-1][3].append(self._row(repository, value))
+            else:
+                runs.append((op, repository, [value], [self._row(repository, value)] if op == 'store' else []))
+        results: List[Any] = []
+        with self._transaction(sum(len(run[2]) for run in runs)) as changes:
+            for op, repository, values, rows in runs:
+                if op == 'store':
+                    self._write_many(self._writer, repository, values, rows)
+                    changes.extend(('store', repository, obj.id, obj) for obj in values)
+                    results.extend([None] * len(values))
+                else:
+                    deleted = self._write_delete(self._writer, repository, values[0])
+                    if deleted:
+                        changes.append(('delete', repository, values[0], None))
+                    results.append(deleted)
+        return results
+
+    def version(self, repository: str) -> int:
+        """Number of writes made to a repository so far, by any process."""
+        with self._reader() as connection:
+            return connection.execute("SELECT value FROM storage_meta WHERE key = ?", (repository,)).fetchone()[0]
+
+    def object_version(self, repository: str, obj_id: str) -> Optional[int]:
+        """Repository version of an object's last write, or None if it is not stored."""
+        with self._reader() as connection:
+            row = connection.execute(self._sql[repository]['version'], (obj_id,)).fetchone()
+        return row[0] if row else None
+
+    def _list(self, repository: str) -> List[Any]:
+        with self._reader() as connection:
+            rows = connection.execute(self._sql[repository]['list']).fetchall()
+        return [pickle.loads(row[0]) for row in rows]
+
+    @staticmethod
+    def _conditions(table: str, criteria: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        conditions, params = [], []
+        for attribute, value in criteria.items():
+            if value is None:
+                continue
+            if attribute in LIST_ATTRIBUTES:
+                conditions.append(f"id IN (SELECT owner_id FROM {table}_{attribute} WHERE value = ?)")
+            else:
+                conditions.append(f"{attribute} = ?")
+            params.append(_column_value(value))
+        return conditions, params
+
+    def _find(self, repository: str, **criteria: Any) -> List[Any]:
+        """Objects matching every non-None criterion, filtered by SQLite on the indexed columns."""
+        table = TABLES[repository]
+        conditions, params = self._conditions(table, criteria)
+        if not conditions:
+            return self._list(repository)
+        sql = f"SELECT data FROM {table} WHERE {' AND '.join(conditions)} ORDER BY rowid"
+        with self._reader() as connection:
+            rows = connection.execute(sql, params).fetchall()
+        return [pickle.loads(row[0]) for row in rows]
+
+    def _page(self, repository: str, after: int = 0, limit: Optional[int] = None,
+              **criteria: Any) -> Tuple[List[Any], Optional[int]]:
+        """
+        Up to `limit` matching objects with a rowid above `after`, in rowid
+        order, and the cursor of the next page (None once exhausted). Upserts
+        keep an object's rowid, so pages are stable while objects change.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        table = TABLES[repository]
+        conditions, params = self._conditions(table, criteria)
+        sql = (f"SELECT rowid, data FROM {table} WHERE {' AND '.join(['rowid > ?'] + conditions)} "
+               f"ORDER BY rowid LIMIT ?")
+        with self._reader() as connection:
+            rows = connection.execute(sql, [after] + params + [-1 if limit is None else limit + 1]).fetchall()
+        more = limit is not None and len(rows) > limit
+        rows = rows[:limit] if more else rows
+        return [pickle.loads(row[1]) for row in rows], (rows[-1][0] if more else None)
+
+    def store_agent(self, agent: Any) -> None:
+        """Store an agent in the repository"""
+        self._store_many('agent_repository', [agent])
+
+    def store_agents(self, agents: Sequence[Any]) -> None:
+        """Store many agents in one transaction"""
+        self._store_many('agent_repository', agents)
+
+    def get_agent(self, agent_id: str) -> Optional[Any]:
+        """Retrieve an agent by ID"""
+        return self._get('agent_repository', agent_id)
+
+    def delete_agent(self, agent_id: str) -> bool:
+        """Delete an agent by ID"""
+        return self._delete('agent_repository', agent_id)
+
+    def store_project(self, project: Any) -> None:
+        """Store a project in the repository"""
+        self._store_many('project_repository', [project])
+
+    def store_projects(self, projects: Sequence[Any]) -> None:
+        """Store many projects in one transaction"""
+        self._store_many('project_repository', projects)
+
+    def get_project(self, project_id: str) -> Optional[Any]:
+        """Retrieve a project by ID"""
+        return self._get('project_repository', project_id)
+
+    def delete_project(self, project_id: str) -> bool:
+        """Delete a project by ID"""
+        return self._delete('project_repository', project_id)
+
+    def store_task(self, task: Any) -> None:
+        """Store a task in the repository"""
+        self._store_many('task_repository', [task])
+
+    def store_tasks(self, tasks: Sequence[Any]) -> None:
+        """Store many tasks in one transaction"""
+        self._store_many('task_repository', tasks)
+
+    def get_task(self, task_id: str) -> Optional[Any]:
+        """Retrieve a task by ID"""
+        return self._get('task_repository', task_id)
+
+    def delete_task(self, task_id: str) -> bool:
+        """Delete a task by ID"""
+        return self._delete('task_repository', task_id)
+
+    def store_assignment(self, assignment: Any) -> None:
+        """Store an assignment in the repository"""
+        self._store_many('assignment_repository', [assignment])
+
+    def store_assignments(self, assignments: Sequence[Any]) -> None:
+        """Store many assignments in one transaction"""
+        self._store_many('assignment_repository', assignments)
+
+    def get_assignment(self, assignment_id: str) -> Optional[Any]:
+        """Retrieve an assignment by ID"""
+        return self._get('assignment_repository', assignment_id)
+
+    def delete_assignment(self, assignment_id: str) -> bool:
+        """Delete an assignment by ID"""
+        return self._delete('assignment_repository', assignment_id)
+
+    def list_agents(self) -> List[Any]:
+        """List all agents"""
+        return self._list('agent_repository')
+
+    def list_projects(self) -> List[Any]:
+        """List all projects"""
+        return self._list('project_repository')
+
+    def list_tasks(self) -> List[Any]:
+        """List all tasks"""
+        return self._list('task_repository')
+
+    def list_assignments(self) -> List[Any]:
+        """List all assignments"""
+        return self._list('assignment_repository')
+
+    def find_tasks(self, status: Optional[str] = None, priority: Optional[str] = None,
+                   tag: Optional[str] = None) -> List[Any]:
+        """List tasks matching every given status, priority and tag"""
+        return self._find('task_repository', status=status, priority=priority, tags=tag)
+
+    def find_assignments(self, agent_id: Optional[str] = None, task_id: Optional[str] = None,
+                         status: Optional[str] = None) -> List[Any]:
+        """List assignments matching every given agent, task and status"""
+        return self._find('assignment_repository', agent_id=agent_id, task_id=task_id, status=status)
+
+    def page_agents(self, after: int = 0, limit: Optional[int] = None) -> Tuple[List[Any], Optional[int]]:
+        """Agents after a cursor, and the cursor of the next page (None when done)"""
+        return self._page('agent_repository', after, limit)
+
+    def page_projects(self, after: int = 0, limit: Optional[int] = None) -> Tuple[List[Any], Optional[int]]:
+        """Projects after a cursor, and the cursor of the next page (None when done)"""
+        return self._page('project_repository', after, limit)
+
+    def page_tasks(self, after: int = 0, limit: Optional[int] = None, status: Optional[str] = None,
+                   priority: Optional[str] = None, tag: Optional[str] = None) -> Tuple[List[Any], Optional[int]]:
+        """Tasks matching the filters after a cursor, and the cursor of the next page"""
+        return self._page('task_repository', after, limit, status=status, priority=priority, tags=tag)
+
+    def page_assignments(self, after: int = 0, limit: Optional[int] = None, agent_id: Optional[str] = None,
+                         task_id: Optional[str] = None,
+                         status: Optional[str] = None) -> Tuple[List[Any], Optional[int]]:
+        """Assignments matching the filters after a cursor, and the cursor of the next page"""
+        return self._page('assignment_repository', after, limit, agent_id=agent_id, task_id=task_id,
+                          status=status)
+
+    def close(self) -> None:
+        """Close every connection."""
+        with self._write_lock:
+            self._writer.execute('PRAGMA optimize')
+            self._writer.close()
+        for connection in self._readers:
+            connection.close()
@@ -2,44 +2,1069 @@
 Data storage module for the Creation AI Ecosystem.
 Includes both vector database operations and standard data storage functionality.
 """
-from typing import Any, List, Dict, Optional
+from typing import Any, Callable, Hashable, Iterator, List, Dict, Mapping, Optional, Sequence, Tuple
 import uuid
 from dataclasses import dataclass
+import os
+import threading
+import itertools
+from bisect import bisect_right
+from contextlib import ExitStack, contextmanager
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+import numpy as np
+
+from .change_log import ChangeLog
+from .hnsw_index import HNSWIndex
+from .ivf_index import IVFIndex
+from .lexical_index import LexicalIndex
+from .metadata_index import MetadataIndex
+from .quantization import ProductQuantizer, ScalarQuantizer
+from .scoring import METRICS, batch_top_k as _batch_top_k, score, top_k as _top_k
+from .segment_store import SegmentStore
+
+INDEX_TYPES = {'flat': None, 'ivf': IVFIndex, 'hnsw': HNSWIndex}
+CODEC_TYPES = {'none': None, 'sq8': ScalarQuantizer, 'pq': ProductQuantizer}
+
+
+@dataclass
+class QueryBatchResult:
+    """
+    Packed VectorDB.query_batch() results. Row i holds the hits of query i,
+    best first; slots past the last hit have id None, score -inf and row -1.
+    """
+    ids: np.ndarray
+    scores: np.ndarray
+    rows: np.ndarray
+
+
+def _reader(method: Callable) -> Callable:
+    """Run a VectorDB query as a reader, so compact() waits until it has finished."""
+    @functools.wraps(method)
+    def read(self: 'VectorDB', *args: Any, **kwargs: Any) -> Any:
+        with self._reading():
+            return method(self, *args, **kwargs)
+    return read
+
 
 class VectorDB:
-    def __init__(self, db_name: str):
+    """
+    Vector database backed by contiguous float32 matrices.
+    Each doc_id maps to a global row; re-adding an id tombstones its previous row.
+    Scores are "higher is better": cosine similarity, dot product, or the
+    negated squared euclidean distance for the l2 metric.
+
+    Without a `path` everything lives in one growable in-memory matrix. With a
+    `path` rows are appended to an on-disk SegmentStore: full segments are
+    sealed and memory-mapped, and only the active segment is held in memory.
+
+    `index` selects the search backend. 'flat' scans every row. 'ivf' is built
+    by train_index() and falls back to a flat scan until then; 'hnsw' indexes
+    rows as they are inserted and, in persistent mode, is saved next to the
+    segments. `index_options` are passed to the backend's constructor.
+
+    `codec` ('sq8' or 'pq') keeps a compact code per row once train_codec()
+    has run. Flat and IVF searches then score the codes, and the best
+    `rerank` candidates are re-scored against the full-precision vectors,
+    which in persistent mode stay in the memory-mapped segments and are only
+    paged in for re-ranking. In memory mode the full-precision rows stay in
+    memory next to the codes, so a codec speeds up scans but adds memory;
+    get_info()['bytes_per_vector'] reports what each row actually holds.
+
+    Metadata is kept in an inverted index so query(filter=...) can restrict
+    the search to matching rows. Filters matching at most
+    `filter_scan_rows` rows are answered by an exact scan of that subset;
+    broader ones are applied as a mask inside the configured backend.
+
+    The metadata field named by `text_field` is also indexed for BM25
+    keyword search (query_text) and hybrid keyword + vector search
+    (query_hybrid); pass text_field=None to disable it.
+    Writers are serialized by an internal lock; queries never take it.
+    Appends publish new rows by bumping the row count last, so queries read
+    a consistent prefix. compact() renumbers rows in place instead, so it
+    waits for running queries to finish and holds new ones until it is done.
+    """
+    def __init__(self, db_name: str, dim: Optional[int] = None, metric: str = 'cosine',
+                 initial_capacity: int = 1024, path: Optional[str] = None,
+                 segment_rows: int = 65536, read_only: bool = False, index: str = 'flat',
+                 index_options: Optional[Dict[str, Any]] = None, codec: str = 'none',
+                 codec_options: Optional[Dict[str, Any]] = None, rerank: int = 0,
+                 filter_scan_rows: int = 20000, text_field: Optional[str] = 'text'):
+        if metric not in METRICS:
+            raise ValueError(f"Unsupported metric '{metric}', expected one of {METRICS}")
+        if index not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index '{index}', expected one of {tuple(INDEX_TYPES)}")
+        if codec not in CODEC_TYPES:
+            raise ValueError(f"Unsupported codec '{codec}', expected one of {tuple(CODEC_TYPES)}")
         self.db_name = db_name
+        self.metric = metric
+        self.index_type = index
+        self.index_options = dict(index_options or {})
+        self.codec_type = codec
+        self.codec_options = dict(codec_options or {})
+        self.rerank = rerank
+        self.filter_scan_rows = filter_scan_rows
+        self.text_field = text_field
+        self._index: Optional[Any] = None
+        self._codec: Optional[Any] = None
+        self._lock = threading.RLock()
+        self._gate = threading.Condition()  # guards _readers and _compacting
+        self._readers = 0
+        self._compacting = False
+        self.dim: Optional[int] = None
+        self._initial_capacity = max(1, int(initial_capacity))
+        self._size = 0
+        self._deleted = 0
+        self._sealed: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        self._active_base = 0
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._live = np.empty(0, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._metadata_index = MetadataIndex()
+        self._lexical_index = LexicalIndex()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._generation = 0
+        if index != 'flat' and not hasattr(INDEX_TYPES[index], 'train'):
+            self._index = self._new_index()
+        self._store: Optional[SegmentStore] = None
+        if path is not None:
+            self._store = SegmentStore(path, segment_rows=segment_rows, read_only=read_only)
+            if self._store.initialized:
+                if self._store.metric != metric:
+                    raise ValueError(f"Database at {path} uses metric '{self._store.metric}'")
+                if dim is not None and dim != self._store.dim:
+                    raise ValueError(f"Database at {path} has dimension {self._store.dim}")
+                self._load()
+                return
+            if read_only:
+                raise ValueError(f"No vector database found at {path}")
+        if dim is not None:
+            self._allocate(int(dim))
+
+    def _allocate(self, dim: int) -> None:
+        if dim <= 0:
+            raise ValueError("Embedding dimension must be positive")
+        self.dim = dim
+        self._vectors = np.empty((self._initial_capacity, dim), dtype=np.float32)
+        self._sq_norms = np.empty(self._initial_capacity, dtype=np.float32)
+        self._live = np.zeros(self._initial_capacity, dtype=bool)
+        if self._store is not None and not self._store.initialized:
+            self._store.initialize(dim, self.metric)
+
+    def _load(self) -> None:
+        """Rebuild the in-memory state from the segment store."""
+        self._allocate(self._store.dim)
+        state = self._store.load()
+        self._sealed = []
+        base = 0
+        for vectors, norms in state['sealed']:
+            self._sealed.append((base, vectors, norms))
+            base += vectors.shape[0]
+        self._active_base = base
+        records = state['records']
+        active_vectors, active_norms = state['active']
+        self._size = 0
+        self._deleted = 0
+        self._ids, self._metadata, self._id_to_row = [], [], {}
+        self._metadata_index.reset()
+        self._lexical_index.reset()
+        self._live = np.zeros(max(len(records), self._initial_capacity), dtype=bool)
+        self._live[:len(records)] = True
+        capacity = max(active_vectors.shape[0], self._initial_capacity)
+        self._vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        self._vectors[:active_vectors.shape[0]] = active_vectors
+        self._sq_norms = np.empty(capacity, dtype=np.float32)
+        self._sq_norms[:active_norms.shape[0]] = active_norms
+        for row, (doc_id, metadata) in enumerate(records):
+            self._register(row, doc_id, metadata)
+        self._size = len(records)
+        for row in state['deleted']:
+            if row < self._size and self._live[row]:
+                self._id_to_row.pop(self._ids[row], None)
+                self._tombstone(row)
+        self._restore_components()
+
+    @property
+    def _active_size(self) -> int:
+        return self._size - self._active_base
+
+    def _reserve(self, rows: int) -> None:
+        needed = self._size + rows
+        if needed > self._live.shape[0]:
+            live = np.zeros(max(needed, 2 * self._live.shape[0]), dtype=bool)
+            live[:self._size] = self._live[:self._size]
+            self._live = live
+        local = self._active_size
+        if local + rows > self._vectors.shape[0]:
+            capacity = max(local + rows, 2 * self._vectors.shape[0])
+            vectors = np.empty((capacity, self.dim), dtype=np.float32)
+            vectors[:local] = self._vectors[:local]
+            sq_norms = np.empty(capacity, dtype=np.float32)
+            sq_norms[:local] = self._sq_norms[:local]
+            self._vectors, self._sq_norms = vectors, sq_norms
+
+    def _prepare(self, embeddings: Any) -> np.ndarray:
+        """Convert embeddings to a 2-D float32 matrix in the stored representation."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix[np.newaxis, :]
+        if matrix.ndim != 2:
+            raise ValueError("Embeddings must be a vector or a 2-D matrix")
+        if self.dim is None:
+            self._allocate(matrix.shape[1])
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected embedding dimension {self.dim}, got {matrix.shape[1]}")
+        if self.metric == 'cosine':
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        return matrix
+
+    def _register(self, row: int, doc_id: str, metadata: Dict[str, Any]) -> None:
+        previous = self._id_to_row.get(doc_id)
+        if previous is not None:
+            self._tombstone(previous)
+        self._id_to_row[doc_id] = row
+        self._ids.append(doc_id)
+        self._metadata.append(metadata)
+        self._index_metadata(row, metadata)
+
+    def _text(self, metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+        if self.text_field is None or not metadata:
+            return None
+        return metadata.get(self.text_field)
+
+    def _index_metadata(self, row: int, metadata: Optional[Dict[str, Any]]) -> None:
+        self._metadata_index.add(row, metadata)
+        self._lexical_index.add(row, self._text(metadata))
+
+    def _tombstone(self, row: int) -> None:
+        self._lexical_index.remove(row, self._text(self._metadata[row]))
+        self._live[row] = False
+        self._ids[row] = None
+        self._metadata[row] = None
+        self._deleted += 1
+
+    def _check_writable(self) -> None:
+        if self._store is not None and self._store.read_only:
+            raise PermissionError(f"VectorDB '{self.db_name}' was opened read-only")
 
     def add_embedding(self, doc_id: str, embedding: List[float], metadata: Dict[str, Any]) -> None:
         """Add a vector embedding to the database."""
-        raise NotImplementedError
+        self.add_embeddings([doc_id], [embedding], [metadata])
+
+    def add_embeddings(self, doc_ids: Sequence[str], embeddings: Any,
+                       metadatas: Optional[Sequence[Dict[str, Any]]] = None) -> None:
+        """Add a batch of embeddings with a single copy into the matrix."""
+        self._check_writable()
+        with self._lock:
+            self._add(doc_ids, embeddings, metadatas)
+
+    def _add(self, doc_ids: Sequence[str], embeddings: Any,
+             metadatas: Optional[Sequence[Dict[str, Any]]]) -> None:
+        matrix = self._prepare(embeddings)
+        if len(doc_ids) != matrix.shape[0]:
+            raise ValueError("doc_ids and embeddings must have the same length")
+        if metadatas is None:
+            metadatas = [{} for _ in doc_ids]
+        elif len(metadatas) != len(doc_ids):
+            raise ValueError("metadatas and doc_ids must have the same length")
+        sq_norms = np.einsum('ij,ij->i', matrix, matrix)
+        start = 0
+        while start < len(doc_ids):
+            stop = len(doc_ids)
+            if self._store is not None:
+                stop = min(stop, start + self._store.segment_rows - self._active_size)
+            self._append(doc_ids[start:stop], matrix[start:stop], sq_norms[start:stop],
+                         metadatas[start:stop])
+            start = stop
+
+    def _append(self, doc_ids: Sequence[str], matrix: np.ndarray, sq_norms: np.ndarray,
+                metadatas: Sequence[Dict[str, Any]]) -> None:
+        rows = matrix.shape[0]
+        self._reserve(rows)
+        local = self._active_size
+        self._vectors[local:local + rows] = matrix
+        self._sq_norms[local:local + rows] = sq_norms
+        self._live[self._size:self._size + rows] = True
+        if self._store is not None:
+            self._store.append(matrix, sq_norms, [[d, m] for d, m in zip(doc_ids, metadatas)])
+        for offset, doc_id in enumerate(doc_ids):
+            self._register(self._size + offset, doc_id, metadatas[offset])
+        self._size += rows
+        for _, component in self._components():
+            if component.trained:
+                component.add(np.arange(self._size - rows, self._size), matrix, self)
+        if self._store is not None and self._store.active_rows >= self._store.segment_rows:
+            vectors, norms = self._store.seal()
+            self._sealed.append((self._active_base, vectors, norms))
+            self._active_base = self._size
+
+    def delete_embedding(self, doc_id: str) -> bool:
+        """Delete an embedding by document ID"""
+        self._check_writable()
+        with self._lock:
+            row = self._id_to_row.pop(doc_id, None)
+            if row is None:
+                return False
+            self._tombstone(row)
+            if self._store is not None:
+                self._store.delete(row)
+            return True
+
+    def _blocks(self) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+        """Return (base_row, vectors, sq_norms) for every sealed segment and the active buffer."""
+        local = self._active_size
+        return self._sealed + [(self._active_base, self._vectors[:local], self._sq_norms[:local])]
+
+    def gather(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the full-precision vectors and squared norms of the given global rows."""
+        rows = np.asarray(rows, dtype=np.int64)
+        if not self._sealed:
+            return self._vectors[rows], self._sq_norms[rows]
+        blocks = self._blocks()
+        vectors = np.empty((rows.shape[0], self.dim), dtype=np.float32)
+        sq_norms = np.empty(rows.shape[0], dtype=np.float32)
+        bases = np.array([base for base, _, _ in blocks])
+        owner = np.searchsorted(bases, rows, side='right') - 1
+        for block in np.unique(owner):
+            selected = owner == block
+            base, block_vectors, block_norms = blocks[block]
+            vectors[selected] = block_vectors[rows[selected] - base]
+            sq_norms[selected] = block_norms[rows[selected] - base]
+        return vectors, sq_norms
+
+    def score_rows(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Score rows against a prepared query, from their codes when a codec is trained."""
+        codec = self._codec
+        if codec is not None and codec.trained:
+            return codec.score_rows(query, rows)
+        return score(query, *self.gather(rows), self.metric)
+
+    @contextmanager
+    def _reading(self) -> Iterator[None]:
+        with self._gate:
+            while self._compacting:
+                self._gate.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._gate:
+                self._readers -= 1
+                if not self._readers:
+                    self._gate.notify_all()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Wait for running queries to finish and hold new ones off until the block exits."""
+        with self._gate:
+            self._compacting = True
+            while self._readers:
+                self._gate.wait()
+        try:
+            yield
+        finally:
+            with self._gate:
+                self._compacting = False
+                self._gate.notify_all()
+
+    @_reader
+    def query(self, embedding: List[float], top_k: int = 5, nprobe: Optional[int] = None,
+              ef_search: Optional[int] = None, rerank: Optional[int] = None,
+              filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Query the database for similar embeddings. `nprobe` ('ivf') and
+        `ef_search` ('hnsw') trade recall for latency on the approximate
+        backends and are ignored by the others. `rerank` overrides how many
+        codec-scored candidates are re-scored at full precision.
+
+        `filter` restricts results to rows whose metadata matches every key;
+        a list value matches any of its elements, e.g.
+        {'agent_id': 'a1', 'type': ['episodic', 'semantic']}.
+        """
+        size = self._size
+        if size == 0 or top_k <= 0:
+            return []
+        query = self._prepare(embedding)[0]
+        rows, scores = self._search(query, size, top_k, nprobe, ef_search, rerank, filter)
+        return [self._result(int(row), float(s)) for row, s in zip(rows, scores)]
+
+    def _search(self, query: np.ndarray, size: int, top_k: int, nprobe: Optional[int] = None,
+                ef_search: Optional[int] = None, rerank: Optional[int] = None,
+                filter: Optional[Dict[str, Any]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Search one prepared query over the first `size` rows. Returns (rows, scores), best first."""
+        live = self._live[:size]
+        if filter:
+            matches = self._matching_rows(filter, size)
+            if matches.shape[0] <= max(self.filter_scan_rows, top_k):
+                scores = score(query, *self.gather(matches), self.metric)
+                best = _top_k(scores, top_k)
+                return matches[best], scores[best]
+            live = np.zeros(size, dtype=bool)
+            live[matches] = True
+        codec = self._codec if self._codec is not None and self._codec.trained else None
+        rerank = self.rerank if rerank is None else rerank
+        candidates = max(top_k, rerank) if codec is not None else top_k
+        index = self._index
+        if index is not None and index.trained:
+            params = {'nprobe': nprobe, 'ef_search': ef_search}
+            params = {k: v for k, v in params.items() if k in index.SEARCH_PARAMS and v is not None}
+            rows, scores = index.search(query, candidates, self, live, **params)
+        else:
+            rows, scores = self._scan(query, size, codec, live if filter else None)
+        best = _top_k(scores, candidates)
+        rows, scores = rows[best], scores[best]
+        if codec is not None and rerank > 0 and rows.shape[0]:
+            scores = score(query, *self.gather(rows), self.metric)
+            best = _top_k(scores, top_k)
+            rows, scores = rows[best], scores[best]
+        return rows[:top_k], scores[:top_k]
+
+    @_reader
+    def query_batch(self, embeddings: Any, top_k: int = 5, packed: bool = False,
+                    nprobe: Optional[int] = None, ef_search: Optional[int] = None,
+                    rerank: Optional[int] = None, filter: Optional[Dict[str, Any]] = None,
+                    shard_rows: int = 65536) -> Any:
+        """
+        Query the database with a matrix of embeddings, one per row.
+
+        Without an index, codec or filter the corpus is split into shards of
+        `shard_rows` rows; each shard scores the whole query matrix with one
+        matrix product, shards run on a thread pool (NumPy releases the GIL)
+        and the per-shard top-k are merged. Otherwise each query is searched
+        as in query(), also spread over the pool.
+
+        Returns one list of query() results per embedding, or a
+        QueryBatchResult of packed (queries, top_k) arrays with packed=True.
+        """
+        queries = self._prepare(embeddings)
+        size = self._size
+        top_k = max(0, min(top_k, size - self._deleted))
+        codec = self._codec is not None and self._codec.trained
+        index = self._index is not None and self._index.trained
+        if top_k == 0:
+            rows = np.empty((queries.shape[0], 0), dtype=np.int64)
+            scores = np.empty((queries.shape[0], 0), dtype=np.float32)
+        elif not (codec or index or filter):
+            rows, scores = self._scan_batch(queries, size, top_k, shard_rows)
+        else:
+            rows = np.full((queries.shape[0], top_k), -1, dtype=np.int64)
+            scores = np.full((queries.shape[0], top_k), -np.inf, dtype=np.float32)
+            found = self._pool().map(
+                lambda query: self._search(query, size, top_k, nprobe, ef_search, rerank, filter), queries)
+            for i, (query_rows, query_scores) in enumerate(found):
+                rows[i, :query_rows.shape[0]] = query_rows
+                scores[i, :query_scores.shape[0]] = query_scores
+        if packed:
+            ids = np.full(rows.shape, None, dtype=object)
+            hits = rows >= 0
+            ids[hits] = [self._ids[row] for row in rows[hits].tolist()]
+            return QueryBatchResult(ids=ids, scores=scores, rows=rows)
+        return [[self._result(row, s) for row, s in zip(query_rows, query_scores) if row >= 0]
+                for query_rows, query_scores in zip(rows.tolist(), scores.tolist())]
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Thread pool shared by batch queries, created on first use."""
+        if self._executor is None:
+            # Not self._lock: batch queries create the pool, and compact() holds the lock while waiting for them.
+            with self._gate:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(thread_name_prefix=f"{self.db_name}-query")
+        return self._executor
+
+    def _scan_batch(self, queries: np.ndarray, size: int, top_k: int,
+                    shard_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exhaustive sharded search for a query matrix. Returns (rows, scores) of shape (b, top_k)."""
+        live = self._live[:size]
+        shards = []
+        for base, vectors, sq_norms in self._blocks():
+            stop = min(base + vectors.shape[0], size)
+            for start in range(base, stop, shard_rows):
+                end = min(start + shard_rows, stop)
+                shards.append((start, vectors[start - base:end - base], sq_norms[start - base:end - base]))
+
+        def search_shard(shard: Tuple[int, np.ndarray, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+            start, vectors, sq_norms = shard
+            scores = score(queries, vectors, sq_norms, self.metric)
+            if self._deleted:
+                scores[:, ~live[start:start + vectors.shape[0]]] = -np.inf
+            best = _batch_top_k(scores, top_k)
+            return best + start, np.take_along_axis(scores, best, axis=1)
+
+        if len(shards) == 1:
+            parts = [search_shard(shards[0])]
+        else:
+            parts = list(self._pool().map(search_shard, shards))
+        rows = np.concatenate([part[0] for part in parts], axis=1)
+        scores = np.concatenate([part[1] for part in parts], axis=1)
+        best = _batch_top_k(scores, top_k)
+        rows = np.take_along_axis(rows, best, axis=1)
+        scores = np.take_along_axis(scores, best, axis=1)
+        rows[np.isneginf(scores)] = -1
+        return rows, scores
+
+    def _matching_rows(self, filter: Dict[str, Any], size: int) -> np.ndarray:
+        """Sorted live rows among the first `size` whose metadata matches `filter`."""
+        matches = self._metadata_index.match(filter)
+        matches = matches[matches < size]
+        return matches[self._live[matches]]
+
+    @_reader
+    def query_text(self, text: str, top_k: int = 5,
+                   filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Keyword search: rank rows by BM25 over their `text_field` metadata."""
+        size = self._size
+        if size == 0 or top_k <= 0:
+            return []
+        rows, scores = self._search_text(text, size, filter)
+        best = _top_k(scores, top_k)
+        return [self._result(int(rows[i]), float(scores[i])) for i in best]
+
+    def _search_text(self, text: str, size: int,
+                     filter: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        live = self._live[:size]
+        if filter:
+            live = np.zeros(size, dtype=bool)
+            live[self._matching_rows(filter, size)] = True
+        return self._lexical_index.search(text, live)
+
+    @_reader
+    def query_hybrid(self, embedding: List[float], text: str, top_k: int = 5, fusion: str = 'rrf',
+                     alpha: float = 0.5, rrf_k: int = 60, candidates: int = 100,
+                     filter: Optional[Dict[str, Any]] = None, **search: Any) -> List[Dict[str, Any]]:
+        """
+        Fuse vector and BM25 rankings. Each side contributes its best
+        `candidates` rows. fusion='rrf' (reciprocal rank fusion) scores a row
+        by the sum of 1 / (rrf_k + rank) over the lists it appears in;
+        fusion='weighted' blends min-max normalized scores as
+        alpha * vector + (1 - alpha) * lexical. Extra keyword arguments
+        (nprobe, ef_search, rerank) are passed to the vector search.
+        """
+        if fusion not in ('rrf', 'weighted'):
+            raise ValueError(f"Unsupported fusion '{fusion}', expected 'rrf' or 'weighted'")
+        size = self._size
+        if size == 0 or top_k <= 0:
+            return []
+        candidates = max(candidates, top_k)
+        vector_rows, vector_scores = self._search(self._prepare(embedding)[0], size, candidates,
+                                                  filter=filter, **search)
+        lexical_rows, lexical_scores = self._search_text(text, size, filter)
+        best = _top_k(lexical_scores, candidates)
+        lexical_rows, lexical_scores = lexical_rows[best], lexical_scores[best]
+        fused: Dict[int, float] = {}
+        for rows, scores, weight in ((vector_rows, vector_scores, alpha),
+                                     (lexical_rows, lexical_scores, 1.0 - alpha)):
+            if fusion == 'rrf':
+                contributions = 1.0 / (rrf_k + np.arange(1, rows.shape[0] + 1))
+            else:
+                spread = float(scores.max() - scores.min()) if scores.shape[0] else 0.0
+                contributions = weight * ((scores - scores.min()) / spread if spread > 0
+                                          else np.ones(scores.shape[0]))
+            for row, contribution in zip(rows.tolist(), contributions.tolist()):
+                fused[row] = fused.get(row, 0.0) + contribution
+        ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [self._result(row, s) for row, s in ranked]
+
+    def _scan(self, query: np.ndarray, size: int, codec: Optional[Any],
+              mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score the live rows among the first `size` exhaustively, or only those
+        set in `mask` when one is given. Returns (rows, scores).
+        """
+        if codec is not None:
+            scores = codec.score_prefix(query, size)
+        else:
+            scores = np.empty(size, dtype=np.float32)
+            for base, vectors, sq_norms in self._blocks():
+                stop = min(base + vectors.shape[0], size)
+                if stop > base:
+                    scores[base:stop] = score(query, vectors[:stop - base], sq_norms[:stop - base],
+                                              self.metric)
+        if mask is None and self._deleted:
+            mask = self._live[:size]
+        if mask is not None:
+            return np.flatnonzero(mask), scores[mask]
+        return np.arange(size), scores
+
+    def _result(self, row: int, score: float) -> Dict[str, Any]:
+        return {'id': self._ids[row], 'score': score, 'metadata': self._metadata[row]}
+
+    def _new_index(self) -> Any:
+        return INDEX_TYPES[self.index_type](self.metric, **self.index_options)
 
-    def query(self, embedding: List[float], top_k: int = 5) -> List[Dict[str, Any]]:
-        """Query the database for similar embeddings."""
-        raise NotImplementedError
+    def _new_codec(self) -> Any:
+        return CODEC_TYPES[self.codec_type](self.metric, **self.codec_options)
+
+    def _live_rows(self, stop: int) -> np.ndarray:
+        return np.flatnonzero(self._live[:stop])
+
+    def _index_rows(self, index: Any, start: int, stop: int, chunk: int = 65536) -> None:
+        for chunk_start in range(start, stop, chunk):
+            rows = np.flatnonzero(self._live[chunk_start:min(chunk_start + chunk, stop)]) + chunk_start
+            index.add(rows, self.gather(rows)[0], self)
+
+    def _components(self) -> List[Tuple[str, Any]]:
+        """Return (file name, object) for the codec and the index, whichever exist."""
+        components = []
+        if self._codec is not None:
+            components.append((f"codec-{self.codec_type}.npz", self._codec))
+        if self._index is not None:
+            components.append((f"index-{self.index_type}.npz", self._index))
+        return components
+
+    def _reindex(self) -> None:
+        """Re-add every live row to the trained codec and index after rows were renumbered."""
+        for _, component in self._components():
+            if component.trained:
+                component.reset()
+                self._index_rows(component, 0, self._size)
+        self._save_components()
+
+    def _save_components(self) -> None:
+        """Persist the codec and index with the segment list and row count they cover."""
+        if self._store is None or self._store.read_only:
+            return
+        for name, component in self._components():
+            if not component.trained or not hasattr(component, 'save'):
+                continue
+            path = os.path.join(self._store.path, name)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as f:
+                component.save(f, segments=self._store.segment_names(), rows=self._size)
+            os.replace(tmp, path)
+
+    def _restore_component(self, cls: Any, name: str, options: Dict[str, Any]) -> Optional[Any]:
+        """
+        Load a saved codec or index if it was built over a prefix of the
+        current segments, then add the rows appended since it was saved.
+        """
+        if cls is None or not hasattr(cls, 'load'):
+            return None
+        path = os.path.join(self._store.path, name)
+        if not os.path.exists(path):
+            return None
+        component, extra = cls.load(path, self.metric, **options)
+        segments = [str(segment) for segment in extra.get('segments', [])]
+        rows = int(extra.get('rows', -1))
+        if segments != self._store.segment_names()[:len(segments)] or not 0 <= rows <= self._size:
+            return None
+        self._index_rows(component, rows, self._size)
+        return component
+
+    def _restore_components(self) -> None:
+        """Restore the saved codec and index, rebuilding whichever in-memory one is stale."""
+        restored = {
+            '_codec': self._restore_component(CODEC_TYPES[self.codec_type],
+                                              f"codec-{self.codec_type}.npz", self.codec_options),
+            '_index': self._restore_component(INDEX_TYPES[self.index_type],
+                                              f"index-{self.index_type}.npz", self.index_options),
+        }
+        stale = False
+        for attr, component in restored.items():
+            if component is not None:
+                setattr(self, attr, component)
+            elif getattr(self, attr) is not None and getattr(self, attr).trained:
+                stale = True
+        if stale:
+            self._reindex()
+
+    def train_index(self, sample_size: Optional[int] = None, background: bool = False,
+                    seed: int = 0) -> Optional[threading.Thread]:
+        """
+        (Re)build the approximate index from the current rows. The new index is
+        trained and filled off to the side and swapped in atomically, so queries
+        keep using the previous index (or the flat scan) until it is ready.
+        With background=True the work runs on a daemon thread, which is returned.
+        """
+        if self.index_type == 'flat':
+            return None
+        if background:
+            thread = threading.Thread(target=self.train_index, kwargs={'sample_size': sample_size, 'seed': seed},
+                                      name=f"{self.db_name}-train-index", daemon=True)
+            thread.start()
+            return thread
+        with self._reading():
+            with self._lock:
+                snapshot = self._size
+                generation = self._generation
+                live = self._live_rows(snapshot)
+            if live.shape[0] == 0:
+                return None
+            index = self._new_index()
+            if hasattr(index, 'train'):
+                if sample_size is None:
+                    sample_size = min(live.shape[0], 256 * getattr(index, 'nlist', 256))
+                rng = np.random.default_rng(seed)
+                sample = np.sort(rng.choice(live, min(sample_size, live.shape[0]), replace=False))
+                index.train(self.gather(sample)[0])
+            self._index_rows(index, 0, snapshot)
+        with self._lock:
+            if generation != self._generation:
+                index.reset()
+                snapshot = 0
+            self._index_rows(index, snapshot, self._size)
+            self._index = index
+            self._save_components()
+        return None
+
+    def train_codec(self, sample_size: int = 65536, seed: int = 0) -> None:
+        """
+        Train the codec on a sample of live rows and encode every row. As in
+        train_index(), the codec is filled off to the side and swapped in.
+        """
+        if self.codec_type == 'none':
+            return
+        with self._reading():
+            with self._lock:
+                snapshot = self._size
+                generation = self._generation
+                live = self._live_rows(snapshot)
+            if live.shape[0] == 0:
+                return
+            codec = self._new_codec()
+            rng = np.random.default_rng(seed)
+            sample = np.sort(rng.choice(live, min(sample_size, live.shape[0]), replace=False))
+            codec.train(self.gather(sample)[0])
+            self._index_rows(codec, 0, snapshot)
+        with self._lock:
+            if generation != self._generation:
+                codec.reset()
+                snapshot = 0
+            self._index_rows(codec, snapshot, self._size)
+            self._codec = codec
+            self._save_components()
+
+    def compact(self, min_segment_rows: Optional[int] = None) -> int:
+        """
+        Drop tombstoned rows. In persistent mode this also merges sealed
+        segments smaller than `min_segment_rows` (default: half a segment).
+        Returns the number of rows removed.
+        """
+        self._check_writable()
+        # Hold off queries before taking the lock: training reads as a query, then takes the lock.
+        with self._exclusive(), self._lock:
+            self._generation += 1
+            return self._compact(min_segment_rows)
+
+    def _compact(self, min_segment_rows: Optional[int]) -> int:
+        if self._store is not None:
+            if min_segment_rows is None:
+                min_segment_rows = self._store.segment_rows // 2
+            live = self._live[:self._size].copy()
+            self._sealed = []
+            removed = self._store.compact(live, min_segment_rows)
+            self._load()
+            return removed
+        removed = self._deleted
+        if not removed:
+            return 0
+        keep = np.flatnonzero(self._live[:self._size])
+        self._vectors[:keep.shape[0]] = self._vectors[keep]
+        self._sq_norms[:keep.shape[0]] = self._sq_norms[keep]
+        self._live[:keep.shape[0]] = True
+        self._live[keep.shape[0]:] = False
+        self._ids = [self._ids[row] for row in keep]
+        self._metadata = [self._metadata[row] for row in keep]
+        self._id_to_row = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._metadata_index.reset()
+        self._lexical_index.reset()
+        for row, metadata in enumerate(self._metadata):
+            self._index_metadata(row, metadata)
+        self._size = keep.shape[0]
+        self._deleted = 0
+        self._reindex()
+        return removed
+
+    def flush(self) -> None:
+        """Force appended rows, deletes, the codec and the index to disk in persistent mode."""
+        if self._store is not None and not self._store.read_only:
+            with self._lock:
+                self._store.flush()
+                self._save_components()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._store is not None and not self._store.read_only:
+            with self._lock:
+                self._save_components()
+                self._store.close()
+
+    def __len__(self) -> int:
+        return self._size - self._deleted
+
+    def _resident_bytes_per_vector(self) -> int:
+        """
+        Vector bytes held in process memory per row. In memory mode every
+        full-precision row stays next to its code, since filters, re-ranking
+        and re-indexing read them; in persistent mode sealed rows are
+        memory-mapped, so only the codes (or, without a codec, the rows) count.
+        """
+        full = 4 * (self.dim or 0)
+        if self._codec is None or not self._codec.trained:
+            return full
+        if self._store is None:
+            return self._codec.bytes_per_vector + full
+        return self._codec.bytes_per_vector
 
     def get_info(self) -> Dict[str, Any]:
+        code_bytes = self._codec.bytes_per_vector if self._codec is not None and self._codec.trained else None
         return {
             'db_name': self.db_name,
+            'metric': self.metric,
+            'dim': self.dim,
+            'count': len(self),
+            'rows': self._size,
+            'persistent': self._store is not None,
+            'segments': len(self._sealed) + 1,
+            'codec': self._codec.get_info() if self._codec is not None else {'codec': self.codec_type},
+            'bytes_per_vector': self._resident_bytes_per_vector(),
+            'code_bytes_per_vector': code_bytes,
+            'full_precision_bytes_per_vector': 4 * (self.dim or 0),
+            'metadata_index': self._metadata_index.get_info(),
+            'lexical_index': self._lexical_index.get_info(),
+            'index': self._index.get_info() if self._index is not None else {'type': self.index_type},
         }
 
+REPOSITORIES = ('agent_repository', 'project_repository', 'task_repository', 'assignment_repository')
+# Secondary indexes maintained by DataStorage: repository -> indexed attributes.
+# List-valued attributes (tags) are indexed once per element.
+SECONDARY_INDEXES = {
+    'task_repository': ('status', 'priority', 'tags'),
+    'assignment_repository': ('agent_id', 'task_id', 'status'),
+}
+
+
 @dataclass
 class DataStorage:
-    """Main data storage class for agent and project data"""
+    """
+    Main data storage class for agent and project data.
+
+    Every mutation goes through _store()/_delete(), which keep the secondary
+    indexes in SECONDARY_INDEXES consistent, so find_tasks() and
+    find_assignments() cost O(result) instead of a scan. Objects mutated in
+    place must be stored again for the indexes to see the change.
+
+    Writers are serialized per repository and bump its version counter;
+    each object records the repository version of its last write, see
+    object_version(). Versions restart with the process, so they are only
+    comparable under the same random `version_epoch`.
+    Readers take no lock and copy nothing they do not return: list_*()
+    copies a repository's values in one C-level call, which a writer cannot
+    interleave with under the GIL, and get_*(), find_*() and page_*() only
+    look up the entries they return.
+
+    Each id gets an increasing sequence number when first stored (kept when
+    it is stored again), so repositories iterate in sequence order and the
+    page_*() methods resume after the last sequence a caller has seen. The
+    order is kept in append-only lists that readers bisect; deleted ids
+    leave stale entries there, which readers skip and writers drop by
+    publishing rebuilt lists once they outnumber the live ones.
+
+    Every store and delete is also appended to `change_log`, a bounded
+    ChangeLog of the last `change_log_size` mutations, so consumers can
+    follow changes instead of re-listing repositories.
+    """
     agent_repository: dict = None
     project_repository: dict = None
     task_repository: dict = None
     assignment_repository: dict = None
+    change_log_size: int = 10000
 
     def __post_init__(self):
         self.agent_repository = {}
         self.project_repository = {}
         self.task_repository = {}
         self.assignment_repository = {}
+        # repository -> attribute -> value -> ids (a dict used as an insertion-ordered set)
+        self._indexes: Dict[str, Dict[str, Dict[Any, Dict[str, None]]]] = {
+            repository: {attribute: {} for attribute in attributes}
+            for repository, attributes in SECONDARY_INDEXES.items()
+        }
+        # repository -> id -> the (attribute, value) pairs the object is indexed under
+        self._indexed: Dict[str, Dict[str, List[Tuple[str, Any]]]] = {
+            repository: {} for repository in SECONDARY_INDEXES
+        }
+        self._locks = {repository: threading.RLock() for repository in REPOSITORIES}
+        self._versions = {repository: 0 for repository in REPOSITORIES}
+        self._object_versions: Dict[str, Dict[str, int]] = {repository: {} for repository in REPOSITORIES}
+        self.version_epoch = uuid.uuid4().hex[:12]
+        self._counter = itertools.count(1)
+        self._sequences: Dict[str, Dict[str, int]] = {repository: {} for repository in REPOSITORIES}
+        # repository -> (sequence numbers, ids) in sequence order, including stale entries of deleted ids
+        self._order: Dict[str, Tuple[List[int], List[str]]] = {repository: ([], []) for repository in REPOSITORIES}
+        self._stale = {repository: 0 for repository in REPOSITORIES}
+        self.change_log = ChangeLog(self.change_log_size)
+
+    @staticmethod
+    def _index_keys(obj: Any, attributes: Sequence[str]) -> List[Tuple[str, Any]]:
+        keys = []
+        for attribute in attributes:
+            value = getattr(obj, attribute, None)
+            values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            for v in dict.fromkeys(v for v in values if v is not None and isinstance(v, Hashable)):
+                keys.append((attribute, v))
+        return keys
+
+    def _unindex(self, repository: str, obj_id: str) -> None:
+        indexes = self._indexes.get(repository)
+        if indexes is None:
+            return
+        for attribute, value in self._indexed[repository].pop(obj_id, ()):
+            ids = indexes[attribute].get(value)
+            if ids is not None:
+                ids.pop(obj_id, None)
+                if not ids:
+                    del indexes[attribute][value]
+
+    def _store(self, repository: str, obj: Any) -> None:
+        """Insert or replace an object in a repository and refresh its index entries."""
+        with self._locks[repository]:
+            self._unindex(repository, obj.id)
+            getattr(self, repository)[obj.id] = obj
+            sequences = self._sequences[repository]
+            if obj.id not in sequences:
+                sequence = sequences[obj.id] = next(self._counter)
+                order_sequences, order_ids = self._order[repository]
+                # Ids first: readers bound their scan by the length of the sequence list.
+                order_ids.append(obj.id)
+                order_sequences.append(sequence)
+            indexes = self._indexes.get(repository)
+            if indexes is not None:
+                keys = self._index_keys(obj, SECONDARY_INDEXES[repository])
+                for attribute, value in keys:
+                    indexes[attribute].setdefault(value, {})[obj.id] = None
+                self._indexed[repository][obj.id] = keys
+            self._versions[repository] += 1
+            self._object_versions[repository][obj.id] = self._versions[repository]
+            self.change_log.append('store', repository, obj.id, obj)
+
+    def _delete(self, repository: str, obj_id: str) -> bool:
+        """Remove an object from a repository and its index entries."""
+        with self._locks[repository]:
+            items = getattr(self, repository)
+            if obj_id not in items:
+                return False
+            self._unindex(repository, obj_id)
+            del items[obj_id]
+            sequences = self._sequences[repository]
+            del sequences[obj_id]
+            del self._object_versions[repository][obj_id]
+            self._stale[repository] += 1
+            if self._stale[repository] > max(64, len(sequences)):
+                # The dict keeps first-store order, which is sequence order.
+                self._order[repository] = (list(sequences.values()), list(sequences))
+                self._stale[repository] = 0
+            self._versions[repository] += 1
+            self.change_log.append('delete', repository, obj_id)
+            return True
+
+    @staticmethod
+    def _check_operations(operations: Sequence[Tuple[str, str, Any]]) -> None:
+        for op, repository, _ in operations:
+            if op not in ('store', 'delete'):
+                raise ValueError(f"Unknown batch operation '{op}'")
+            if repository not in REPOSITORIES:
+                raise ValueError(f"Unknown repository '{repository}'")
+
+    def _apply_operations(self, operations: Sequence[Tuple[str, str, Any]]) -> List[Any]:
+        """Apply a checked batch while holding the lock of every repository it touches."""
+        with ExitStack() as stack:
+            touched = {repository for _, repository, _ in operations}
+            for repository in REPOSITORIES:
+                if repository in touched:
+                    stack.enter_context(self._locks[repository])
+            return [DataStorage._store(self, repository, value) if op == 'store'
+                    else DataStorage._delete(self, repository, value)
+                    for op, repository, value in operations]
+
+    def apply_batch(self, operations: Sequence[Tuple[str, str, Any]]) -> List[Any]:
+        """
+        Apply ('store', repository, object) and ('delete', repository, id)
+        operations in order as one unit: writers to the repositories involved
+        wait until the whole batch is applied. Returns each operation's result
+        (None for a store, whether the id existed for a delete).
+        """
+        operations = list(operations)
+        self._check_operations(operations)
+        return self._apply_operations(operations)
+
+    def version(self, repository: str) -> int:
+        """Number of writes made to a repository so far."""
+        return self._versions[repository]
+
+    def object_version(self, repository: str, obj_id: str) -> Optional[int]:
+        """Repository version of an object's last write, or None if it is not stored."""
+        return self._object_versions[repository].get(obj_id)
+
+    def view(self, repository: str) -> Mapping[str, Any]:
+        """Read-only id -> object copy of a repository, taken in one atomic dict.copy()."""
+        return MappingProxyType(getattr(self, repository).copy())
+
+    def _find(self, repository: str, **criteria: Any) -> List[Any]:
+        """Objects matching every non-None criterion, by intersecting index entries smallest first."""
+        criteria = {attribute: value for attribute, value in criteria.items() if value is not None}
+        items = getattr(self, repository)
+        if not criteria:
+            return list(items.values())
+        indexes = self._indexes[repository]
+        matches = sorted((indexes[attribute].get(value, {}).copy() for attribute, value in criteria.items()),
+                         key=len)
+        found = []
+        for obj_id in matches[0]:
+            if all(obj_id in other for other in matches[1:]):
+                obj = items.get(obj_id)
+                if obj is not None:
+                    found.append(obj)
+        return found
+
+    def _page(self, repository: str, after: int = 0, limit: Optional[int] = None,
+              **criteria: Any) -> Tuple[List[Any], Optional[int]]:
+        """
+        Up to `limit` objects matching the criteria with a sequence number
+        above `after`, in sequence order, and the cursor to pass as `after`
+        for the next page (None once the repository is exhausted).
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        items = getattr(self, repository)
+        live = self._sequences[repository]
+        if any(value is not None for value in criteria.values()):
+            matches = sorted((sequence, obj.id) for obj in self._find(repository, **criteria)
+                             for sequence in (live.get(obj.id),) if sequence is not None)
+            sequences = [sequence for sequence, _ in matches]
+            ids = [obj_id for _, obj_id in matches]
+        else:
+            sequences, ids = self._order[repository]
+        count = len(sequences)
+        page: List[Any] = []
+        last = None
+        for position in range(bisect_right(sequences, after, 0, count), count):
+            obj_id, sequence = ids[position], sequences[position]
+            obj = items.get(obj_id)
+            if obj is None or live.get(obj_id) != sequence:
+                continue  # deleted, or deleted and stored again under a later sequence
+            if limit is not None and len(page) == limit:
+                return page, last
+            page.append(obj)
+            last = sequence
+        return page, None
 
     def store_agent(self, agent: Any) -> None:
         """Store an agent in the repository"""
-        self.agent_repository[agent.id] = agent
+        self._store('agent_repository', agent)
+
+    def store_agents(self, agents: Sequence[Any]) -> None:
+        """Store many agents"""
+        for agent in agents:
+            self._store('agent_repository', agent)
 
     def get_agent(self, agent_id: str) -> Optional[Any]:
         """Retrieve an agent by ID"""
@@ -47,14 +1072,16 @@ class DataStorage:
 
     def delete_agent(self, agent_id: str) -> bool:
         """Delete an agent by ID"""
-        if agent_id in self.agent_repository:
-            del self.agent_repository[agent_id]
-            return True
-        return False
+        return self._delete('agent_repository', agent_id)
 
     def store_project(self, project: Any) -> None:
         """Store a project in the repository"""
-        self.project_repository[project.id] = project
+        self._store('project_repository', project)
+
+    def store_projects(self, projects: Sequence[Any]) -> None:
+        """Store many projects"""
+        for project in projects:
+            self._store('project_repository', project)
 
     def get_project(self, project_id: str) -> Optional[Any]:
         """Retrieve a project by ID"""
@@ -62,14 +1089,16 @@ class DataStorage:
 
     def delete_project(self, project_id: str) -> bool:
         """Delete a project by ID"""
-        if project_id in self.project_repository:
-            del self.project_repository[project_id]
-            return True
-        return False
+        return self._delete('project_repository', project_id)
 
     def store_task(self, task: Any) -> None:
         """Store a task in the repository"""
-        self.task_repository[task.id] = task
+        self._store('task_repository', task)
+
+    def store_tasks(self, tasks: Sequence[Any]) -> None:
+        """Store many tasks"""
+        for task in tasks:
+            self._store('task_repository', task)
 
     def get_task(self, task_id: str) -> Optional[Any]:
         """Retrieve a task by ID"""
@@ -77,14 +1106,16 @@ class DataStorage:
 
     def delete_task(self, task_id: str) -> bool:
         """Delete a task by ID"""
-        if task_id in self.task_repository:
-            del self.task_repository[task_id]
-            return True
-        return False
+        return self._delete('task_repository', task_id)
 
     def store_assignment(self, assignment: Any) -> None:
         """Store an assignment in the repository"""
-        self.assignment_repository[assignment.id] = assignment
+        self._store('assignment_repository', assignment)
+
+    def store_assignments(self, assignments: Sequence[Any]) -> None:
+        """Store many assignments"""
+        for assignment in assignments:
+            self._store('assignment_repository', assignment)
 
     def get_assignment(self, assignment_id: str) -> Optional[Any]:
         """Retrieve an assignment by ID"""
@@ -92,10 +1123,7 @@ class DataStorage:
 
     def delete_assignment(self, assignment_id: str) -> bool:
         """Delete an assignment by ID"""
-        if assignment_id in self.assignment_repository:
-            del self.assignment_repository[assignment_id]
-            return True
-        return False
+        return self._delete('assignment_repository', assignment_id)
 
     def list_agents(self) -> List[Any]:
         """List all agents"""
@@ -112,3 +1140,33 @@ class DataStorage:
     def list_assignments(self) -> List[Any]:
         """List all assignments"""
         return list(self.assignment_repository.values())
+
+    def find_tasks(self, status: Optional[str] = None, priority: Optional[str] = None,
+                   tag: Optional[str] = None) -> List[Any]:
+        """List tasks matching every given status, priority and tag"""
+        return self._find('task_repository', status=status, priority=priority, tags=tag)
+
+    def find_assignments(self, agent_id: Optional[str] = None, task_id: Optional[str] = None,
+                         status: Optional[str] = None) -> List[Any]:
+        """List assignments matching every given agent, task and status"""
+        return self._find('assignment_repository', agent_id=agent_id, task_id=task_id, status=status)
+
+    def page_agents(self, after: int = 0, limit: Optional[int] = None) -> Tuple[List[Any], Optional[int]]:
+        """Agents after a cursor, and the cursor of the next page (None when done)"""
+        return self._page('agent_repository', after, limit)
+
+    def page_projects(self, after: int = 0, limit: Optional[int] = None) -> Tuple[List[Any], Optional[int]]:
+        """Projects after a cursor, and the cursor of the next page (None when done)"""
+        return self._page('project_repository', after, limit)
+
+    def page_tasks(self, after: int = 0, limit: Optional[int] = None, status: Optional[str] = None,
+                   priority: Optional[str] = None, tag: Optional[str] = None) -> Tuple[List[Any], Optional[int]]:
+        """Tasks matching the filters after a cursor, and the cursor of the next page"""
+        return self._page('task_repository', after, limit, status=status, priority=priority, tags=tag)
+
+    def page_assignments(self, after: int = 0, limit: Optional[int] = None, agent_id: Optional[str] = None,
+                         task_id: Optional[str] = None,
+                         status: Optional[str] = None) -> Tuple[List[Any], Optional[int]]:
+        """Assignments matching the filters after a cursor, and the cursor of the next page"""
+        return self._page('assignment_repository', after, limit, agent_id=agent_id, task_id=task_id,
+                          status=status)
@@ -2,12 +2,46 @@
 OrchestrationEngine class for the Creation AI Ecosystem.
 Coordinates activities of smaller agents to complete complex tasks.
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Set
+from datetime import datetime
+import asyncio
+import inspect
+import uuid
+
+from agent_definition.skill import skill_closure
+from .task_decomposition import decompose, subtask_dict, topological_order
+
+FINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
 
 class OrchestrationEngine:
-    def __init__(self):
+    """
+    Execution plans are DAGs of steps. Running a plan starts every step
+    whose dependencies have completed, so independent steps run in parallel
+    and a plan takes about as long as its critical path. At most
+    `max_concurrency` steps run at once overall and `per_agent_concurrency`
+    per agent; a step taking longer than its `timeout` (or `step_timeout`)
+    fails. Each step's agent receives the results of the steps it depends
+    on, and when a step fails or times out the steps depending on it are
+    skipped while the rest of the plan carries on.
+
+    Agents act through act(input); coroutine functions are awaited and
+    plain functions run in a worker thread, which a timeout abandons but
+    cannot stop.
+
+    At most `max_plans` plans are kept: creating a plan beyond that evicts
+    the oldest finished ones, and a plan drops its agents once it finishes.
+    """
+    def __init__(self, max_concurrency: int = 8, per_agent_concurrency: int = 1,
+                 step_timeout: Optional[float] = None, max_plans: int = 1000):
         self.agents = []
         self.execution_plans = {}
+        self.max_concurrency = max_concurrency
+        self.per_agent_concurrency = per_agent_concurrency
+        self.step_timeout = step_timeout
+        self.max_plans = max_plans
+        self._plan_agents: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, Set[asyncio.Task]] = {}
 
     def add_agent(self, agent: Any) -> None:
         self.agents.append(agent)
@@ -16,24 +50,211 @@ class OrchestrationEngine:
         self.agents = [a for a in self.agents if getattr(a, 'id', None) != agent_id]
         return True
 
+    def resolve_agents(self, agents: Sequence[Any]) -> List[Any]:
+        """
+        Map agents (or stored agent records) to ones that can act: an agent
+        with act() is kept, any other is replaced by the engine's agent with
+        the same id, and those with neither are left out.
+        """
+        registered = {getattr(agent, 'id', None): agent for agent in self.agents}
+        resolved = []
+        for agent in agents:
+            if not callable(getattr(agent, 'act', None)):
+                agent = registered.get(getattr(agent, 'id', None))
+            if agent is not None and callable(getattr(agent, 'act', None)):
+                resolved.append(agent)
+        return resolved
+
     def decompose_task(self, query: str) -> List[Dict[str, Any]]:
         """Break down a complex query into subtasks."""
-        raise NotImplementedError
+        return decompose(query)
+
+    def select_agent(self, task: Dict[str, Any], agents: Optional[Sequence[Any]] = None,
+                     load: Optional[Dict[str, int]] = None) -> Optional[Any]:
+        """
+        Select an agent for a given task: the one with the most of its skills
+        (counting sub-skills), then the one with the fewest steps in `load`.
+        """
+        candidates = list(self.agents if agents is None else agents)
+        if not candidates:
+            return None
+        load = load or {}
+        required = task.get('skills') or ()
+
+        def rank(agent: Any):
+            skills = skill_closure(getattr(agent, 'skills', None) or ())
+            return (-sum(1 for skill in required if skill in skills), load.get(agent.id, 0))
+        return min(candidates, key=rank)
 
-    def select_agent(self, task: Dict[str, Any]) -> Optional[Any]:
-        """Select an agent for a given task."""
-        raise NotImplementedError
+    def create_execution_plan(self, query: str, agents: Optional[Sequence[Any]] = None,
+                              subtasks: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Create an execution plan for a query: decompose it (unless subtasks
+        are given) and pick an agent for every step from `agents`, or from
+        the engine's agents. Raises ValueError if the steps do not form a DAG.
+        """
+        if subtasks is None:
+            subtasks = self.decompose_task(query)
+        subtasks = [subtask_dict(s['id'], s.get('description', ''), s.get('dependencies') or (),
+                                 s.get('skills') or (), s.get('timeout')) for s in subtasks]
+        topological_order(subtasks)
+        candidates = list(self.agents if agents is None else agents)
+        load: Dict[str, int] = {}
+        plan_agents: Dict[str, Any] = {}
+        for subtask in subtasks:
+            agent = self.select_agent(subtask, candidates, load)
+            subtask['agent_id'] = agent.id if agent is not None else None
+            subtask.update(status='pending', result=None, error=None, started_at=None, finished_at=None)
+            if agent is not None:
+                load[agent.id] = load.get(agent.id, 0) + 1
+                plan_agents[agent.id] = agent
+        plan = {
+            'id': str(uuid.uuid4()),
+            'query': query,
+            'status': 'pending',
+            'steps': subtasks,
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None,
+        }
+        self._evict_plans()
+        self.execution_plans[plan['id']] = plan
+        self._plan_agents[plan['id']] = plan_agents
+        return plan
 
-    def create_execution_plan(self, query: str) -> Dict[str, Any]:
-        """Create an execution plan for a query."""
-        raise NotImplementedError
+    def _evict_plans(self) -> None:
+        """Drop the oldest finished plans until there is room for one more."""
+        excess = len(self.execution_plans) + 1 - self.max_plans
+        if excess <= 0:
+            return
+        finished = [plan_id for plan_id, plan in self.execution_plans.items() if plan['status'] in FINAL_STATUSES]
+        for plan_id in finished[:excess]:
+            del self.execution_plans[plan_id]
+            self._plan_agents.pop(plan_id, None)
 
     def execute_plan(self, execution_id: str) -> Dict[str, Any]:
-        """Execute a plan by its ID."""
-        raise NotImplementedError
+        """Execute a plan by its ID. Blocks until it finishes; use run_plan() from async code."""
+        return asyncio.run(self.run_plan(execution_id))
+
+    async def run_plan(self, execution_id: str) -> Dict[str, Any]:
+        """Run a plan's steps as a DAG and return the plan with each step's status and result."""
+        plan = self._get_plan(execution_id)
+        if plan['status'] != 'pending':
+            raise ValueError(f"Execution {execution_id} is already {plan['status']}")
+        agents = self._plan_agents.get(execution_id, {})
+        plan['status'] = 'running'
+        steps = {step['id']: step for step in plan['steps']}
+        waiting = {step_id: len(step['dependencies']) for step_id, step in steps.items()}
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in steps}
+        for step in steps.values():
+            for dependency in step['dependencies']:
+                dependents[dependency].append(step['id'])
+        limit = asyncio.Semaphore(self.max_concurrency)
+        agent_limits = {agent_id: asyncio.Semaphore(self.per_agent_concurrency) for agent_id in agents}
+        running: Dict[asyncio.Task, str] = {}
+        self._running[execution_id] = set()
+
+        def start(step_id: str) -> None:
+            task = asyncio.ensure_future(self._run_step(plan, steps[step_id], steps, agents, limit, agent_limits))
+            running[task] = step_id
+            self._running[execution_id].add(task)
+
+        def skip(step_id: str) -> None:
+            stack = list(dependents[step_id])
+            while stack:
+                dependent = steps[stack.pop()]
+                if dependent['status'] == 'pending':
+                    dependent['status'] = 'skipped'
+                    dependent['error'] = f"Dependency {step_id} did not complete"
+                    stack.extend(dependents[dependent['id']])
+
+        try:
+            for step_id, count in waiting.items():
+                if count == 0:
+                    start(step_id)
+            while running:
+                finished, _ = await asyncio.wait(set(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    step_id = running.pop(task)
+                    self._running[execution_id].discard(task)
+                    if steps[step_id]['status'] != 'completed':
+                        skip(step_id)
+                        continue
+                    for dependent in dependents[step_id]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0 and steps[dependent]['status'] == 'pending':
+                            start(dependent)
+        finally:
+            for task in running:
+                task.cancel()
+            self._running.pop(execution_id, None)
+            self._plan_agents.pop(execution_id, None)
+        statuses = {step['status'] for step in steps.values()}
+        if plan['status'] != 'cancelled':
+            plan['status'] = 'completed' if statuses <= {'completed'} else 'failed'
+        plan['finished_at'] = datetime.now().isoformat()
+        return plan
+
+    async def _run_step(self, plan: Dict[str, Any], step: Dict[str, Any], steps: Dict[str, Dict[str, Any]],
+                        agents: Dict[str, Any], limit: asyncio.Semaphore,
+                        agent_limits: Dict[str, asyncio.Semaphore]) -> None:
+        agent = agents.get(step['agent_id'])
+        if agent is None:
+            step.update(status='failed', error="No agent available")
+            return
+        act = getattr(agent, 'act', None)
+        if act is None:
+            step.update(status='failed', error=f"Agent {agent.id} cannot act")
+            return
+        step_input = {
+            'query': plan['query'],
+            'description': step['description'],
+            'inputs': {dependency: steps[dependency]['result'] for dependency in step['dependencies']},
+        }
+        timeout = step['timeout'] if step['timeout'] is not None else self.step_timeout
+        # Take the agent's slot first so steps queued behind a busy agent do not hold global slots.
+        async with agent_limits[agent.id], limit:
+            step.update(status='running', started_at=datetime.now().isoformat())
+            try:
+                if inspect.iscoroutinefunction(act):
+                    call = act(step_input)
+                else:
+                    call = asyncio.to_thread(act, step_input)
+                step['result'] = await asyncio.wait_for(call, timeout)
+                step['status'] = 'completed'
+            except asyncio.TimeoutError:
+                step.update(status='failed', error=f"Timed out after {timeout} seconds")
+            except asyncio.CancelledError:
+                step.update(status='cancelled', error="Execution cancelled")
+                raise
+            except Exception as e:
+                step.update(status='failed', error=f"{type(e).__name__}: {e}")
+            finally:
+                step['finished_at'] = datetime.now().isoformat()
+
+    def _get_plan(self, execution_id: str) -> Dict[str, Any]:
+        plan = self.execution_plans.get(execution_id)
+        if plan is None:
+            raise KeyError(f"Execution {execution_id} not found")
+        return plan
 
     def get_execution_status(self, execution_id: str) -> Dict[str, Any]:
-        raise NotImplementedError
+        plan = self._get_plan(execution_id)
+        counts: Dict[str, int] = {}
+        for step in plan['steps']:
+            counts[step['status']] = counts.get(step['status'], 0) + 1
+        return {'id': plan['id'], 'status': plan['status'], 'steps': counts, 'finished_at': plan['finished_at']}
 
     def cancel_execution(self, execution_id: str) -> bool:
-        raise NotImplementedError
+        """Cancel a pending or running plan; running steps are cancelled and the rest skipped."""
+        plan = self.execution_plans.get(execution_id)
+        if plan is None or plan['status'] in FINAL_STATUSES:
+            return False
+        plan['status'] = 'cancelled'
+        for step in plan['steps']:
+            if step['status'] == 'pending':
+                step.update(status='skipped', error="Execution cancelled")
+        if execution_id not in self._running:
+            self._plan_agents.pop(execution_id, None)
+        for task in self._running.get(execution_id, ()):
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        return True
@@ -1 +1,65 @@
-# Logic for decomposing complex tasks into subtasks will be implemented here.
+"""
+Task decomposition for the Creation AI Ecosystem.
+Breaks a query into subtasks whose dependencies form a DAG.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+import re
+
+# Lines, semicolons and list bullets separate independent parts of a query;
+# "then" and "->" chain the steps of a part one after another.
+PART_SEPARATOR = re.compile(r'[\n;]+|^\s*(?:\d+[.)]|[-*•])\s+', re.MULTILINE)
+STEP_SEPARATOR = re.compile(r',?\s*\b(?:and\s+)?then\b\s*|\s*->\s*', re.IGNORECASE)
+
+
+def decompose(query: str) -> List[Dict[str, Any]]:
+    """
+    Subtasks of a query, in order. Independent parts have no dependencies
+    on each other, so they can run in parallel; within a part each step
+    depends on the one before it.
+    """
+    subtasks: List[Dict[str, Any]] = []
+    for part in PART_SEPARATOR.split(query):
+        previous: Optional[str] = None
+        for description in STEP_SEPARATOR.split(part):
+            description = description.strip(' .,')
+            if not description:
+                continue
+            subtask = subtask_dict(f"step-{len(subtasks) + 1}", description,
+                                   [previous] if previous else [])
+            subtasks.append(subtask)
+            previous = subtask['id']
+    return subtasks
+
+
+def subtask_dict(subtask_id: str, description: str, dependencies: Sequence[str] = (),
+                 skills: Sequence[str] = (), timeout: Optional[float] = None) -> Dict[str, Any]:
+    return {
+        'id': subtask_id,
+        'description': description,
+        'dependencies': list(dependencies),
+        'skills': list(skills),
+        'timeout': timeout,
+    }
+
+
+def topological_order(subtasks: Sequence[Dict[str, Any]]) -> List[str]:
+    """Subtask ids, each after its dependencies. Raises ValueError on unknown ids or a cycle."""
+    ids = [subtask['id'] for subtask in subtasks]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Subtask ids must be unique")
+    waiting = {subtask['id']: len(subtask.get('dependencies') or ()) for subtask in subtasks}
+    dependents: Dict[str, List[str]] = {subtask_id: [] for subtask_id in ids}
+    for subtask in subtasks:
+        for dependency in subtask.get('dependencies') or ():
+            if dependency not in dependents:
+                raise ValueError(f"Subtask {subtask['id']} depends on unknown subtask {dependency}")
+            dependents[dependency].append(subtask['id'])
+    order = [subtask_id for subtask_id in ids if waiting[subtask_id] == 0]
+    for subtask_id in order:
+        for dependent in dependents[subtask_id]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                order.append(dependent)
+    if len(order) != len(ids):
+        raise ValueError("Subtask dependencies contain a cycle")
+    return order
@@ -4,49 +4,56 @@ Manages assignments of agents to tasks.
 """
 from typing import Dict, Any, Optional
 import uuid
-from datetime import datetime
+
+from common.compact import SymbolField, TimestampField, now, to_iso
 
 class Assignment:
+    __slots__ = ('id', 'task_id', 'agent_id', '_status', '_created_at', '_updated_at', '_started_at',
+                 '_completed_at', 'metadata', 'notes')
+
+    status = SymbolField()
+    created_at = TimestampField()
+    updated_at = TimestampField()
+    started_at = TimestampField()
+    completed_at = TimestampField()
+
     def __init__(self, task_id: str, agent_id: str):
         self.id = str(uuid.uuid4())
         self.task_id = task_id
         self.agent_id = agent_id
-        self.status = "Assigned"
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
-        self.started_at: Optional[datetime] = None
-        self.completed_at: Optional[datetime] = None
+        self._status = "Assigned"
+        self._created_at = self._updated_at = now()
+        self._started_at: Optional[int] = None
+        self._completed_at: Optional[int] = None
         self.metadata: Dict[str, Any] = {}
         self.notes = ""
 
     def start(self) -> None:
-        self.status = "In Progress"
-        self.started_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._status = "In Progress"
+        self._started_at = self._updated_at = now()
 
     def complete(self) -> None:
-        self.status = "Completed"
-        self.completed_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._status = "Completed"
+        self._completed_at = self._updated_at = now()
 
     def pause(self) -> None:
-        self.status = "Paused"
-        self.updated_at = datetime.now()
+        self._status = "Paused"
+        self._updated_at = now()
 
     def cancel(self) -> None:
-        self.status = "Cancelled"
-        self.updated_at = datetime.now()
+        self._status = "Cancelled"
+        self._updated_at = now()
 
     def add_note(self, note: str) -> None:
         if self.notes:
             self.notes += f"\n{note}"
         else:
             self.notes = note
-        self.updated_at = datetime.now()
+        self._updated_at = now()
 
     def add_metadata(self, key: str, value: Any) -> None:
         self.metadata[key] = value
-        self.updated_at = datetime.now()
+        self._updated_at = now()
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -54,10 +61,10 @@ class Assignment:
             "task_id": self.task_id,
             "agent_id": self.agent_id,
             "status": self.status,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": to_iso(self._created_at),
+            "updated_at": to_iso(self._updated_at),
+            "started_at": to_iso(self._started_at),
+            "completed_at": to_iso(self._completed_at),
             "notes": self.notes,
             "metadata": self.metadata
         }
@@ -66,10 +73,12 @@ class Assignment:
     def from_dict(cls, data: Dict[str, Any]) -> 'Assignment':
         obj = cls(data['task_id'], data['agent_id'])
         obj.status = data.get('status', 'Assigned')
-        obj.created_at = datetime.fromisoformat(data['created_at']) if data.get('created_at') else datetime.now()
-        obj.updated_at = datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else datetime.now()
-        obj.started_at = datetime.fromisoformat(data['started_at']) if data.get('started_at') else None
-        obj.completed_at = datetime.fromisoformat(data['completed_at']) if data.get('completed_at') else None
+        if data.get('created_at'):
+            obj.created_at = data['created_at']
+        if data.get('updated_at'):
+            obj.updated_at = data['updated_at']
+        obj.started_at = data.get('started_at') or None
+        obj.completed_at = data.get('completed_at') or None
         obj.notes = data.get('notes', '')
         obj.metadata = data.get('metadata', {})
         return obj
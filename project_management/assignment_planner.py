@@ -0,0 +1,191 @@
+"""
+AssignmentPlanner class for the Creation AI Ecosystem.
+Matches a batch of tasks to agents at minimum total cost (skill fit, current
+load and priority) and creates the resulting assignments in bulk.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agent_definition.skill_index import SkillIndex
+from .assignment import Assignment
+from .scheduler import DEFAULT_RANK, PRIORITY_RANKS
+
+try:
+    from scipy.optimize import linear_sum_assignment as _scipy_linear_sum_assignment
+except ImportError:  # scipy is optional; the NumPy solver below is used without it
+    _scipy_linear_sum_assignment = None
+
+SKILLS_KEY = 'skills'  # Task.metadata key (or API task field) listing the skills a task needs
+ACTIVE_STATUSES = ('Assigned', 'In Progress', 'Paused')
+FORBIDDEN = 1e9  # cost of pairs excluded by max_missing_skills
+
+
+def required_skills(task: Any) -> Sequence[str]:
+    """Skills a task needs: Task.metadata['skills'], or the `skills` field of an API task."""
+    metadata = getattr(task, 'metadata', None) or {}
+    if SKILLS_KEY in metadata:
+        return metadata[SKILLS_KEY] or ()
+    return getattr(task, SKILLS_KEY, None) or ()
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per element of a uint64 array, summed over the last axis."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    return table[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def linear_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum-cost matching of a rectangular cost matrix: returns row and
+    column indices, one pair per row or column of the smaller side. Uses
+    scipy when it is installed.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if not np.isfinite(cost).all():
+        raise ValueError("cost matrix must be finite")
+    if _scipy_linear_sum_assignment is not None:
+        rows, cols = _scipy_linear_sum_assignment(cost)
+        return rows.astype(np.int64), cols.astype(np.int64)
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = _shortest_augmenting_path(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+    return _shortest_augmenting_path(cost)
+
+
+def _shortest_augmenting_path(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hungarian method in its shortest augmenting path form (Jonker-Volgenant)
+    for n <= m: each row is matched by a Dijkstra search over reduced costs,
+    with every step vectorized over the columns.
+    """
+    n, m = cost.shape
+    u = np.zeros(n)
+    v = np.zeros(m)
+    col4row = np.full(n, -1, dtype=np.int64)
+    row4col = np.full(m, -1, dtype=np.int64)
+    for current in range(n):
+        shortest = np.full(m, np.inf)
+        path = np.full(m, -1, dtype=np.int64)
+        scanned = np.zeros(m, dtype=bool)
+        visited_rows = [current]
+        row, minval, sink = current, 0.0, -1
+        while sink < 0:
+            reduced = minval + cost[row] - u[row] - v
+            better = ~scanned & (reduced < shortest)
+            path[better] = row
+            shortest[better] = reduced[better]
+            pending = np.where(scanned, np.inf, shortest)
+            minval = pending.min()
+            candidates = np.flatnonzero(pending == minval)
+            # Among equally short columns prefer a free one: it ends the search.
+            free = candidates[row4col[candidates] < 0]
+            column = free[0] if len(free) else candidates[0]
+            scanned[column] = True
+            if row4col[column] < 0:
+                sink = column
+            else:
+                row = row4col[column]
+                visited_rows.append(row)
+        u[current] += minval
+        others = np.array(visited_rows[1:], dtype=np.int64)
+        u[others] += minval - shortest[col4row[others]]
+        v[scanned] -= minval - shortest[scanned]
+        column = sink
+        while True:
+            row = path[column]
+            row4col[column] = row
+            col4row[row], column = column, col4row[row]
+            if row == current:
+                break
+    return np.arange(n, dtype=np.int64), col4row
+
+
+class AssignmentPlanner:
+    """
+    Cost of giving a task to an agent, lower is better:
+
+        skill_weight * skills the agent lacks (required_skills(task))
+        + load_weight * the agent's active assignments
+        - priority_weight * how much the task's priority exceeds Low
+
+    The priority term only matters when there are more tasks than agent
+    slots, where it decides which tasks wait. Each agent takes up to
+    `slots` tasks per plan; every extra slot costs one more unit of load,
+    so work spreads across agents before it stacks up.
+    """
+    def __init__(self, storage: Any, skill_weight: float = 10.0, load_weight: float = 1.0,
+                 priority_weight: float = 2.0, max_missing_skills: Optional[int] = None):
+        self.storage = storage
+        self.skill_weight = skill_weight
+        self.load_weight = load_weight
+        self.priority_weight = priority_weight
+        self.max_missing_skills = max_missing_skills
+
+    def loads(self, agents: Sequence[Any]) -> np.ndarray:
+        """Active assignments per agent."""
+        return np.array([sum(1 for a in self.storage.find_assignments(agent_id=agent.id)
+                             if a.status in ACTIVE_STATUSES) for agent in agents], dtype=np.float64)
+
+    def missing_skills(self, tasks: Sequence[Any], agents: Sequence[Any]) -> np.ndarray:
+        """[task, agent] count of the skills a task needs that the agent lacks."""
+        index = SkillIndex()
+        needed = [index.encode(required_skills(task)) for task in tasks]
+        have = [index.encode(agent.skills or ()) for agent in agents]
+        words = index.agents.bits.shape[1]
+        needed = np.array([np.pad(bits, (0, words - len(bits))) for bits in needed], dtype=np.uint64).reshape(-1, words)
+        have = np.array([np.pad(bits, (0, words - len(bits))) for bits in have], dtype=np.uint64).reshape(-1, words)
+        return popcount(needed[:, np.newaxis, :] & ~have[np.newaxis, :, :])
+
+    def cost_matrix(self, tasks: Sequence[Any], agents: Sequence[Any], slots: int = 1) -> np.ndarray:
+        """[task, agent slot] costs; columns are the agents' first slots, then their second slots, ..."""
+        missing = self.missing_skills(tasks, agents)
+        cost = self.skill_weight * missing.astype(np.float64)
+        lowest = PRIORITY_RANKS['Low']
+        urgency = np.array([lowest - PRIORITY_RANKS.get(task.priority, DEFAULT_RANK) for task in tasks],
+                           dtype=np.float64)
+        cost -= self.priority_weight * urgency[:, np.newaxis]
+        loads = self.loads(agents)
+        columns = [cost + self.load_weight * (loads + slot)[np.newaxis, :] for slot in range(slots)]
+        cost = np.concatenate(columns, axis=1)
+        if self.max_missing_skills is not None:
+            cost[np.tile(missing > self.max_missing_skills, (1, slots))] = FORBIDDEN
+        return cost
+
+    def plan(self, tasks: Sequence[Any], agents: Sequence[Any], slots: int = 1) -> List[Assignment]:
+        """Unsaved assignments of a minimum-cost matching, at most `slots` per agent."""
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        tasks, agents = list(tasks), list(agents)
+        if not tasks or not agents:
+            return []
+        cost = self.cost_matrix(tasks, agents, slots)
+        rows, cols = linear_assignment(cost)
+        assignments = []
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            if cost[row, col] >= FORBIDDEN:
+                continue
+            assignment = Assignment(tasks[row].id, agents[col % len(agents)].id)
+            assignment.metadata['cost'] = float(cost[row, col])
+            assignments.append(assignment)
+        return assignments
+
+    def assign(self, tasks: Sequence[Any], agents: Sequence[Any], slots: int = 1) -> List[Assignment]:
+        """plan() and store the assignments in one batch. Task and agent statuses are left as they are."""
+        assignments = self.plan(tasks, agents, slots)
+        self.storage.apply_batch([('store', 'assignment_repository', a) for a in assignments])
+        return assignments
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            'solver': 'scipy' if _scipy_linear_sum_assignment is not None else 'numpy',
+            'skill_weight': self.skill_weight,
+            'load_weight': self.load_weight,
+            'priority_weight': self.priority_weight,
+            'max_missing_skills': self.max_missing_skills,
+        }
@@ -4,79 +4,112 @@ Defines the core project structure and management functionality.
 """
 from typing import Dict, Any, List, Optional
 import uuid
-from datetime import datetime
 
-class BaseProject:
+from common.compact import SymbolField, TimestampField, now, symbol, to_iso
+from .serialization import SerializationCache, encode, encode_item
+
+class BaseProject(SerializationCache):
+    __slots__ = ('id', 'name', 'description', 'goal', '_status', 'tasks', 'agents', 'dependencies',
+                 'metadata', '_created_at', '_updated_at')
+
+    status = SymbolField()
+    created_at = TimestampField()
+    updated_at = TimestampField()
+
+    _children_attribute = 'tasks'
+
     def __init__(self, name: str, description: str, goal: str):
+        self._cache = self._json = self._parents = None
         self.id = str(uuid.uuid4())
         self.name = name
         self.description = description
         self.goal = goal
-        self.status = "Not Started"
+        self._status = "Not Started"
         self.tasks: List[Any] = []
         self.agents: List[Any] = []
         self.dependencies: Dict[str, str] = {}  # task_id -> agent_id
         self.metadata: Dict[str, Any] = {}
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._created_at = self._updated_at = now()
 
     def add_task(self, task: Any) -> None:
         self.tasks.append(task)
-        self.updated_at = datetime.now()
+        self._attach_children([task])
+        self._updated_at = now()
 
     def remove_task(self, task_id: str) -> bool:
         for t in self.tasks:
             if getattr(t, 'id', None) == task_id:
                 self.tasks.remove(t)
-                self.updated_at = datetime.now()
+                self._detach_children([t])
+                self._updated_at = now()
                 return True
         return False
 
     def add_agent(self, agent: Any) -> None:
         self.agents.append(agent)
-        self.updated_at = datetime.now()
+        self._updated_at = now()
 
     def remove_agent(self, agent_id: str) -> bool:
         for a in self.agents:
             if getattr(a, 'id', None) == agent_id:
                 self.agents.remove(a)
-                self.updated_at = datetime.now()
+                self._updated_at = now()
                 return True
         return False
 
     def assign_agent(self, task_id: str, agent_id: str) -> bool:
         self.dependencies[task_id] = agent_id
-        self.updated_at = datetime.now()
+        self._updated_at = now()
         return True
 
     def unassign_agent(self, task_id: str) -> bool:
         if task_id in self.dependencies:
             del self.dependencies[task_id]
-            self.updated_at = datetime.now()
+            self._updated_at = now()
             return True
         return False
 
     def update_status(self, status: str) -> None:
-        self.status = status
-        self.updated_at = datetime.now()
+        self._status = symbol(status)
+        self._updated_at = now()
 
     def add_metadata(self, key: str, value: Any) -> None:
         self.metadata[key] = value
-        self.updated_at = datetime.now()
+        self._updated_at = now()
 
     def to_dict(self) -> Dict[str, Any]:
+        """
+        Dict form of the project. Everything but the agents is cached until
+        the project or one of its tasks changes; agents are not tracked and
+        are read on every call.
+        """
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = self._fields(tasks=[t.to_dict() for t in self.tasks], agents=None)
+        data = dict(cache)
+        data['agents'] = [a.get_info() for a in self.agents]
+        return data
+
+    def to_json(self) -> bytes:
+        """JSON bytes of to_dict(); the cached part is built from the tasks' cached bytes."""
+        head = self._json
+        if head is None:
+            head = self._json = (encode(self._fields())[:-1] + b',"tasks":['
+                                 + b','.join(encode_item(t) for t in self.tasks) + b']')
+        return head + b',"agents":' + encode([a.get_info() for a in self.agents]) + b'}'
+
+    def _fields(self, **extra: Any) -> Dict[str, Any]:
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'goal': self.goal,
-            'status': self.status,
-            'tasks': [t.to_dict() for t in self.tasks],
-            'agents': [a.get_info() for a in self.agents],
+            'status': self._status,
+            **extra,
             'dependencies': self.dependencies,
             'metadata': self.metadata,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'created_at': to_iso(self._created_at),
+            'updated_at': to_iso(self._updated_at),
         }
 
     @classmethod
@@ -87,8 +120,10 @@ class BaseProject:
         obj.agents = agents or []
         obj.dependencies = data.get('dependencies', {})
         obj.metadata = data.get('metadata', {})
-        obj.created_at = datetime.fromisoformat(data['created_at']) if data.get('created_at') else datetime.now()
-        obj.updated_at = datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else datetime.now()
+        if data.get('created_at'):
+            obj.created_at = data['created_at']
+        if data.get('updated_at'):
+            obj.updated_at = data['updated_at']
         return obj
 
     def __str__(self) -> str:
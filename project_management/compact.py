@@ -0,0 +1,18 @@
+"""
+Project management field helpers for the Creation AI Ecosystem.
+The generic timestamp and interning helpers live in common.compact.
+"""
+from typing import Any, Optional
+
+from common.compact import to_timestamp
+
+
+def due_timestamp(task: Any) -> Optional[int]:
+    """
+    Timestamp of a task's due_date, or None without one. API models keep
+    due_date as free text, so values that are not ISO dates count as none.
+    """
+    try:
+        return to_timestamp(getattr(task, 'due_date', None))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,448 @@
+"""
+DependencyGraph class for the Creation AI Ecosystem.
+Incrementally maintained DAG of Task.dependencies across a DataStorage, with
+cycle rejection, topological order, ready sets and critical-path scheduling.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import math
+import threading
+import time
+
+from .compact import due_timestamp
+
+DONE_STATUSES = frozenset(('Done', 'Completed', 'Closed'))
+DURATION_KEY = 'duration'  # Task.metadata key holding the expected duration in seconds
+
+
+class DependencyGraph:
+    """
+    Edges run from a dependency to the task that depends on it. The graph
+    follows the storage's change log: every public method first applies the
+    task stores and deletes made since the last call, so edits cost time
+    proportional to the part of the graph they affect rather than a rebuild.
+
+    - Topological positions are maintained with the Pearce-Kelly algorithm:
+      adding an edge only reorders the nodes between its endpoints, and the
+      search that does so is also the cycle check.
+    - Each task counts its unfinished dependencies; a stored task that is
+      not done and has none left is ready.
+    - Earliest start/finish are propagated forward from the graph's `start`
+      using each task's metadata['duration'] (default_duration seconds
+      otherwise); latest finish is propagated backward from due dates. Both
+      only revisit nodes whose value changes.
+
+    Dependencies on ids that are not stored are kept as placeholder nodes
+    that never finish. Tasks stored with an edge that would close a cycle
+    keep the edge in their dependency list, but the graph ignores it (see
+    get_info()['rejected']) until the task is stored again.
+    """
+    def __init__(self, storage: Any, done_statuses: Iterable[str] = DONE_STATUSES,
+                 default_duration: float = 3600.0, start: Optional[float] = None):
+        self.storage = storage
+        self.done_statuses = frozenset(done_statuses)
+        self.default_duration = default_duration
+        self.start = time.time() if start is None else start
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[str, bool], None]] = []
+        self.generation = 0  # incremented by every rebuild
+        self.rebuild()
+
+    def add_listener(self, callback: Callable[[str, bool], None]) -> None:
+        """Call `callback(task_id, ready)` whenever a task enters or leaves the ready set, except during rebuilds."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _reset(self) -> None:
+        self._preds: Dict[str, Set[str]] = {}
+        self._succs: Dict[str, Set[str]] = {}
+        self._ord: Dict[str, int] = {}
+        self._next_ord = 0
+        self._present: Set[str] = set()
+        self._done: Set[str] = set()
+        self._duration: Dict[str, float] = {}
+        self._due: Dict[str, float] = {}
+        self._unfinished: Dict[str, int] = {}
+        self._ready: Set[str] = set()
+        self._earliest: Dict[str, float] = {}
+        self._driver: Dict[str, Optional[str]] = {}
+        self._latest: Dict[str, float] = {}
+        self._finish_heap: List[Tuple[float, str]] = []
+        self._rejected: Dict[str, Set[str]] = {}
+
+    def rebuild(self) -> None:
+        """Rebuild the graph from every stored task."""
+        with self._lock:
+            self._reset()
+            self.generation += 1
+            self._position = self.storage.change_log.last_sequence
+            self._epoch = self.storage.change_log.epoch
+            listeners, self._listeners = self._listeners, []
+            try:
+                for task in self.storage.list_tasks():
+                    self._apply_task(task)
+            finally:
+                self._listeners = listeners
+
+    def sync(self) -> None:
+        """Apply task changes made in storage since the last sync."""
+        with self._lock:
+            change_log = self.storage.change_log
+            try:
+                if change_log.epoch != self._epoch:
+                    raise KeyError(change_log.epoch)
+                changes = change_log.since(self._position)
+            except KeyError:
+                self.rebuild()
+                return
+            for change in changes:
+                self._position = change.sequence
+                if change.repository != 'task_repository':
+                    continue
+                if change.op == 'store':
+                    self._apply_task(change.obj)
+                else:
+                    self._remove_task(change.id)
+
+    # --- node and edge maintenance ---
+
+    def _node(self, task_id: str) -> None:
+        if task_id not in self._ord:
+            self._ord[task_id] = self._next_ord
+            self._next_ord += 1
+            self._preds[task_id] = set()
+            self._succs[task_id] = set()
+            self._duration[task_id] = 0.0
+            self._unfinished[task_id] = 0
+            self._earliest[task_id] = self.start
+            self._driver[task_id] = None
+            self._latest[task_id] = math.inf
+
+    def _drop_if_unused(self, task_id: str) -> None:
+        if task_id not in self._present and not self._preds[task_id] and not self._succs[task_id]:
+            for index in (self._ord, self._preds, self._succs, self._duration, self._unfinished,
+                          self._earliest, self._driver, self._latest, self._due):
+                index.pop(task_id, None)
+
+    def _apply_task(self, task: Any) -> None:
+        task_id = task.id
+        self._node(task_id)
+        self._present.add(task_id)
+        metadata = getattr(task, 'metadata', None) or {}
+        duration = float(metadata.get(DURATION_KEY, self.default_duration))
+        due_date = due_timestamp(task)  # datetime, or a string on API models
+        due = due_date / 1e6 if due_date is not None else math.inf
+        forward, backward = [], []
+        if duration != self._duration[task_id]:
+            self._duration[task_id] = duration
+            forward.append(task_id)
+            backward.extend(self._preds[task_id])
+        if due != self._due.get(task_id, math.inf):
+            if due == math.inf:
+                self._due.pop(task_id, None)
+            else:
+                self._due[task_id] = due
+            backward.append(task_id)
+        self._set_done(task_id, getattr(task, 'status', None) in self.done_statuses)
+
+        wanted = set(getattr(task, 'dependencies', None) or ())
+        rejected = self._rejected.pop(task_id, set())
+        for dependency in self._preds[task_id] - wanted:
+            self._remove_edge(dependency, task_id)
+            forward.append(task_id)
+            backward.append(dependency)
+        for dependency in wanted - self._preds[task_id]:
+            try:
+                self._add_edge(dependency, task_id)
+            except ValueError:
+                rejected.add(dependency)
+                continue
+            forward.append(task_id)
+            backward.append(dependency)
+        rejected &= wanted
+        if rejected:
+            self._rejected[task_id] = rejected
+        self._update_ready(task_id)
+        self._propagate_earliest(forward)
+        self._propagate_latest(backward)
+
+    def _remove_task(self, task_id: str) -> None:
+        if task_id not in self._present:
+            return
+        self._present.discard(task_id)
+        self._rejected.pop(task_id, None)
+        self._update_ready(task_id)
+        self._set_done(task_id, False)
+        dependencies = list(self._preds[task_id])
+        for dependency in dependencies:
+            self._remove_edge(dependency, task_id)
+        self._due.pop(task_id, None)
+        self._propagate_latest(dependencies)
+        for dependency in dependencies:
+            self._drop_if_unused(dependency)
+        self._drop_if_unused(task_id)
+
+    def _set_done(self, task_id: str, done: bool) -> None:
+        if done == (task_id in self._done):
+            return
+        if done:
+            self._done.add(task_id)
+        else:
+            self._done.discard(task_id)
+        for dependent in self._succs[task_id]:
+            self._unfinished[dependent] += -1 if done else 1
+            self._update_ready(dependent)
+        self._update_ready(task_id)
+
+    def _update_ready(self, task_id: str) -> None:
+        ready = task_id in self._present and task_id not in self._done and self._unfinished[task_id] == 0
+        if ready == (task_id in self._ready):
+            return
+        if ready:
+            self._ready.add(task_id)
+        else:
+            self._ready.discard(task_id)
+        for callback in self._listeners:
+            callback(task_id, ready)
+
+    def _reaches(self, source: str, target: str) -> Optional[List[str]]:
+        """
+        Nodes reachable from `source` whose position is at most target's, or
+        None if `target` is among them. Only this window can hold a path.
+        """
+        bound = self._ord[target]
+        seen = {source}
+        stack = [source]
+        while stack:
+            node = stack.pop()
+            if node == target:
+                return None
+            for successor in self._succs[node]:
+                if successor not in seen and self._ord[successor] <= bound:
+                    seen.add(successor)
+                    stack.append(successor)
+        return list(seen)
+
+    def _add_edge(self, dependency: str, task_id: str) -> None:
+        """Add dependency -> task_id, reordering the affected window. Raises ValueError on a cycle."""
+        if dependency == task_id:
+            raise ValueError(f"Task {task_id} cannot depend on itself")
+        self._node(dependency)
+        if dependency in self._preds[task_id]:
+            return
+        lower, upper = self._ord[task_id], self._ord[dependency]
+        if lower < upper:
+            forward = self._reaches(task_id, dependency)
+            if forward is None:
+                raise ValueError(f"Dependency {dependency} -> {task_id} would create a cycle")
+            seen = {dependency}
+            stack = [dependency]
+            while stack:
+                node = stack.pop()
+                for predecessor in self._preds[node]:
+                    if predecessor not in seen and self._ord[predecessor] > lower:
+                        seen.add(predecessor)
+                        stack.append(predecessor)
+            backward = sorted(seen, key=self._ord.__getitem__)
+            forward.sort(key=self._ord.__getitem__)
+            positions = sorted(self._ord[node] for node in backward + forward)
+            for node, position in zip(backward + forward, positions):
+                self._ord[node] = position
+        self._preds[task_id].add(dependency)
+        self._succs[dependency].add(task_id)
+        if dependency not in self._done:
+            self._unfinished[task_id] += 1
+            self._update_ready(task_id)
+
+    def _remove_edge(self, dependency: str, task_id: str) -> None:
+        self._preds[task_id].discard(dependency)
+        self._succs[dependency].discard(task_id)
+        if dependency not in self._done:
+            self._unfinished[task_id] -= 1
+            self._update_ready(task_id)
+
+    def _propagate_earliest(self, seeds: Iterable[str]) -> None:
+        """Recompute earliest starts from the seeds forward, in topological order, while they change."""
+        heap = [(self._ord[node], node) for node in set(seeds) if node in self._ord]
+        heapq.heapify(heap)
+        forced = {node for _, node in heap}
+        done: Set[str] = set()
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            start, driver = self.start, None
+            for predecessor in self._preds[node]:
+                finish = self._earliest[predecessor] + self._duration[predecessor]
+                if finish > start:
+                    start, driver = finish, predecessor
+            self._driver[node] = driver
+            if start == self._earliest[node] and node not in forced:
+                continue
+            self._earliest[node] = start
+            heapq.heappush(self._finish_heap, (-(start + self._duration[node]), node))
+            for successor in self._succs[node]:
+                heapq.heappush(heap, (self._ord[successor], successor))
+        if len(self._finish_heap) > 4 * len(self._ord) + 1024:
+            # Drop the stale entries left behind by earlier updates.
+            self._finish_heap = [(-(self._earliest[node] + self._duration[node]), node) for node in self._ord]
+            heapq.heapify(self._finish_heap)
+
+    def _propagate_latest(self, seeds: Iterable[str]) -> None:
+        """Recompute latest finishes from the seeds backward, in reverse topological order, while they change."""
+        heap = [(-self._ord[node], node) for node in set(seeds) if node in self._ord]
+        heapq.heapify(heap)
+        done: Set[str] = set()
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            latest = self._due.get(node, math.inf)
+            for successor in self._succs[node]:
+                latest = min(latest, self._latest[successor] - self._duration[successor])
+            if latest == self._latest[node]:
+                continue
+            self._latest[node] = latest
+            for predecessor in self._preds[node]:
+                heapq.heappush(heap, (-self._ord[predecessor], predecessor))
+
+    # --- editing ---
+
+    def would_create_cycle(self, task_id: str, depends_on: str) -> bool:
+        """Whether making `task_id` depend on `depends_on` would close a cycle."""
+        with self._lock:
+            self.sync()
+            return self._closes_cycle(task_id, depends_on)
+
+    def _closes_cycle(self, task_id: str, depends_on: str) -> bool:
+        if task_id == depends_on:
+            return True
+        if task_id not in self._ord or depends_on not in self._ord:
+            return False
+        if self._ord[task_id] > self._ord[depends_on]:
+            return False
+        return self._reaches(task_id, depends_on) is None
+
+    def add_dependency(self, task_id: str, depends_on: str) -> None:
+        """
+        Make a stored task depend on another task and store it. Raises
+        KeyError for an unknown task and ValueError, leaving the task
+        unchanged, if the dependency would create a cycle. The dependency
+        list is replaced rather than edited in place, which works for Task
+        objects and the API's task models alike.
+        """
+        with self._lock:
+            self.sync()
+            task = self.storage.get_task(task_id)
+            if task is None:
+                raise KeyError(f"Task {task_id} not found")
+            if self._closes_cycle(task_id, depends_on):
+                raise ValueError(f"Dependency {depends_on} -> {task_id} would create a cycle")
+            dependencies = list(getattr(task, 'dependencies', None) or ())
+            if depends_on in dependencies:
+                return
+            task.dependencies = dependencies + [depends_on]
+            self.storage.store_task(task)
+            self.sync()
+
+    def remove_dependency(self, task_id: str, depends_on: str) -> bool:
+        """Drop a dependency from a stored task and store it."""
+        with self._lock:
+            task = self.storage.get_task(task_id)
+            dependencies = list(getattr(task, 'dependencies', None) or ())
+            if depends_on not in dependencies:
+                return False
+            dependencies.remove(depends_on)
+            task.dependencies = dependencies
+            self.storage.store_task(task)
+            self.sync()
+            return True
+
+    # --- queries ---
+
+    def dependencies(self, task_id: str) -> List[str]:
+        with self._lock:
+            self.sync()
+            return list(self._preds.get(task_id, ()))
+
+    def dependents(self, task_id: str) -> List[str]:
+        with self._lock:
+            self.sync()
+            return list(self._succs.get(task_id, ()))
+
+    def topological_order(self) -> List[str]:
+        """Stored tasks, every task after all of its dependencies."""
+        with self._lock:
+            self.sync()
+            return sorted(self._present, key=self._ord.__getitem__)
+
+    def ready(self) -> List[str]:
+        """Stored tasks that are not done and whose dependencies are all done, in topological order."""
+        with self._lock:
+            self.sync()
+            return sorted(self._ready, key=self._ord.__getitem__)
+
+    def is_ready(self, task_id: str) -> bool:
+        with self._lock:
+            self.sync()
+            return task_id in self._ready
+
+    def earliest_start(self, task_id: str) -> float:
+        """Earliest start in epoch seconds, if every dependency starts as early as it can."""
+        with self._lock:
+            self.sync()
+            return self._earliest[task_id]
+
+    def earliest_finish(self, task_id: str) -> float:
+        with self._lock:
+            self.sync()
+            return self._earliest[task_id] + self._duration[task_id]
+
+    def latest_finish(self, task_id: str) -> Optional[float]:
+        """Latest finish in epoch seconds that keeps every downstream due date, or None if unconstrained."""
+        with self._lock:
+            self.sync()
+            latest = self._latest[task_id]
+            return None if latest == math.inf else latest
+
+    def slack(self, task_id: str) -> Optional[float]:
+        """Seconds the task can slip without missing a due date (negative if already late), or None."""
+        with self._lock:
+            self.sync()
+            latest = self._latest[task_id]
+            if latest == math.inf:
+                return None
+            return latest - self._earliest[task_id] - self._duration[task_id]
+
+    def critical_path(self) -> List[str]:
+        """The chain of dependencies that finishes last, first task first."""
+        with self._lock:
+            self.sync()
+            heap = self._finish_heap
+            while heap:
+                finish, node = heap[0]
+                if node in self._ord and -finish == self._earliest[node] + self._duration[node]:
+                    break
+                heapq.heappop(heap)
+            else:
+                return []
+            path = []
+            node = heap[0][1]
+            while node is not None:
+                path.append(node)
+                node = self._driver[node]
+            path.reverse()
+            return path
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            self.sync()
+            return {
+                'tasks': len(self._present),
+                'nodes': len(self._ord),
+                'edges': sum(len(successors) for successors in self._succs.values()),
+                'ready': len(self._ready),
+                'rejected': {task_id: sorted(dependencies) for task_id, dependencies in self._rejected.items()},
+            }
@@ -0,0 +1,131 @@
+"""
+Domain object memory benchmark for the Creation AI Ecosystem.
+Measures the bytes per Task and Assignment of the slotted classes against the
+previous dict-backed layout with datetime timestamps, and prints the results as JSON.
+
+Usage:
+    python -m project_management.memory_benchmark --count 100000
+"""
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+import uuid
+
+from .assignment import Assignment
+from .task import Task
+
+STATUSES = ('Open', 'In Progress', 'Blocked', 'Done')
+PRIORITIES = ('Low', 'Normal', 'High')
+
+
+class DictTask:
+    """Task layout before __slots__: instance dict, datetime timestamps, one clock read per field."""
+    def __init__(self, task_name: str, description: str, status: str = "Open"):
+        self.id = str(uuid.uuid4())
+        self.task_name = task_name
+        self.description = description
+        self.status = status
+        self.priority = "Normal"
+        self.due_date: Optional[datetime] = None
+        self.subtasks: List[Any] = []
+        self.dependencies: List[str] = []
+        self.tags: List[str] = []
+        self.metadata: Dict[str, Any] = {}
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+
+
+class DictAssignment:
+    """Assignment layout before __slots__."""
+    def __init__(self, task_id: str, agent_id: str):
+        self.id = str(uuid.uuid4())
+        self.task_id = task_id
+        self.agent_id = agent_id
+        self.status = "Assigned"
+        self.created_at = datetime.now()
+        self.updated_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+        self.metadata: Dict[str, Any] = {}
+        self.notes = ""
+
+
+def task_record(i: int) -> str:
+    """A task as the API receives it, so status and priority strings are decoded per object."""
+    return json.dumps({'task_name': f"task {i}", 'description': 'benchmark task',
+                       'status': STATUSES[i % len(STATUSES)], 'priority': PRIORITIES[i % len(PRIORITIES)]})
+
+
+def assignment_record(i: int) -> str:
+    return json.dumps({'task_id': f"task-{i}", 'agent_id': f"agent-{i % 100}", 'status': 'In Progress'})
+
+
+def build_task(cls: type, line: str) -> Any:
+    data = json.loads(line)
+    task = cls(data['task_name'], data['description'], data['status'])
+    task.priority = data['priority']
+    return task
+
+
+def build_assignment(cls: type, line: str) -> Any:
+    data = json.loads(line)
+    assignment = cls(data['task_id'], data['agent_id'])
+    assignment.status = data['status']
+    return assignment
+
+
+def measure(build: Callable[[str], Any], lines: List[str]) -> float:
+    """Bytes allocated per live object, excluding the list holding them."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build(line) for line in lines]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_object = (current - sys.getsizeof(objects)) / len(objects)
+    del objects
+    return per_object
+
+
+def run_benchmark(count: int) -> Dict[str, Any]:
+    """Measure both layouts of Task and Assignment on `count` objects each."""
+    tasks = [task_record(i) for i in range(count)]
+    assignments = [assignment_record(i) for i in range(count)]
+    report: Dict[str, Any] = {
+        'count': count,
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'results': {},
+    }
+    for name, lines, build, baseline, compact in (
+            ('task', tasks, build_task, DictTask, Task),
+            ('assignment', assignments, build_assignment, DictAssignment, Assignment)):
+        before = measure(lambda line: build(baseline, line), lines)
+        after = measure(lambda line: build(compact, line), lines)
+        report['results'][name] = {
+            'dict_bytes_per_object': before,
+            'slots_bytes_per_object': after,
+            'saved_bytes_per_object': before - after,
+            'saved_fraction': 1.0 - after / before,
+        }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure per-object memory of the domain classes.")
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--output', help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+    text = json.dumps(run_benchmark(args.count), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""
+TaskScheduler class for the Creation AI Ecosystem.
+Keeps the tasks that can run next in an indexed binary heap ordered by
+priority, due date and age, so dispatchers take the top N without sorting.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+import heapq
+import math
+import threading
+
+from .compact import due_timestamp
+from .dependency_graph import DependencyGraph
+from .task import Task
+
+PRIORITY_RANKS = {'Critical': 0, 'Urgent': 0, 'High': 1, 'Medium': 2, 'Normal': 2, 'Low': 3}
+DEFAULT_RANK = PRIORITY_RANKS['Normal']
+READY_STATUS = 'Open'
+
+Key = Tuple[int, float, int, str]
+
+
+class IndexedHeap:
+    """
+    Binary min-heap of (key, item) that knows each item's position, so an
+    item's key can be changed or the item removed in O(log n).
+    """
+    def __init__(self):
+        self._heap: List[Tuple[Any, str]] = []
+        self._position: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._position
+
+    def push(self, item: str, key: Any) -> None:
+        """Insert `item`, or move it if it is already queued."""
+        index = self._position.get(item)
+        if index is not None:
+            old = self._heap[index][0]
+            self._heap[index] = (key, item)
+            if key < old:
+                self._sift_up(index)
+            elif old < key:
+                self._sift_down(index)
+            return
+        self._heap.append((key, item))
+        self._position[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def remove(self, item: str) -> bool:
+        index = self._position.pop(item, None)
+        if index is None:
+            return False
+        last = self._heap.pop()
+        if index < len(self._heap):
+            self._heap[index] = last
+            self._position[last[1]] = index
+            self._sift_up(index)
+            self._sift_down(self._position[last[1]])
+        return True
+
+    def pop(self) -> str:
+        item = self._heap[0][1]
+        self.remove(item)
+        return item
+
+    def smallest(self, n: int) -> List[str]:
+        """The n items with the smallest keys, in order, without removing them (O(n log n))."""
+        heap = self._heap
+        result: List[str] = []
+        frontier = [(heap[0][0], 0)] if heap else []
+        while frontier and len(result) < n:
+            _, index = heapq.heappop(frontier)
+            result.append(heap[index][1])
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], child))
+        return result
+
+    def _sift_up(self, index: int) -> None:
+        heap, position = self._heap, self._position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[index] = heap[parent]
+            position[heap[index][1]] = index
+            index = parent
+        heap[index] = entry
+        position[entry[1]] = index
+
+    def _sift_down(self, index: int) -> None:
+        heap, position = self._heap, self._position
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[index] = heap[child]
+            position[heap[index][1]] = index
+            index = child
+        heap[index] = entry
+        position[entry[1]] = index
+
+
+class TaskScheduler:
+    """
+    Ready queue of tasks that are Open and whose dependencies are all done.
+    Higher priority comes first, then the earlier due date (tasks without
+    one last), then the older task.
+
+    The queue follows the storage's change log like DependencyGraph, and the
+    graph reports tasks whose readiness changed because a dependency
+    finished, so each store costs O(log n): storing a task after
+    set_priority() or set_due_date() moves it in place. Call update() for a
+    task changed in memory but not yet stored.
+
+    take() removes tasks for dispatch; a taken task returns to the queue
+    only when it is stored again while still Open and ready.
+    """
+    def __init__(self, storage: Any, graph: Optional[DependencyGraph] = None):
+        self.storage = storage
+        self.graph = graph if graph is not None else DependencyGraph(storage)
+        self._lock = threading.RLock()
+        self._touched: Set[str] = set()
+        self._ready: Set[str] = set()
+        self.graph.add_listener(self._ready_changed)
+        self.rebuild()
+
+    @staticmethod
+    def key(task: Any) -> Key:
+        """Sort key of a task; smaller runs first."""
+        if isinstance(task, Task):
+            due, created = task._due_date, task._created_at
+        else:
+            # Tasks stored as API models carry due dates as strings and no creation time.
+            due, created = due_timestamp(task), 0
+        return (PRIORITY_RANKS.get(task.priority, DEFAULT_RANK), math.inf if due is None else due,
+                created, task.id)
+
+    def rebuild(self) -> None:
+        """Rebuild the queue from every stored task."""
+        with self._lock:
+            self.graph.sync()
+            self._generation = self.graph.generation
+            self._position = self.storage.change_log.last_sequence
+            self._epoch = self.storage.change_log.epoch
+            self._keys: Dict[str, Key] = {}
+            self._open: Set[str] = set()
+            self._ready = set(self.graph.ready())
+            self._taken: Set[str] = set()
+            self._heap = IndexedHeap()
+            self._touched.clear()
+            for task in self.storage.list_tasks():
+                self._record(task)
+            for task_id in self._ready:
+                self._place(task_id)
+
+    def sync(self) -> None:
+        """Apply task changes made in storage since the last sync."""
+        with self._lock:
+            self.graph.sync()
+            change_log = self.storage.change_log
+            try:
+                if self.graph.generation != self._generation or change_log.epoch != self._epoch:
+                    raise KeyError(change_log.epoch)
+                changes = change_log.since(self._position)
+            except KeyError:
+                self.rebuild()
+                return
+            for change in changes:
+                self._position = change.sequence
+                if change.repository != 'task_repository':
+                    continue
+                if change.op == 'store':
+                    self._record(change.obj)
+                    self._taken.discard(change.id)
+                else:
+                    self._keys.pop(change.id, None)
+                    self._open.discard(change.id)
+                    self._taken.discard(change.id)
+                self._touched.add(change.id)
+            touched, self._touched = self._touched, set()
+            for task_id in touched:
+                self._place(task_id)
+
+    def _ready_changed(self, task_id: str, ready: bool) -> None:
+        if ready:
+            self._ready.add(task_id)
+        else:
+            self._ready.discard(task_id)
+        self._touched.add(task_id)
+
+    def _record(self, task: Any) -> None:
+        self._keys[task.id] = self.key(task)
+        if task.status == READY_STATUS:
+            self._open.add(task.id)
+        else:
+            self._open.discard(task.id)
+
+    def _place(self, task_id: str) -> None:
+        if task_id in self._open and task_id not in self._taken and task_id in self._ready:
+            self._heap.push(task_id, self._keys[task_id])
+        else:
+            self._heap.remove(task_id)
+
+    def update(self, task: Any) -> None:
+        """Re-rank a task changed in memory (set_priority, set_due_date, update_status) in O(log n)."""
+        with self._lock:
+            self.sync()
+            if task.id not in self._keys:
+                return
+            self._record(task)
+            self._place(task.id)
+
+    def peek(self, n: int = 1) -> List[str]:
+        """Ids of the next n tasks to run, without removing them."""
+        with self._lock:
+            self.sync()
+            return self._heap.smallest(n)
+
+    def take(self, n: int = 1) -> List[Any]:
+        """Remove and return the next n tasks to run, best first."""
+        with self._lock:
+            self.sync()
+            tasks = []
+            while self._heap and len(tasks) < n:
+                task_id = self._heap.pop()
+                self._taken.add(task_id)
+                task = self.storage.get_task(task_id)
+                if task is not None:
+                    tasks.append(task)
+            return tasks
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.sync()
+            return len(self._heap)
+
+    def get_info(self) -> Dict[str, Any]:
+        with self._lock:
+            self.sync()
+            return {'queued': len(self._heap), 'taken': len(self._taken), 'open': len(self._open)}
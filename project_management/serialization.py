@@ -0,0 +1,110 @@
+"""
+SerializationCache class for the Creation AI Ecosystem.
+Mixin that caches to_dict()/to_json() results of slotted domain objects and
+invalidates them, and those of every object embedding them, on change.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import weakref
+
+CACHE_SLOTS = ('_cache', '_json', '_parents')
+
+
+def encode(value: Any) -> bytes:
+    """Compact JSON bytes; values JSON cannot represent (datetimes, sets) are written with str()."""
+    return json.dumps(value, separators=(',', ':'), default=str).encode()
+
+
+def encode_item(item: Any) -> bytes:
+    """
+    JSON bytes of an object, reusing its cached encoding when it has one.
+    Objects without to_dict() (the API's pydantic models) are encoded from dict().
+    """
+    to_json = getattr(item, 'to_json', None)
+    if to_json is not None:
+        return to_json()
+    to_dict = getattr(item, 'to_dict', None)
+    return encode(to_dict() if to_dict is not None else item.dict())
+
+
+def encode_items(items: Iterable[Any]) -> bytes:
+    return b'[' + b','.join(encode_item(item) for item in items) + b']'
+
+
+class SerializationCache:
+    """
+    Caches the result of to_dict() in `_cache` and of to_json() in `_json`.
+    Assigning any attribute clears both, and clears the caches of every
+    parent the object is attached to; the attribute named by
+    `_children_attribute` attaches the objects it lists, so a changed
+    subtask invalidates its task and that task's project, and serializing
+    again only re-encodes the changed path. Returned dicts are shared with
+    the cache and must not be modified. Lists and dicts changed in place
+    (task.tags.append(...)) are not seen: call invalidate() afterwards, or
+    use the mutator methods.
+    """
+    __slots__ = CACHE_SLOTS + ('__weakref__',)
+
+    _children_attribute: Optional[str] = None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in CACHE_SLOTS:
+            object.__setattr__(self, name, value)
+            return
+        if name == self._children_attribute:
+            self._detach_children(getattr(self, name, ()))
+            self._attach_children(value)
+        object.__setattr__(self, name, value)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop the cached encodings of this object and of everything embedding it."""
+        if getattr(self, '_cache', None) is None and getattr(self, '_json', None) is None:
+            # Parents are only cached while their children are, so they are clear too.
+            return
+        self._cache = self._json = None
+        for ref in self._parents or ():
+            parent = ref()
+            if parent is not None:
+                parent.invalidate()
+
+    def _attach(self, parent: Any) -> None:
+        parents = getattr(self, '_parents', None)
+        if parents is None:
+            parents = self._parents = []
+        else:
+            parents[:] = [ref for ref in parents if ref() is not None]
+        if not any(ref() is parent for ref in parents):
+            parents.append(weakref.ref(parent))
+
+    def _detach(self, parent: Any) -> None:
+        parents = getattr(self, '_parents', None)
+        if parents:
+            parents[:] = [ref for ref in parents if ref() is not None and ref() is not parent]
+
+    def _attach_children(self, children: Iterable[Any]) -> None:
+        for child in children:
+            if isinstance(child, SerializationCache):
+                child._attach(self)
+
+    def _detach_children(self, children: Iterable[Any]) -> None:
+        for child in children:
+            if isinstance(child, SerializationCache):
+                child._detach(self)
+
+    def _state_slots(self) -> List[str]:
+        return [name for cls in type(self).__mro__ for name in cls.__dict__.get('__slots__', ())
+                if name not in CACHE_SLOTS and name != '__weakref__']
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Weak references cannot be pickled; caches and parent links are rebuilt on load.
+        return {name: getattr(self, name) for name in self._state_slots() if hasattr(self, name)}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name in CACHE_SLOTS:
+            if not hasattr(self, name):
+                object.__setattr__(self, name, None)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        if self._children_attribute is not None:
+            self._attach_children(state.get(self._children_attribute, ()))
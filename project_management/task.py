@@ -6,94 +6,126 @@ from typing import Dict, Any, List, Optional
 import uuid
 from datetime import datetime
 
-class Task:
+from common.compact import SymbolField, TimestampField, now, symbol, to_iso, to_timestamp
+from .serialization import SerializationCache, encode, encode_item
+
+class Task(SerializationCache):
+    __slots__ = ('id', 'task_name', 'description', '_status', '_priority', '_due_date', 'subtasks',
+                 'dependencies', 'tags', 'metadata', '_created_at', '_updated_at')
+
+    status = SymbolField()
+    priority = SymbolField()
+    due_date = TimestampField()
+    created_at = TimestampField()
+    updated_at = TimestampField()
+
+    _children_attribute = 'subtasks'
+
     def __init__(self, task_name: str, description: str, status: str = "Open"):
+        self._cache = self._json = self._parents = None
         self.id = str(uuid.uuid4())
         self.task_name = task_name
         self.description = description
-        self.status = status
-        self.priority = "Normal"
-        self.due_date: Optional[datetime] = None
+        self._status = symbol(status)
+        self._priority = "Normal"
+        self._due_date: Optional[int] = None
         self.subtasks: List['Task'] = []
         self.dependencies: List[str] = []
         self.tags: List[str] = []
         self.metadata: Dict[str, Any] = {}
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._created_at = self._updated_at = now()
 
     def update_status(self, status: str) -> None:
-        self.status = status
-        self.updated_at = datetime.now()
+        self._status = symbol(status)
+        self._updated_at = now()
 
     def set_priority(self, priority: str) -> None:
-        self.priority = priority
-        self.updated_at = datetime.now()
+        self._priority = symbol(priority)
+        self._updated_at = now()
 
     def set_due_date(self, due_date: datetime) -> None:
-        self.due_date = due_date
-        self.updated_at = datetime.now()
+        self._due_date = to_timestamp(due_date)
+        self._updated_at = now()
 
     def add_subtask(self, subtask: 'Task') -> None:
         self.subtasks.append(subtask)
-        self.updated_at = datetime.now()
+        self._attach_children([subtask])
+        self._updated_at = now()
 
     def remove_subtask(self, subtask_id: str) -> bool:
         for s in self.subtasks:
             if s.id == subtask_id:
                 self.subtasks.remove(s)
-                self.updated_at = datetime.now()
+                self._detach_children([s])
+                self._updated_at = now()
                 return True
         return False
 
     def add_dependency(self, task_id: str) -> None:
         if task_id not in self.dependencies:
             self.dependencies.append(task_id)
-            self.updated_at = datetime.now()
+            self._updated_at = now()
 
     def remove_dependency(self, task_id: str) -> bool:
         if task_id in self.dependencies:
             self.dependencies.remove(task_id)
-            self.updated_at = datetime.now()
+            self._updated_at = now()
             return True
         return False
 
     def add_tag(self, tag: str) -> None:
         if tag not in self.tags:
             self.tags.append(tag)
-            self.updated_at = datetime.now()
+            self._updated_at = now()
 
     def remove_tag(self, tag: str) -> bool:
         if tag in self.tags:
             self.tags.remove(tag)
-            self.updated_at = datetime.now()
+            self._updated_at = now()
             return True
         return False
 
     def add_metadata(self, key: str, value: Any) -> None:
         self.metadata[key] = value
-        self.updated_at = datetime.now()
+        self._updated_at = now()
 
     def to_dict(self) -> Dict[str, Any]:
+        """Dict form of the task, cached until it or a subtask changes. Do not modify it."""
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = self._fields(subtasks=[s.to_dict() for s in self.subtasks])
+        return cache
+
+    def to_json(self) -> bytes:
+        """JSON bytes of to_dict(), cached like it and built from the subtasks' cached bytes."""
+        data = self._json
+        if data is None:
+            head = encode(self._fields())
+            data = self._json = (head[:-1] + b',"subtasks":['
+                                 + b','.join(encode_item(s) for s in self.subtasks) + b']}')
+        return data
+
+    def _fields(self, **extra: Any) -> Dict[str, Any]:
         return {
             'id': self.id,
             'task_name': self.task_name,
             'description': self.description,
-            'status': self.status,
-            'priority': self.priority,
-            'due_date': self.due_date.isoformat() if self.due_date else None,
-            'subtasks': [s.to_dict() for s in self.subtasks],
+            'status': self._status,
+            'priority': self._priority,
+            'due_date': to_iso(self._due_date),
+            **extra,
             'dependencies': self.dependencies,
             'tags': self.tags,
             'metadata': self.metadata,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'created_at': to_iso(self._created_at),
+            'updated_at': to_iso(self._updated_at),
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Task':
         obj = cls(data['task_name'], data['description'], data.get('status', 'Open'))
         obj.priority = data.get('priority', 'Normal')
-        obj.due_date = datetime.fromisoformat(data['due_date']) if data.get('due_date') else None
+        obj.due_date = data.get('due_date') or None
         obj.subtasks = [cls.from_dict(s) for s in data.get('subtasks', [])]
         obj.dependencies = data.get('dependencies', [])
         obj.tags = data.get('tags', [])
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+import api.main as api_main
+from api.main import app
+from data_storage.vector_db import DataStorage
+from project_management.assignment_planner import required_skills
+from project_management.task import Task
+
+client = TestClient(app)
+
+
+def plan(monkeypatch, task_skills):
+    monkeypatch.setattr(api_main, 'data_storage', DataStorage())
+    token = client.post("/token", data={"username": "admin", "password": "password"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for agent_id, skills in (("go-dev", ["go"]), ("py-dev", ["python"])):
+        assert client.post("/agents", json={"id": agent_id, "name": agent_id, "skills": skills}).status_code == 200
+    for task_id, skills in task_skills.items():
+        response = client.post("/tasks", json={"id": task_id, "task_name": task_id, "description": "",
+                                               "skills": skills})
+        assert response.status_code == 200
+    response = client.post("/assignments/plan", headers=headers, json={
+        "task_ids": list(task_skills), "agent_ids": ["go-dev", "py-dev"], "dry_run": True})
+    assert response.status_code == 200
+    return {a["task_id"]: a["agent_id"] for a in response.json()}
+
+
+def test_task_skills_decide_the_assignment(monkeypatch):
+    without = plan(monkeypatch, {"parser": [], "service": []})
+    assert without == {"parser": "go-dev", "service": "py-dev"}
+    assert plan(monkeypatch, {"parser": ["python"], "service": ["go"]}) == {"parser": "py-dev", "service": "go-dev"}
+
+
+def test_updating_a_stored_task_keeps_its_skills_in_metadata(monkeypatch):
+    storage = DataStorage()
+    monkeypatch.setattr(api_main, 'data_storage', storage)
+    task = Task("parser", "")
+    task.id = "parser"
+    storage.store_task(task)
+    response = client.put("/tasks/parser", json={"id": "parser", "task_name": "parser", "description": "",
+                                                 "skills": ["python"]})
+    assert response.status_code == 200
+    assert required_skills(storage.get_task("parser")) == ["python"]
+    response = client.put("/tasks/batch", json=[{"id": "parser", "task_name": "parser", "description": "",
+                                                 "skills": ["go"]}])
+    assert response.status_code == 200
+    assert required_skills(storage.get_task("parser")) == ["go"]
@@ -0,0 +1,75 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from agent_definition.base_agent import BaseAgent
+from data_storage.vector_db import DataStorage
+from project_management import assignment_planner
+from project_management.assignment_planner import AssignmentPlanner, linear_assignment
+from project_management.task import Task
+
+
+def brute_force(cost):
+    """Minimum total cost over every matching of the smaller side into the larger."""
+    rows, cols = cost.shape
+    if rows <= cols:
+        return min(cost[range(rows), list(p)].sum() for p in itertools.permutations(range(cols), rows))
+    return min(cost[list(p), range(cols)].sum() for p in itertools.permutations(range(rows), cols))
+
+
+def check_matching(cost, rows, cols):
+    k = min(cost.shape)
+    assert len(rows) == len(cols) == k
+    assert len(set(rows.tolist())) == len(set(cols.tolist())) == k
+    assert cost[rows, cols].sum() == pytest.approx(brute_force(cost))
+
+
+@pytest.mark.parametrize("integer_costs", [False, True])
+def test_solver_matches_brute_force(integer_costs):
+    rng = np.random.default_rng(0)
+    for _ in range(150):
+        shape = tuple(rng.integers(1, 6, 2))
+        cost = rng.integers(0, 4, shape).astype(float) if integer_costs else rng.random(shape)
+        check_matching(cost, *linear_assignment(cost))
+
+
+def test_numpy_solver_matches_brute_force(monkeypatch):
+    monkeypatch.setattr(assignment_planner, '_scipy_linear_sum_assignment', None)
+    rng = np.random.default_rng(1)
+    for _ in range(150):
+        cost = rng.normal(size=tuple(rng.integers(1, 6, 2))) * 10
+        check_matching(cost, *linear_assignment(cost))
+
+
+def test_empty_cost_matrix():
+    rows, cols = linear_assignment(np.zeros((0, 3)))
+    assert rows.shape == cols.shape == (0,)
+
+
+def make_task(skills, priority='Normal'):
+    task = Task("Planner test", "Planner test")
+    task.metadata['skills'] = skills
+    task.set_priority(priority)
+    return task
+
+
+def test_planner_matches_skills_and_respects_slots():
+    storage = DataStorage()
+    coder = BaseAgent("coder", None, ['python', 'sql'])
+    writer = BaseAgent("writer", None, ['writing'])
+    tasks = [make_task(['python']), make_task(['writing']), make_task(['sql'])]
+    planner = AssignmentPlanner(storage)
+    plan = {a.task_id: a.agent_id for a in planner.plan(tasks, [coder, writer], slots=2)}
+    assert plan == {tasks[0].id: coder.id, tasks[1].id: writer.id, tasks[2].id: coder.id}
+    assert len(planner.plan(tasks, [coder, writer], slots=1)) == 2
+
+
+def test_planner_leaves_forbidden_pairs_unassigned():
+    storage = DataStorage()
+    writer = BaseAgent("writer", None, ['writing'])
+    planner = AssignmentPlanner(storage, max_missing_skills=0)
+    tasks = [make_task(['python'], 'High'), make_task(['writing'])]
+    assignments = planner.assign(tasks, [writer])
+    assert [(a.task_id, a.agent_id) for a in assignments] == [(tasks[1].id, writer.id)]
+    assert len(storage.list_assignments()) == 1
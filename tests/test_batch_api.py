@@ -0,0 +1,80 @@
+from fastapi.testclient import TestClient
+
+import api.main as api_main
+from api.main import app
+from data_storage.vector_db import DataStorage
+
+client = TestClient(app)
+
+
+def fresh(monkeypatch):
+    storage = DataStorage()
+    monkeypatch.setattr(api_main, 'data_storage', storage)
+    return storage
+
+
+def auth():
+    token = client.post("/token", data={"username": "admin", "password": "password"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_atomic_batch_rejects_everything(monkeypatch):
+    storage = fresh(monkeypatch)
+    response = client.post("/tasks/batch", json=[{"id": "t1", "task_name": "a", "description": ""},
+                                                 {"id": "t2", "description": ""}, "oops"])
+    assert response.status_code == 422
+    assert [(e["index"], e["status"]) for e in response.json()["detail"]["errors"]] == [(1, 422), (2, 422)]
+    assert storage.list_tasks() == []
+
+
+def test_non_atomic_batch_applies_the_valid_items(monkeypatch):
+    storage = fresh(monkeypatch)
+    response = client.post("/tasks/batch", params={"atomic": "false"},
+                           json=[{"id": "t1", "task_name": "a", "description": ""}, {"id": "t2"}])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["applied"], body["failed"]) == (1, 1)
+    assert [r["status"] for r in body["results"]] == [200, 422]
+    assert [t.id for t in storage.list_tasks()] == ["t1"]
+
+
+def test_ndjson_create_update_delete(monkeypatch):
+    storage = fresh(monkeypatch)
+    lines = "\n".join('{"id": "t%d", "task_name": "task %d", "description": ""}' % (i, i) for i in range(3))
+    response = client.post("/tasks/batch", content=lines + "\n",
+                           headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200 and response.json()["applied"] == 3
+    version = storage.version("task_repository")
+
+    response = client.put("/tasks/batch", json=[{"id": "t0", "task_name": "renamed", "description": "",
+                                                 "status": "Done"}])
+    assert response.status_code == 200
+    assert storage.get_task("t0").task_name == "renamed"
+    assert client.put("/tasks/batch", json=[{"id": "missing", "task_name": "x", "description": ""}]).status_code == 422
+    assert client.put("/tasks/batch", json=[{"task_name": "x", "description": ""}]).status_code == 422
+
+    response = client.post("/tasks/batch/delete", json=["t1", "t2", "missing"], params={"atomic": "false"})
+    assert [r["status"] for r in response.json()["results"]] == [200, 200, 404]
+    assert [t.id for t in storage.list_tasks()] == ["t0"]
+    assert storage.version("task_repository") == version + 3
+
+
+def test_assignment_batch_marks_agents_and_tasks_assigned(monkeypatch):
+    storage = fresh(monkeypatch)
+    client.post("/agents/batch", json=[{"id": "a1", "name": "a1"}, {"id": "a2", "name": "a2"}])
+    client.post("/tasks/batch", json=[{"id": f"t{i}", "task_name": "", "description": ""} for i in range(3)])
+    assert client.post("/assignments/batch", json=[{"task_id": "t0", "agent_id": "a1"}]).status_code == 401
+    response = client.post("/assignments/batch", headers=auth(), json=[
+        {"id": "x0", "task_id": "t0", "agent_id": "a1"}, {"id": "x1", "task_id": "t1", "agent_id": "a1"}])
+    assert response.status_code == 200
+    assert sorted(a.id for a in storage.find_assignments(agent_id="a1")) == ["x0", "x1"]
+    assert storage.get_agent("a1").status == "assigned" and storage.get_agent("a2").status == "offline"
+    assert [storage.get_task(f"t{i}").status for i in range(3)] == ["assigned", "assigned", "Open"]
+
+
+def test_batch_body_limits(monkeypatch):
+    fresh(monkeypatch)
+    assert client.post("/tasks/batch", content="{not json").status_code == 400
+    assert client.post("/tasks/batch", json={"id": "t1"}).status_code == 400
+    monkeypatch.setattr(api_main, 'MAX_BATCH_SIZE', 2)
+    assert client.post("/tasks/batch/delete", json=["a", "b", "c"]).status_code == 413
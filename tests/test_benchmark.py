@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+import pytest
+
+from data_storage.benchmark import generate_dataset, ground_truth, main, parse_config, run_benchmark
+
+
+def test_parse_config_types_values():
+    assert parse_config('index=ivf,nlist=64,nprobe=4,codec=pq,m=8') == {
+        'index': 'ivf', 'nlist': 64, 'nprobe': 4, 'codec': 'pq', 'm': 8}
+    assert parse_config('rerank=50') == {'rerank': 50, 'index': 'flat'}
+    with pytest.raises(ValueError):
+        parse_config('index')
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'dot', 'l2'])
+def test_chunked_ground_truth_matches_brute_force(metric):
+    data, queries = generate_dataset(500, 8, clusters=5, queries=10, chunk=64)
+    truth = ground_truth(data, queries, 5, metric, chunk=64)
+    if metric == 'cosine':
+        data = data / np.linalg.norm(data, axis=1, keepdims=True)
+    scores = -((queries[:, None, :] - data[None, :, :]) ** 2).sum(axis=2) if metric == 'l2' else queries @ data.T
+    assert (truth == np.argsort(-scores, axis=1)[:, :5]).all()
+
+
+def test_flat_and_ivf_results():
+    report = run_benchmark(2000, 8, [{'index': 'flat'}, {'index': 'ivf', 'nlist': 16, 'nprobe': 16}],
+                           k=5, queries=20, clusters=10)
+    assert report['dataset']['rows'] == 2000
+    flat, ivf = report['results']
+    assert flat['recall_at_k'] == 1.0
+    assert ivf['recall_at_k'] == 1.0
+    assert ivf['index']['nlist'] == 16
+    for result in report['results']:
+        assert result['qps'] > 0 and result['batch_qps'] > 0
+        assert result['latency_ms']['p50'] <= result['latency_ms']['p99']
+        assert result['bytes_per_vector'] == 4 * 8
+
+
+def test_cli_writes_a_persistent_report(tmp_path):
+    output = tmp_path / 'report.json'
+    main(['--rows', '500', '--dim', '8', '--queries', '5', '--clusters', '5', '--persistent',
+          '--config', 'index=flat', '--config', 'index=hnsw,M=8,ef_search=32', '--output', str(output)])
+    report = json.loads(output.read_text())
+    assert report['dataset']['persistent']
+    assert [result['config']['index'] for result in report['results']] == ['flat', 'hnsw']
+    assert report['results'][1]['recall_at_k'] >= 0.9
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+import api.main as api_main
+from api.main import app
+
+api_main.CHANGE_FEED_POLL_SECONDS = 0.01
+client = TestClient(app)
+
+
+def feed_position():
+    change_log = api_main.data_storage.change_log
+    return f"{change_log.epoch}:{change_log.last_sequence}"
+
+
+def create_task(name):
+    response = client.post("/tasks", json={"task_name": name, "description": "Feed test"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_sse_feed_sends_stored_api_model():
+    after = feed_position()
+    task = create_task("SSE task")
+    # TestClient reads a response to the end, and the feed never ends, so read the first event off the body.
+    request = Request({"type": "http", "method": "GET", "path": "/changes", "headers": []})
+    response = api_main.change_feed(request, after=after, resource=["tasks"])
+
+    async def first_event():
+        async for chunk in response.body_iterator:
+            return chunk.decode() if isinstance(chunk, bytes) else chunk
+
+    event = asyncio.run(first_event())
+    lines = dict(line.split(": ", 1) for line in event.strip().split("\n"))
+    assert lines["event"] == "change"
+    data = json.loads(lines["data"])
+    assert data["op"] == "store"
+    assert data["resource"] == "tasks"
+    assert data["item_id"] == task["id"]
+    assert data["data"]["task_name"] == "SSE task"
+
+
+def test_websocket_feed_sends_stored_api_model():
+    after = feed_position()
+    task = create_task("WebSocket task")
+    with client.websocket_connect(f"/changes/ws?after={after}&resource=tasks") as websocket:
+        event = json.loads(websocket.receive_text())
+    assert event["event"] == "change"
+    assert event["item_id"] == task["id"]
+    assert event["data"] == task
+
+
+def test_websocket_feed_reports_deletes_without_data():
+    task = create_task("Deleted task")
+    after = feed_position()
+    api_main.data_storage.delete_task(task["id"])
+    with client.websocket_connect(f"/changes/ws?after={after}") as websocket:
+        event = json.loads(websocket.receive_text())
+    assert event["op"] == "delete"
+    assert event["item_id"] == task["id"]
+    assert event["data"] is None
+
+
+def test_feed_from_another_epoch_resyncs():
+    with client.websocket_connect("/changes/ws?after=other-epoch:5") as websocket:
+        event = json.loads(websocket.receive_text())
+    assert event["event"] == "resync"
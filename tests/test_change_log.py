@@ -0,0 +1,53 @@
+import pytest
+
+from data_storage.change_log import ChangeLog
+from data_storage.vector_db import DataStorage
+
+
+def test_since_returns_changes_in_order():
+    change_log = ChangeLog(capacity=10)
+    for i in range(3):
+        assert change_log.append('store', 'task_repository', f"t{i}", {'id': f"t{i}"}) == i + 1
+    changes = change_log.since(0)
+    assert [c.sequence for c in changes] == [1, 2, 3]
+    assert [c.id for c in change_log.since(1, limit=1)] == ['t1']
+    assert change_log.since(3) == []
+
+
+def test_since_raises_after_eviction():
+    change_log = ChangeLog(capacity=2)
+    for i in range(5):
+        change_log.append('store', 'task_repository', f"t{i}")
+    assert [c.sequence for c in change_log.since(3)] == [4, 5]
+    with pytest.raises(KeyError):
+        change_log.since(1)
+
+
+def test_since_raises_when_ahead_of_log():
+    change_log = ChangeLog()
+    change_log.append('delete', 'agent_repository', 'a1')
+    with pytest.raises(KeyError):
+        change_log.since(2)
+
+
+def test_storage_records_stores_and_deletes():
+    class Item:
+        def __init__(self, item_id):
+            self.id = item_id
+
+        def to_dict(self):
+            return {'id': self.id}
+
+    storage = DataStorage(change_log_size=10)
+    start = storage.change_log.last_sequence
+    storage.store_task(Item('t1'))
+    storage.delete_task('t1')
+    changes = storage.change_log.since(start)
+    assert [(c.op, c.repository, c.id) for c in changes] == [
+        ('store', 'task_repository', 't1'), ('delete', 'task_repository', 't1')]
+    assert changes[1].obj is None
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        ChangeLog(capacity=0)
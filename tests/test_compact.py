@@ -0,0 +1,48 @@
+import pickle
+from datetime import datetime, timedelta, timezone
+
+from agent_definition.base_agent import BaseAgent
+from common.compact import to_datetime, to_timestamp
+from project_management.assignment import Assignment
+from project_management.task import Task
+
+
+def test_naive_values_round_trip_as_local_time():
+    value = datetime(2024, 5, 1, 9, 30, 0, 123456)
+    assert to_datetime(to_timestamp(value)) == value
+    assert to_datetime(to_timestamp(value.isoformat())).tzinfo is None
+
+
+def test_aware_values_keep_their_offset():
+    value = datetime(2024, 5, 1, 9, 30, 0, 500, tzinfo=timezone(timedelta(hours=2)))
+    restored = to_datetime(to_timestamp(value))
+    assert restored == value
+    assert restored.utcoffset() == timedelta(hours=2)
+
+    task = Task("Ship", "Release")
+    task.due_date = "2024-05-01T09:30:00+02:00"
+    assert task.to_dict()['due_date'] == "2024-05-01T09:30:00+02:00"
+    assert pickle.loads(pickle.dumps(task)).due_date == task.due_date
+
+
+def test_aware_and_naive_timestamps_order_by_instant():
+    utc = to_timestamp(datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc))
+    ahead = to_timestamp("2024-05-01T13:00:00+02:00")
+    assert ahead < utc
+    assert utc == to_timestamp(datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc).astimezone())
+
+
+def test_from_dict_round_trips_timestamps():
+    data = Assignment("t1", "a1").to_dict()
+    data['started_at'] = "2024-05-01T08:00:00-05:00"
+    restored = Assignment.from_dict(data)
+    assert restored.to_dict()['created_at'] == data['created_at']
+    assert restored.to_dict()['started_at'] == data['started_at']
+
+
+def test_slotted_objects_share_interned_statuses():
+    first, second = Task("a", "x", "".join(["In ", "Progress"])), Task("b", "y", "In Progress")
+    assert first.status is second.status
+    agent = BaseAgent("Builder", None)
+    assert not hasattr(agent, '__dict__')
+    assert isinstance(agent.created_at, datetime)
@@ -0,0 +1,131 @@
+import random
+import threading
+
+import pytest
+
+from data_storage.vector_db import DataStorage
+
+
+class Item:
+    def __init__(self, item_id, status='Open', priority='Normal', tags=()):
+        self.id = item_id
+        self.status = status
+        self.priority = priority
+        self.tags = list(tags)
+
+    def to_dict(self):
+        return {'id': self.id, 'status': self.status}
+
+
+def all_pages(storage, limit, **criteria):
+    ids, cursor = [], 0
+    while True:
+        page, cursor = storage.page_tasks(after=cursor, limit=limit, **criteria)
+        ids.extend(task.id for task in page)
+        if cursor is None:
+            return ids
+
+
+def test_find_uses_secondary_indexes():
+    storage = DataStorage()
+    storage.store_task(Item('t1', 'Open', tags=['a']))
+    storage.store_task(Item('t2', 'Done', tags=['a', 'b']))
+    storage.store_task(Item('t3', 'Open', tags=['b']))
+    assert [t.id for t in storage.find_tasks(status='Open')] == ['t1', 't3']
+    assert [t.id for t in storage.find_tasks(tag='b', status='Done')] == ['t2']
+    storage.store_task(Item('t1', 'Done', tags=['a']))
+    assert [t.id for t in storage.find_tasks(status='Open')] == ['t3']
+    storage.delete_task('t3')
+    assert storage.find_tasks(status='Open') == []
+
+
+class Link:
+    def __init__(self, item_id, agent_id, task_id, status='Assigned'):
+        self.id = item_id
+        self.agent_id = agent_id
+        self.task_id = task_id
+        self.status = status
+
+
+def test_indexes_agree_with_a_scan_after_random_writes():
+    rng = random.Random(0)
+    storage = DataStorage()
+    for _ in range(2000):
+        item_id = f"a{rng.randrange(200)}"
+        if rng.random() < 0.2:
+            storage.delete_assignment(item_id)
+        else:
+            storage.store_assignment(Link(item_id, f"agent{rng.randrange(5)}", f"task{rng.randrange(20)}",
+                                          rng.choice(['Assigned', 'In Progress', 'Completed'])))
+    items = storage.list_assignments()
+    for agent in range(5):
+        for status in (None, 'Completed'):
+            expected = [a.id for a in items if a.agent_id == f"agent{agent}" and status in (None, a.status)]
+            found = storage.find_assignments(agent_id=f"agent{agent}", status=status)
+            assert sorted(a.id for a in found) == sorted(expected)
+    expected = [a.id for a in items if a.task_id == 'task3']
+    assert sorted(a.id for a in storage.find_assignments(task_id='task3')) == sorted(expected)
+    assert storage.find_assignments() == items
+
+
+def test_apply_batch_checks_every_operation_first():
+    storage = DataStorage()
+    with pytest.raises(ValueError):
+        storage.apply_batch([('store', 'task_repository', Item('t1')), ('drop', 'task_repository', 't1')])
+    assert storage.get_task('t1') is None
+    assert storage.apply_batch([('store', 'task_repository', Item('t1', tags=['x'])),
+                                ('delete', 'task_repository', 't2'),
+                                ('store', 'assignment_repository', Link('a1', 'agent', 't1'))]) == [None, False, None]
+    assert [t.id for t in storage.find_tasks(tag='x')] == ['t1']
+    assert [a.id for a in storage.find_assignments(task_id='t1')] == ['a1']
+
+
+def test_pages_follow_first_store_order_across_deletes():
+    storage = DataStorage()
+    for i in range(300):
+        storage.store_task(Item(f"t{i}", tags=['even' if i % 2 == 0 else 'odd']))
+    for i in range(0, 300, 3):
+        storage.delete_task(f"t{i}")
+    storage.store_task(Item('t0'))  # stored again: moves to the end
+    storage.store_task(Item('t1', 'Done', tags=['odd']))  # replaced: keeps its place
+    expected = [f"t{i}" for i in range(300) if i % 3] + ['t0']
+    assert [t.id for t in storage.list_tasks()] == expected
+    for limit in (1, 7, 100, 1000):
+        assert all_pages(storage, limit) == expected
+    assert all_pages(storage, 10, tag='odd') == [f"t{i}" for i in range(300) if i % 3 and i % 2]
+    page, cursor = storage.page_tasks(limit=len(expected))
+    assert len(page) == len(expected) and cursor is None
+
+
+def test_readers_see_consistent_results_during_writes():
+    storage = DataStorage()
+    stop = threading.Event()
+    errors = []
+
+    def write(offset):
+        i = 0
+        while not stop.is_set():
+            storage.store_task(Item(f"t{offset + i % 500}", status=['Open', 'Done'][i % 2]))
+            storage.delete_task(f"t{offset + (i * 7) % 500}")
+            i += 1
+
+    def read():
+        try:
+            while not stop.is_set():
+                for task in storage.find_tasks(status='Open'):
+                    assert task.status == 'Open'
+                ids = [task.id for task in storage.list_tasks()]
+                assert len(ids) == len(set(ids))
+                storage.page_tasks(limit=50)
+        except Exception as e:  # surfaced in the main thread below
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(k * 1000,)) for k in range(2)]
+    threads += [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    stop.wait(1.0)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
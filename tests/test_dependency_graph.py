@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from api.main import TaskModel
+from data_storage.vector_db import DataStorage
+from project_management.dependency_graph import DependencyGraph
+from project_management.task import Task
+
+
+def api_task(task_id, due_date=None, dependencies=()):
+    return TaskModel(id=task_id, task_name=task_id, description="Graph test", due_date=due_date,
+                     dependencies=list(dependencies))
+
+
+def test_critical_path_follows_durations():
+    storage = DataStorage()
+    previous = None
+    for i in range(3):
+        task = Task(f"t{i}", "Graph test")
+        task.metadata['duration'] = 10.0
+        if previous is not None:
+            task.add_dependency(previous.id)
+        storage.store_task(task)
+        previous = task
+    graph = DependencyGraph(storage, start=0)
+    assert graph.critical_path() == [task.id for task in storage.list_tasks()]
+    assert graph.earliest_finish(previous.id) == 30.0
+
+
+def test_adding_a_cycle_is_rejected():
+    storage = DataStorage()
+    storage.store_task(api_task('a'))
+    storage.store_task(api_task('b', dependencies=['a']))
+    graph = DependencyGraph(storage, start=0)
+    assert graph.would_create_cycle('a', 'b')
+    with pytest.raises(ValueError):
+        graph.add_dependency('a', 'b')
+    assert graph.topological_order() == ['a', 'b']
+
+
+def test_iso_string_due_date_sets_latest_finish():
+    storage = DataStorage()
+    due = datetime(2030, 1, 1, 12, 0)
+    storage.store_task(api_task('a'))
+    storage.store_task(api_task('b', due.isoformat(), dependencies=['a']))
+    graph = DependencyGraph(storage, start=0, default_duration=60.0)
+    assert graph.latest_finish('b') == due.timestamp()
+    assert graph.latest_finish('a') == due.timestamp() - 60.0
+
+
+def test_free_text_due_date_counts_as_none():
+    storage = DataStorage()
+    storage.store_task(api_task('a', "next friday"))
+    graph = DependencyGraph(storage, start=0)
+    assert graph.latest_finish('a') is None
+    assert graph.ready() == ['a']
+    storage.store_task(api_task('a', "2030-01-01T00:00:00"))
+    assert graph.latest_finish('a') == datetime(2030, 1, 1).timestamp()
+    storage.store_task(api_task('a', "someday"))
+    assert graph.latest_finish('a') is None
+
+
+@pytest.mark.parametrize("make_task", [lambda task_id: api_task(task_id),
+                                       lambda task_id: Task(task_id, "Graph test")])
+def test_editing_dependencies_stores_the_task(make_task):
+    storage = DataStorage()
+    first, second = make_task('a'), make_task('b')
+    storage.store_task(first)
+    storage.store_task(second)
+    graph = DependencyGraph(storage, start=0)
+    graph.add_dependency(second.id, first.id)
+    assert storage.get_task(second.id).dependencies == [first.id]
+    assert graph.dependencies(second.id) == [first.id]
+    assert graph.ready() == [first.id]
+    graph.add_dependency(second.id, first.id)
+    assert storage.get_task(second.id).dependencies == [first.id]
+    assert graph.remove_dependency(second.id, first.id)
+    assert storage.get_task(second.id).dependencies == []
+    assert sorted(graph.ready()) == sorted([first.id, second.id])
+    assert not graph.remove_dependency(second.id, first.id)
@@ -0,0 +1,146 @@
+import os
+import shutil
+import threading
+import time
+
+from data_storage.durable_storage import FRAME_HEADER, DurableDataStorage, read_frames
+
+
+class Item:
+    def __init__(self, item_id, name=""):
+        self.id = item_id
+        self.name = name
+
+    def to_dict(self):
+        return {'id': self.id, 'name': self.name}
+
+
+def crash_image(storage, tmp_path):
+    """Copy of the storage directory as a crash right now would leave it, without closing the storage."""
+    storage.flush()
+    image = str(tmp_path / "image")
+    shutil.copytree(storage.path, image)
+    return image
+
+
+def wal_file(path):
+    return os.path.join(path, sorted(name for name in os.listdir(path) if name.startswith('wal-'))[-1])
+
+
+def test_reopen_after_close(tmp_path):
+    storage = DurableDataStorage(str(tmp_path / "db"))
+    storage.store_task(Item('t1', 'first'))
+    storage.store_agent(Item('a1'))
+    storage.delete_agent('a1')
+    storage.close()
+    storage = DurableDataStorage(str(tmp_path / "db"))
+    assert storage.get_task('t1').name == 'first'
+    assert storage.get_agent('a1') is None
+    storage.close()
+
+
+def test_replay_after_unclean_close(tmp_path):
+    storage = DurableDataStorage(str(tmp_path / "db"))
+    for i in range(5):
+        storage.store_task(Item(f"t{i}"))
+    storage.delete_task('t2')
+    image = crash_image(storage, tmp_path)
+    storage.close()
+    recovered = DurableDataStorage(image)
+    assert sorted(task.id for task in recovered.list_tasks()) == ['t0', 't1', 't3', 't4']
+    recovered.close()
+
+
+def test_truncated_final_frame_is_dropped(tmp_path):
+    storage = DurableDataStorage(str(tmp_path / "db"))
+    storage.store_task(Item('kept'))
+    storage.flush()
+    storage.apply_batch([('store', 'task_repository', Item('torn-1')),
+                         ('store', 'task_repository', Item('torn-2'))])
+    image = crash_image(storage, tmp_path)
+    storage.close()
+    wal = wal_file(image)
+    payloads, size = read_frames(wal)
+    assert len(payloads) == 2 and size == os.path.getsize(wal)
+    os.truncate(wal, size - 3)
+
+    recovered = DurableDataStorage(image)
+    # The batch shared the torn frame, so neither of its records comes back.
+    assert [task.id for task in recovered.list_tasks()] == ['kept']
+    assert os.path.getsize(wal) == FRAME_HEADER.size + len(payloads[0])
+    recovered.store_task(Item('after'))
+    recovered.close()
+    recovered = DurableDataStorage(image)
+    assert sorted(task.id for task in recovered.list_tasks()) == ['after', 'kept']
+    recovered.close()
+
+
+def test_corrupt_frame_stops_replay(tmp_path):
+    storage = DurableDataStorage(str(tmp_path / "db"))
+    storage.store_task(Item('t1'))
+    storage.flush()
+    storage.store_task(Item('t2'))
+    image = crash_image(storage, tmp_path)
+    storage.close()
+    wal = wal_file(image)
+    with open(wal, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    recovered = DurableDataStorage(image)
+    assert [task.id for task in recovered.list_tasks()] == ['t1']
+    recovered.close()
+
+
+def test_recovery_from_snapshot_and_newer_wal(tmp_path):
+    storage = DurableDataStorage(str(tmp_path / "db"))
+    storage.store_task(Item('t1', 'old'))
+    storage.snapshot()
+    storage.store_task(Item('t1', 'new'))
+    storage.store_task(Item('t2'))
+    image = crash_image(storage, tmp_path)
+    storage.close()
+    assert any(name.startswith('snapshot-') for name in os.listdir(image))
+    recovered = DurableDataStorage(image)
+    assert recovered.get_task('t1').name == 'new'
+    assert recovered.get_task('t2') is not None
+    recovered.close()
+
+
+def test_snapshots_racing_writes_lose_nothing(tmp_path):
+    storage = DurableDataStorage(str(tmp_path / "db"), commit_interval=0.001)
+    done = threading.Event()
+
+    def write():
+        for i in range(2000):
+            storage.store_task(Item(f"t{i}"))
+        done.set()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    while not done.is_set():
+        storage.snapshot()
+    writer.join()
+    image = crash_image(storage, tmp_path)
+    storage.close()
+    recovered = DurableDataStorage(image)
+    assert len(recovered.list_tasks()) == 2000
+    recovered.close()
+
+
+def test_automatic_snapshot_runs_off_the_flusher(tmp_path):
+    storage = DurableDataStorage(str(tmp_path / "db"), snapshot_interval=10)
+    for i in range(25):
+        storage.store_task(Item(f"t{i}"))
+    deadline = time.monotonic() + 5
+    while not any(name.startswith('snapshot-') for name in os.listdir(storage.path)):
+        assert time.monotonic() < deadline, "no snapshot was written"
+        time.sleep(0.01)
+    # Writes keep committing while a snapshot is pickled.
+    storage.store_task(Item('t25'))
+    storage.flush()
+    storage.close()
+    recovered = DurableDataStorage(str(tmp_path / "db"))
+    assert len(recovered.list_tasks()) == 26
+    recovered.close()
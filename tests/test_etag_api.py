@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+
+import api.main as api_main
+from api.main import app
+from data_storage.vector_db import DataStorage
+from project_management.task import Task
+
+client = TestClient(app)
+
+
+def seed(monkeypatch):
+    storage = DataStorage()
+    monkeypatch.setattr(api_main, 'data_storage', storage)
+    for task_id in ("t1", "t2"):
+        task = Task(task_id, "")
+        task.id = task_id
+        storage.store_task(task)
+
+
+def test_item_etag_changes_only_with_the_item(monkeypatch):
+    seed(monkeypatch)
+    response = client.get("/tasks/t1")
+    tag = response.headers["ETag"]
+    cached = client.get("/tasks/t1", headers={"If-None-Match": tag})
+    assert cached.status_code == 304 and cached.content == b"" and cached.headers["ETag"] == tag
+    assert client.get("/tasks/t1", headers={"If-None-Match": f'"other", W/{tag}'}).status_code == 304
+    assert client.get("/tasks/t1", headers={"If-None-Match": "*"}).status_code == 304
+
+    client.put("/tasks/t2", json={"id": "t2", "task_name": "renamed", "description": ""})
+    assert client.get("/tasks/t1", headers={"If-None-Match": tag}).status_code == 304
+    client.put("/tasks/t1", json={"id": "t1", "task_name": "renamed", "description": ""})
+    fresh = client.get("/tasks/t1", headers={"If-None-Match": tag})
+    assert fresh.status_code == 200 and fresh.headers["ETag"] != tag
+    assert fresh.json()["task_name"] == "renamed"
+
+
+def test_list_etag_covers_the_repository_and_the_query(monkeypatch):
+    seed(monkeypatch)
+    tag = client.get("/tasks").headers["ETag"]
+    assert client.get("/tasks", headers={"If-None-Match": tag}).status_code == 304
+    assert client.get("/tasks?status=Open", headers={"If-None-Match": tag}).status_code == 200
+    ndjson = {"If-None-Match": tag, "Accept": "application/x-ndjson"}
+    assert client.get("/tasks", headers=ndjson).status_code == 200
+    client.delete("/tasks/t2")
+    response = client.get("/tasks", headers={"If-None-Match": tag})
+    assert response.status_code == 200 and [t["id"] for t in response.json()] == ["t1"]
+
+
+def test_missing_items_have_no_etag(monkeypatch):
+    seed(monkeypatch)
+    response = client.get("/tasks/missing", headers={"If-None-Match": "*"})
+    assert response.status_code == 404 and "ETag" not in response.headers
+
+
+def test_etag_changes_when_storage_is_replaced(monkeypatch):
+    seed(monkeypatch)
+    tag = client.get("/tasks/t1").headers["ETag"]
+    seed(monkeypatch)
+    assert client.get("/tasks/t1", headers={"If-None-Match": tag}).status_code == 200
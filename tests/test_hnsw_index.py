@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from data_storage.benchmark import generate_dataset, ground_truth
+from data_storage.vector_db import VectorDB
+
+
+def recall(db, data, queries, metric, k=10, ef_search=64):
+    truth = ground_truth(data, queries, k, metric)
+    found = 0
+    for query, expected in zip(queries, truth):
+        hits = {int(hit['id']) for hit in db.query(query.tolist(), top_k=k, ef_search=ef_search)}
+        found += len(hits & set(expected.tolist()))
+    return found / truth.size
+
+
+def build(data, metric, batch, **options):
+    db = VectorDB('hnsw', dim=data.shape[1], metric=metric, index='hnsw',
+                  index_options={'M': 8, 'ef_construction': 64, **options})
+    for start in range(0, data.shape[0], batch):
+        stop = min(start + batch, data.shape[0])
+        db.add_embeddings([str(row) for row in range(start, stop)], data[start:stop])
+    return db
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'l2'])
+@pytest.mark.parametrize('batch, options', [
+    (50, {}),                                           # one-by-one inserts
+    (1500, {'bulk_rows': 256}),                         # bulk, exact candidate pools
+    (500, {'bulk_rows': 256, 'exact_pool_rows': 400}),  # bulk, k-means cells, appended to a built graph
+])
+def test_recall_against_flat(metric, batch, options):
+    data, queries = generate_dataset(1500, 16, clusters=10, queries=30, spread=0.5)
+    db = build(data, metric, batch, **options)
+    assert db.get_info()['index']['nodes'] == 1500
+    assert recall(db, data, queries, metric) >= 0.9
+
+
+def test_bulk_links_fit_the_graph():
+    data, _ = generate_dataset(2000, 16, clusters=10, queries=1)
+    index = build(data, 'l2', 2000, bulk_rows=256)._index
+    links0 = index.links0[:2000]
+    assert ((links0 >= 0).sum(axis=1) >= index.M).all()
+    assert not (links0 == np.arange(2000)[:, np.newaxis]).any()
+    for row in np.flatnonzero(index.levels[:2000] > 0).tolist():
+        for layer in range(1, int(index.levels[row]) + 1):
+            assert (index.levels[index._neighbours(row, layer)] >= layer).all()
+    assert index.levels[index.entry_point] == index.max_level == index.levels[:2000].max()
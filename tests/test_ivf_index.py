@@ -0,0 +1,51 @@
+import numpy as np
+
+from data_storage.benchmark import generate_dataset, ground_truth
+from data_storage.vector_db import VectorDB
+
+
+def recall(db, data, queries, metric, k=10, **query_options):
+    truth = ground_truth(data, queries, k, metric)
+    found = 0
+    for query, expected in zip(queries, truth):
+        hits = {int(hit['id']) for hit in db.query(query.tolist(), top_k=k, **query_options)}
+        found += len(hits & set(expected.tolist()))
+    return found / truth.size
+
+
+def test_recall_against_flat_grows_with_nprobe():
+    data, queries = generate_dataset(4000, 16, clusters=40, queries=40, spread=0.5)
+    db = VectorDB('ivf', dim=16, metric='l2', index='ivf', index_options={'nlist': 64, 'nprobe': 1})
+    db.add_embeddings([str(row) for row in range(3000)], data[:3000])
+    assert recall(db, data[:3000], queries, 'l2') == 1.0  # untrained: flat scan
+    db.train_index()
+    assert db.get_info()['index']['indexed_rows'] == 3000
+    # Rows added after training are appended to the posting lists.
+    db.add_embeddings([str(row) for row in range(3000, 4000)], data[3000:])
+    assert db.get_info()['index']['indexed_rows'] == 4000
+    low = recall(db, data, queries, 'l2')
+    high = recall(db, data, queries, 'l2', nprobe=16)
+    assert low < high
+    assert high >= 0.95
+    assert recall(db, data, queries, 'l2', nprobe=64) == 1.0
+
+
+def test_deleted_rows_are_not_returned():
+    data, _ = generate_dataset(1000, 8, clusters=10, queries=1)
+    db = VectorDB('ivf', dim=8, index='ivf', index_options={'nlist': 16})
+    db.add_embeddings([str(row) for row in range(1000)], data)
+    db.train_index()
+    db.delete_embedding('7')
+    hits = db.query(data[7].tolist(), top_k=5, nprobe=16)
+    assert '7' not in [hit['id'] for hit in hits]
+    assert len(hits) == 5
+
+
+def test_background_training_swaps_in_the_index():
+    data, _ = generate_dataset(2000, 8, clusters=10, queries=1)
+    db = VectorDB('ivf', dim=8, index='ivf', index_options={'nlist': 16})
+    db.add_embeddings([str(row) for row in range(2000)], data)
+    db.train_index(background=True).join()
+    assert db.get_info()['index']['trained']
+    assert db.query(data[3].tolist(), top_k=1, nprobe=16)[0]['id'] == '3'
+    assert np.isfinite(db.query(data[3].tolist(), top_k=1)[0]['score'])
@@ -0,0 +1,61 @@
+import threading
+
+import numpy as np
+
+from data_storage.lexical_index import LexicalIndex, tokenize
+from data_storage.vector_db import VectorDB
+
+
+def test_tokenize_keeps_identifiers_and_their_parts():
+    assert tokenize("Retry on ERR_CONN_RESET in pkg.module") == [
+        'retry', 'on', 'err_conn_reset', 'in', 'pkg.module', 'pkg', 'module']
+
+
+def test_bm25_prefers_rarer_terms_and_shorter_documents():
+    index = LexicalIndex()
+    index.add(0, "deploy the service")
+    index.add(1, "deploy the service to the cluster and verify the rollout carefully")
+    index.add(2, "rollback")
+    live = np.ones(3, dtype=bool)
+    rows, scores = index.search("deploy", live)
+    by_row = dict(zip(rows.tolist(), scores.tolist()))
+    assert by_row[0] > by_row[1]
+    rows, scores = index.search("rollback service", live)
+    ranked = rows[np.argsort(-scores)].tolist()
+    assert ranked[0] == 2
+    live[2] = False
+    rows, _ = index.search("rollback", live)
+    assert rows.tolist() == []
+
+
+def test_hybrid_query_finds_keyword_only_match():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    db = VectorDB('hybrid', dim=8)
+    texts = [f"note {row}" for row in range(50)]
+    texts[31] = "ERR_CONN_RESET seen on the gateway"
+    db.add_embeddings([f"doc-{row}" for row in range(50)], vectors, [{'text': text} for text in texts])
+    assert db.query_text("err_conn_reset", top_k=1)[0]['id'] == 'doc-31'
+    ids = [hit['id'] for hit in db.query_hybrid(vectors[5].tolist(), "ERR_CONN_RESET", top_k=2)]
+    assert set(ids) == {'doc-5', 'doc-31'}
+
+
+def test_keyword_queries_racing_appends_keep_every_row():
+    db = VectorDB('racing', dim=4)
+    vectors = np.random.default_rng(1).normal(size=(2000, 4)).astype(np.float32)
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            db.query_text("common", top_k=5)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for row in range(2000):
+        db.add_embedding(f"doc-{row}", vectors[row].tolist(), {'text': f"common word{row % 7}"})
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert len(db.query_text("common", top_k=5000)) == 2000
+    assert len(db.query_text("word3", top_k=5000)) == len(range(3, 2000, 7))
@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+import pytest
+
+from data_storage.metadata_index import MetadataIndex
+from data_storage.vector_db import VectorDB
+
+
+def test_match_intersects_keys_and_unions_list_values():
+    index = MetadataIndex()
+    index.add(0, {'agent_id': 'a1', 'type': 'episodic'})
+    index.add(1, {'agent_id': 'a1', 'type': 'semantic', 'tags': ['x', 'y']})
+    index.add(2, {'agent_id': 'a2', 'type': 'episodic', 'tags': ['y']})
+    index.add(3, {'nested': {'unhashable': True}})
+    assert index.match({'agent_id': 'a1'}).tolist() == [0, 1]
+    assert index.match({'agent_id': 'a1', 'type': 'semantic'}).tolist() == [1]
+    assert index.match({'type': ['episodic', 'semantic']}).tolist() == [0, 1, 2]
+    assert index.match({'tags': 'y'}).tolist() == [1, 2]
+    assert index.match({'agent_id': 'a3'}).tolist() == []
+    with pytest.raises(ValueError):
+        index.match({'nested': {'unhashable': True}})
+
+
+def matches(metadata, filter):
+    for key, value in filter.items():
+        allowed = value if isinstance(value, list) else [value]
+        present = metadata[key] if isinstance(metadata[key], list) else [metadata[key]]
+        if not set(allowed) & set(present):
+            return False
+    return True
+
+
+def test_filtered_query_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(300, 8)).astype(np.float32)
+    metadatas = [{'group': row % 5, 'tags': ['even' if row % 2 == 0 else 'odd']} for row in range(300)]
+    # filter_scan_rows=50: {'group': 0} (60 rows) takes the masked scan, the other the exact subset scan.
+    db = VectorDB('filtered', dim=8, metric='dot', filter_scan_rows=50)
+    db.add_embeddings([f"doc-{row}" for row in range(300)], vectors, metadatas)
+    db.delete_embedding('doc-0')
+    for filter in ({'group': 0}, {'group': [1, 2], 'tags': 'even'}):
+        hits = db.query(vectors[10].tolist(), top_k=5, filter=filter)
+        candidates = [row for row in range(1, 300) if matches(metadatas[row], filter)]
+        expected = sorted(candidates, key=lambda row: -float(vectors[row] @ vectors[10]))[:5]
+        assert [hit['id'] for hit in hits] == [f"doc-{row}" for row in expected]
+
+
+def test_filters_racing_appends_keep_every_row():
+    db = VectorDB('racing', dim=4)
+    vectors = np.random.default_rng(2).normal(size=(3000, 4)).astype(np.float32)
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            db.query(vectors[0].tolist(), top_k=3, filter={'group': 0})
+            db.query_batch(vectors[:4], top_k=3, filter={'group': 1})
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    for row in range(3000):
+        db.add_embedding(f"doc-{row}", vectors[row].tolist(), {'group': row % 2})
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert db._metadata_index.match({'group': 0}).tolist() == list(range(0, 3000, 2))
+    assert len(db.query(vectors[0].tolist(), top_k=3000, filter={'group': 1})) == 1500
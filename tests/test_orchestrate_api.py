@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api.main as api_main
+from api.main import AgentModel, app
+from data_storage.vector_db import DataStorage
+from orchestration.orchestration_engine import OrchestrationEngine
+
+client = TestClient(app)
+
+
+class Worker:
+    def __init__(self, agent_id):
+        self.id = agent_id
+        self.skills = []
+
+    async def act(self, step_input):
+        await asyncio.sleep(0)
+        return step_input['description'].upper()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = OrchestrationEngine()
+    monkeypatch.setattr(api_main, 'data_storage', DataStorage())
+    monkeypatch.setattr(api_main, 'orchestration_engine', engine)
+    return engine
+
+
+@pytest.fixture
+def headers():
+    token = client.post("/token", data={"username": "admin", "password": "password"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_stored_agents_run_through_registered_agents(engine, headers):
+    api_main.data_storage.store_agent(AgentModel(id="a1", name="Worker"))
+    engine.add_agent(Worker("a1"))
+    response = client.post("/orchestrate", headers=headers, json={
+        "query": "q", "subtasks": [{"id": "s", "description": "draft"},
+                                   {"id": "t", "description": "review", "dependencies": ["s"]}]})
+    assert response.status_code == 200
+    assert response.json()["plan"]["status"] == "completed"
+    assert response.json()["result"] == {"s": "DRAFT", "t": "REVIEW"}
+
+
+def test_request_without_executable_agents_is_rejected(engine, headers):
+    api_main.data_storage.store_agent(AgentModel(id="a1", name="Record only"))
+    response = client.post("/orchestrate", headers=headers, json={"query": "q"})
+    assert response.status_code == 400
+    assert engine.execution_plans == {}
+
+
+@pytest.mark.parametrize("subtasks", [["not a dict"], [{"description": "no id"}], [{"id": "s", "timeout": 0}]])
+def test_malformed_subtasks_are_rejected(engine, headers, subtasks):
+    api_main.data_storage.store_agent(AgentModel(id="a1", name="Worker"))
+    engine.add_agent(Worker("a1"))
+    response = client.post("/orchestrate", headers=headers, json={"query": "q", "subtasks": subtasks})
+    assert response.status_code == 422
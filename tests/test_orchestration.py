@@ -0,0 +1,162 @@
+import asyncio
+import time
+
+import pytest
+
+from orchestration.orchestration_engine import OrchestrationEngine
+from orchestration.task_decomposition import decompose
+
+
+class Agent:
+    """Agent that echoes its step and the results it received, failing on "boom" and hanging on "hang"."""
+    def __init__(self, agent_id, skills=(), delay=0.01):
+        self.id = agent_id
+        self.skills = list(skills)
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def act(self, step_input):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(60 if 'hang' in step_input['description'] else self.delay)
+            if 'boom' in step_input['description']:
+                raise RuntimeError("boom")
+            inputs = ','.join(sorted(step_input['inputs'].values()))
+            return f"{step_input['description']}<{inputs}>"
+        finally:
+            self.active -= 1
+
+
+class BlockingAgent:
+    id = 'blocking'
+    skills = []
+
+    def act(self, step_input):
+        time.sleep(0.5)
+        return "late"
+
+
+def statuses(plan):
+    return {step['id']: step['status'] for step in plan['steps']}
+
+
+def test_decompose_chains_steps_within_a_part():
+    subtasks = decompose("fetch then parse; report")
+    assert [(s['description'], s['dependencies']) for s in subtasks] == [
+        ('fetch', []), ('parse', ['step-1']), ('report', [])]
+
+
+def test_results_flow_to_dependents():
+    engine = OrchestrationEngine()
+    engine.add_agent(Agent('a1'))
+    plan = engine.execute_plan(engine.create_execution_plan("x then y then z")['id'])
+    assert plan['status'] == 'completed'
+    assert plan['steps'][-1]['result'] == "z<y<x<>>>"
+
+
+def test_failing_subtask_skips_its_dependents_only():
+    engine = OrchestrationEngine()
+    engine.add_agent(Agent('a1'))
+    engine.add_agent(Agent('a2'))
+    plan = engine.create_execution_plan("boom then never then nor; fine")
+    plan = engine.execute_plan(plan['id'])
+    assert statuses(plan) == {'step-1': 'failed', 'step-2': 'skipped', 'step-3': 'skipped',
+                              'step-4': 'completed'}
+    assert plan['steps'][0]['error'] == "RuntimeError: boom"
+    assert plan['steps'][1]['error'] == "Dependency step-1 did not complete"
+    assert plan['status'] == 'failed'
+    assert engine.get_execution_status(plan['id'])['steps'] == {'failed': 1, 'skipped': 2, 'completed': 1}
+
+
+def test_timed_out_subtask_fails_and_the_rest_carries_on():
+    engine = OrchestrationEngine(max_concurrency=4)
+    engine.add_agent(Agent('a1'))
+    engine.add_agent(Agent('a2'))
+    subtasks = [{'id': 'hang', 'description': 'hang', 'timeout': 0.05},
+                {'id': 'after', 'description': 'after', 'dependencies': ['hang']},
+                {'id': 'other', 'description': 'other'}]
+    started = time.perf_counter()
+    plan = engine.execute_plan(engine.create_execution_plan("q", subtasks=subtasks)['id'])
+    assert time.perf_counter() - started < 5
+    assert statuses(plan) == {'hang': 'failed', 'after': 'skipped', 'other': 'completed'}
+    assert plan['steps'][0]['error'] == "Timed out after 0.05 seconds"
+
+
+def test_step_timeout_applies_to_blocking_agents():
+    engine = OrchestrationEngine(step_timeout=0.05)
+    engine.add_agent(BlockingAgent())
+    plan = engine.execute_plan(engine.create_execution_plan("slow")['id'])
+    assert plan['steps'][0]['status'] == 'failed'
+    assert plan['steps'][0]['error'] == "Timed out after 0.05 seconds"
+
+
+def test_concurrency_limits():
+    agent = Agent('a1', delay=0.02)
+    engine = OrchestrationEngine(max_concurrency=10, per_agent_concurrency=2)
+    engine.add_agent(agent)
+    plan = engine.execute_plan(engine.create_execution_plan(';'.join('abcdefgh'))['id'])
+    assert plan['status'] == 'completed'
+    assert agent.peak == 2
+
+
+def test_agents_are_picked_by_skill():
+    engine = OrchestrationEngine()
+    engine.add_agent(Agent('go-dev', ['go']))
+    engine.add_agent(Agent('py-dev', ['python']))
+    plan = engine.create_execution_plan("q", subtasks=[{'id': 's', 'skills': ['python']},
+                                                       {'id': 't', 'skills': ['go'], 'dependencies': ['s']}])
+    assert [step['agent_id'] for step in plan['steps']] == ['py-dev', 'go-dev']
+
+
+def test_cyclic_subtasks_are_rejected():
+    engine = OrchestrationEngine()
+    with pytest.raises(ValueError):
+        engine.create_execution_plan("q", subtasks=[{'id': 's', 'dependencies': ['t']},
+                                                    {'id': 't', 'dependencies': ['s']}])
+
+
+def test_cancel_running_plan():
+    engine = OrchestrationEngine()
+    engine.add_agent(Agent('a1'))
+    plan = engine.create_execution_plan("hang then never")
+
+    async def run_and_cancel():
+        running = asyncio.ensure_future(engine.run_plan(plan['id']))
+        await asyncio.sleep(0.05)
+        assert engine.cancel_execution(plan['id'])
+        return await running
+
+    plan = asyncio.run(run_and_cancel())
+    assert plan['status'] == 'cancelled'
+    assert [step['status'] for step in plan['steps']] == ['cancelled', 'skipped']
+
+
+class Record:
+    """Stored agent record without act(), like the API's AgentModel."""
+    def __init__(self, agent_id):
+        self.id = agent_id
+        self.skills = []
+
+
+def test_stored_records_resolve_to_registered_agents():
+    engine = OrchestrationEngine()
+    worker = Agent('a1')
+    engine.add_agent(worker)
+    other = Agent('a2')
+    assert engine.resolve_agents([Record('a1'), Record('missing'), other]) == [worker, other]
+
+
+def test_finished_plans_are_evicted_past_max_plans():
+    engine = OrchestrationEngine(max_plans=2)
+    engine.add_agent(Agent('a1'))
+    first = engine.create_execution_plan("one")
+    engine.execute_plan(first['id'])
+    assert first['id'] not in engine._plan_agents
+    pending = engine.create_execution_plan("two")
+    third = engine.create_execution_plan("three")
+    assert list(engine.execution_plans) == [pending['id'], third['id']]
+    # Unfinished plans are never evicted, so the cap can be exceeded while they wait.
+    engine.create_execution_plan("four")
+    assert len(engine.execution_plans) == 3
@@ -0,0 +1,60 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import api.main as api_main
+from api.main import app
+from data_storage.vector_db import DataStorage
+
+client = TestClient(app)
+
+
+def seed(monkeypatch, count):
+    monkeypatch.setattr(api_main, 'data_storage', DataStorage())
+    for i in range(count):
+        response = client.post("/tasks", json={"id": f"t{i:02d}", "task_name": f"task {i}", "description": "",
+                                               "status": "Done" if i % 3 == 0 else "Open"})
+        assert response.status_code == 200
+
+
+def test_cursor_walks_every_row_once(monkeypatch):
+    seed(monkeypatch, 25)
+    ids, cursor = [], None
+    while True:
+        response = client.get("/tasks", params={"limit": 10, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids.extend(task["id"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert ids == [f"t{i:02d}" for i in range(25)]
+    assert [t["id"] for t in client.get("/tasks").json()] == ids
+
+
+def test_filters_apply_before_paging(monkeypatch):
+    seed(monkeypatch, 25)
+    first = client.get("/tasks", params={"status": "Done", "limit": 5})
+    assert [t["id"] for t in first.json()] == ["t00", "t03", "t06", "t09", "t12"]
+    rest = client.get("/tasks", params={"status": "Done", "cursor": first.headers["X-Next-Cursor"]})
+    assert [t["id"] for t in rest.json()] == ["t15", "t18", "t21", "t24"]
+    assert "X-Next-Cursor" not in rest.headers
+
+
+def test_ndjson_streams_every_row(monkeypatch):
+    seed(monkeypatch, 1500)
+    response = client.get("/tasks", headers={"Accept": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 1500 and rows[-1]["id"] == "t1499"
+
+    limited = client.get("/tasks", params={"limit": 2}, headers={"Accept": "application/x-ndjson"})
+    assert [json.loads(line)["id"] for line in limited.text.splitlines()] == ["t00", "t01"]
+    assert "X-Next-Cursor" in limited.headers
+
+
+def test_bad_cursor_and_limit_are_rejected(monkeypatch):
+    seed(monkeypatch, 1)
+    assert client.get("/tasks", params={"cursor": "not a cursor"}).status_code == 400
+    assert client.get("/tasks", params={"limit": 0}).status_code == 422
+    assert client.get("/tasks", params={"limit": api_main.MAX_PAGE_SIZE + 1}).status_code == 422
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from data_storage.benchmark import generate_dataset, ground_truth
+from data_storage.vector_db import VectorDB
+
+
+def build(data, **options):
+    db = VectorDB('codec', dim=data.shape[1], metric='l2', **options)
+    db.add_embeddings([str(row) for row in range(data.shape[0])], data, [{} for _ in range(data.shape[0])])
+    if db.codec_type != 'none':
+        db.train_codec()
+    return db
+
+
+def recall(db, data, queries, k=10, **query_options):
+    truth = ground_truth(data, queries, k, 'l2')
+    found = 0
+    for query, expected in zip(queries, truth):
+        hits = {int(hit['id']) for hit in db.query(query.tolist(), top_k=k, **query_options)}
+        found += len(hits & set(expected.tolist()))
+    return found / truth.size
+
+
+@pytest.mark.parametrize('codec, options, floor', [
+    ('sq8', {}, 0.9),
+    ('pq', {'m': 8}, 0.3),
+])
+def test_codec_recall_against_flat(codec, options, floor):
+    data, queries = generate_dataset(2000, 32, clusters=20, queries=20)
+    db = build(data, codec=codec, codec_options=options)
+    assert recall(db, data, queries) >= floor
+    assert recall(db, data, queries, rerank=100) >= 0.95
+
+
+def test_memory_mode_reports_codes_and_full_precision_rows():
+    data, _ = generate_dataset(500, 32, clusters=5, queries=1)
+    info = build(data, codec='pq', codec_options={'m': 8}).get_info()
+    assert info['code_bytes_per_vector'] == 8
+    assert info['full_precision_bytes_per_vector'] == 4 * 32
+    assert info['bytes_per_vector'] == 8 + 4 * 32
+    assert build(data).get_info()['bytes_per_vector'] == 4 * 32
+
+
+def test_persistent_mode_reports_only_the_codes(tmp_path):
+    data, _ = generate_dataset(500, 32, clusters=5, queries=1)
+    db = build(data, codec='sq8', path=str(tmp_path))
+    info = db.get_info()
+    assert info['bytes_per_vector'] == info['code_bytes_per_vector'] == 32 + 4
+    db.close()
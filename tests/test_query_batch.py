@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from data_storage.vector_db import VectorDB
+
+
+def make_db(rows=500, **options):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(rows, 8)).astype(np.float32)
+    db = VectorDB('batch', dim=8, **options)
+    db.add_embeddings([f"doc-{row}" for row in range(rows)], vectors,
+                      [{'group': row % 3} for row in range(rows)])
+    return db, rng.normal(size=(20, 8)).astype(np.float32)
+
+
+def same_hits(batch, single):
+    assert [hit['id'] for hit in batch] == [hit['id'] for hit in single]
+    assert np.allclose([hit['score'] for hit in batch], [hit['score'] for hit in single], atol=1e-5)
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'l2'])
+def test_sharded_scan_matches_query(metric):
+    db, queries = make_db(metric=metric)
+    db.delete_embedding('doc-3')
+    results = db.query_batch(queries, top_k=7, shard_rows=64)
+    for query, hits in zip(queries, results):
+        same_hits(hits, db.query(query.tolist(), top_k=7))
+
+
+def test_filtered_and_indexed_batches_match_query():
+    db, queries = make_db(index='ivf', index_options={'nlist': 8})
+    db.train_index()
+    results = db.query_batch(queries, top_k=5, nprobe=2, filter={'group': 1})
+    for query, hits in zip(queries, results):
+        same_hits(hits, db.query(query.tolist(), top_k=5, nprobe=2, filter={'group': 1}))
+        assert all(hit['metadata']['group'] == 1 for hit in hits)
+
+
+def test_packed_results_pad_short_rows():
+    db, queries = make_db(rows=5)
+    db.delete_embedding('doc-0')
+    packed = db.query_batch(queries[:2], top_k=10, packed=True)
+    assert packed.ids.shape == packed.scores.shape == packed.rows.shape == (2, 4)
+    assert (np.diff(packed.scores, axis=1) <= 0).all()
+    filtered = db.query_batch(queries[:2], top_k=10, packed=True, filter={'group': 2})
+    assert filtered.ids[:, 0].tolist() == ['doc-2', 'doc-2']
+    assert filtered.ids[:, 1:].tolist() == [[None] * 3, [None] * 3]
+    assert (filtered.rows[:, 1:] == -1).all() and np.isneginf(filtered.scores[:, 1:]).all()
+    assert db.query_batch(queries[:2], top_k=0) == [[], []]
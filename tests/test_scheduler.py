@@ -0,0 +1,39 @@
+from api.main import TaskModel
+from data_storage.vector_db import DataStorage
+from project_management.scheduler import TaskScheduler
+
+
+def api_task(task_id, priority="Normal", due_date=None, dependencies=()):
+    return TaskModel(id=task_id, task_name=task_id, description="Scheduler test", priority=priority,
+                     due_date=due_date, dependencies=list(dependencies))
+
+
+def test_priority_then_due_date_order():
+    storage = DataStorage()
+    storage.store_task(api_task('late', due_date="2030-06-01T00:00:00"))
+    storage.store_task(api_task('early', due_date="2030-01-01T00:00:00"))
+    storage.store_task(api_task('urgent', priority="High"))
+    storage.store_task(api_task('undated'))
+    scheduler = TaskScheduler(storage)
+    assert scheduler.peek(4) == ['urgent', 'early', 'late', 'undated']
+
+
+def test_free_text_due_date_sorts_as_undated():
+    storage = DataStorage()
+    storage.store_task(api_task('b-vague', due_date="next friday"))
+    storage.store_task(api_task('a-dated', due_date="2030-01-01T00:00:00"))
+    storage.store_task(api_task('c-undated'))
+    scheduler = TaskScheduler(storage)
+    assert scheduler.peek(3) == ['a-dated', 'b-vague', 'c-undated']
+
+
+def test_dependents_wait_for_dependencies():
+    storage = DataStorage()
+    storage.store_task(api_task('first'))
+    storage.store_task(api_task('second', priority="High", dependencies=['first']))
+    scheduler = TaskScheduler(storage)
+    assert scheduler.peek(2) == ['first']
+    done = api_task('first')
+    done.status = 'Done'
+    storage.store_task(done)
+    assert scheduler.peek(2) == ['second']
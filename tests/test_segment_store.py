@@ -0,0 +1,124 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from data_storage.segment_store import MANIFEST_FILE, SegmentStore
+
+
+def write_rows(path, rows, segment_rows=4, dim=3):
+    store = SegmentStore(path, segment_rows=segment_rows)
+    store.initialize(dim, 'l2')
+    store.load()
+    for row in range(rows):
+        vector = np.full((1, dim), row, dtype=np.float32)
+        store.append(vector, (vector ** 2).sum(axis=1), [[f"doc-{row}", {'row': row}]])
+        if store.active_rows == segment_rows:
+            store.seal()
+    return store
+
+
+def reopen(path, segment_rows=4):
+    store = SegmentStore(path, segment_rows=segment_rows)
+    return store, store.load()
+
+
+def doc_ids(state):
+    return [record[0] for record in state['records']]
+
+
+def test_reopen_after_deletes(tmp_path):
+    store = write_rows(str(tmp_path), 10)
+    store.delete(2)
+    store.delete(7)
+    store.close()
+    store, state = reopen(str(tmp_path))
+    assert len(state['sealed']) == 2
+    assert doc_ids(state) == [f"doc-{row}" for row in range(10)]
+    assert state['deleted'] == [2, 7]
+    store.close()
+
+
+def test_reopen_after_compaction(tmp_path):
+    store = write_rows(str(tmp_path), 10)
+    live = np.ones(10, dtype=bool)
+    for row in (1, 5, 9):
+        store.delete(row)
+        live[row] = False
+    assert store.compact(live, min_segment_rows=2) == 3
+    store.delete(0)
+    store.close()
+    store, state = reopen(str(tmp_path))
+    assert doc_ids(state) == [f"doc-{row}" for row in range(10) if live[row]]
+    assert state['deleted'] == [0]
+    vectors = np.concatenate([vectors for vectors, _ in state['sealed']] + [state['active'][0]])
+    assert vectors[:, 0].tolist() == [float(row) for row in range(10) if live[row]]
+    store.close()
+
+
+def test_crash_after_compaction_manifest_drops_old_deletes(tmp_path, monkeypatch):
+    store = write_rows(str(tmp_path), 8)
+    store.delete(3)
+    live = np.ones(8, dtype=bool)
+    live[3] = False
+    write_manifest = SegmentStore._write_manifest
+
+    def crash_after_write(self):
+        write_manifest(self)
+        raise OSError("crash")
+
+    monkeypatch.setattr(SegmentStore, '_write_manifest', crash_after_write)
+    with pytest.raises(OSError):
+        store.compact(live, min_segment_rows=8)
+    monkeypatch.undo()
+    store, state = reopen(str(tmp_path))
+    # Row 3 of the old numbering is doc-4 now; the old log must not delete it.
+    assert doc_ids(state) == [f"doc-{row}" for row in range(8) if row != 3]
+    assert state['deleted'] == []
+    store.close()
+
+
+def test_crash_before_compaction_manifest_keeps_old_state(tmp_path, monkeypatch):
+    store = write_rows(str(tmp_path), 8)
+    store.delete(3)
+    live = np.ones(8, dtype=bool)
+    live[3] = False
+
+    def crash(self):
+        raise OSError("crash")
+
+    monkeypatch.setattr(SegmentStore, '_write_manifest', crash)
+    with pytest.raises(OSError):
+        store.compact(live, min_segment_rows=8)
+    monkeypatch.undo()
+    store, state = reopen(str(tmp_path))
+    assert doc_ids(state) == [f"doc-{row}" for row in range(8)]
+    assert state['deleted'] == [3]
+    store.close()
+
+
+def test_manifest_without_deletes_generation_reads_deletes_log(tmp_path):
+    store = write_rows(str(tmp_path), 3)
+    store.delete(1)
+    store.close()
+    manifest = os.path.join(str(tmp_path), MANIFEST_FILE)
+    with open(manifest) as f:
+        data = json.load(f)
+    del data['deletes_generation']
+    with open(manifest, 'w') as f:
+        json.dump(data, f)
+    store, state = reopen(str(tmp_path))
+    assert state['deleted'] == [1]
+    store.close()
+
+
+def test_truncated_active_row_is_dropped(tmp_path):
+    store = write_rows(str(tmp_path), 6)
+    store.close()
+    with open(os.path.join(str(tmp_path), 'seg-000002.vec'), 'ab') as f:
+        f.write(b'\x00' * 5)
+    store, state = reopen(str(tmp_path))
+    assert doc_ids(state) == [f"doc-{row}" for row in range(6)]
+    assert state['active'][0].shape == (2, 3)
+    store.close()
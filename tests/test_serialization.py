@@ -0,0 +1,72 @@
+import json
+import pickle
+
+from project_management.base_project import BaseProject
+from project_management.serialization import encode_item, encode_items
+from project_management.task import Task
+
+
+def project_with_tasks():
+    project = BaseProject("p", "project", "goal")
+    parent, child = Task("parent", ""), Task("child", "")
+    parent.add_subtask(child)
+    project.add_task(parent)
+    return project, parent, child
+
+
+def test_to_json_matches_to_dict():
+    project, parent, child = project_with_tasks()
+    child.add_tag("urgent")
+    assert json.loads(parent.to_json()) == json.loads(json.dumps(parent.to_dict()))
+    assert json.loads(project.to_json()) == json.loads(json.dumps(project.to_dict()))
+    assert json.loads(encode_items([parent, child])) == [parent.to_dict(), child.to_dict()]
+
+
+def test_cache_is_reused_until_something_changes():
+    project, parent, child = project_with_tasks()
+    first = parent.to_dict()
+    assert parent.to_dict() is first and parent.to_json() is parent.to_json()
+    parent.add_tag("x")
+    assert parent.to_dict() is not first and parent.to_dict()["tags"] == ["x"]
+
+
+def test_changed_subtask_invalidates_every_ancestor():
+    project, parent, child = project_with_tasks()
+    project.to_json(), parent.to_json()
+    sibling = Task("sibling", "")
+    project.add_task(sibling)
+    sibling_json = sibling.to_json()
+    child.update_status("Done")
+    assert json.loads(project.to_json())["tasks"][0]["subtasks"][0]["status"] == "Done"
+    assert project.to_dict()["tasks"][0]["subtasks"][0]["status"] == "Done"
+    assert sibling.to_json() is sibling_json
+
+
+def test_detached_subtask_no_longer_invalidates():
+    project, parent, child = project_with_tasks()
+    parent.remove_subtask(child.id)
+    cached = parent.to_json()
+    child.task_name = "renamed"
+    assert parent.to_json() is cached
+    parent.subtasks = [child]
+    child.task_name = "again"
+    assert json.loads(parent.to_json())["subtasks"][0]["task_name"] == "again"
+
+
+def test_in_place_changes_need_invalidate():
+    task = Task("t", "")
+    cached = task.to_json()
+    task.tags.append("direct")
+    assert task.to_json() is cached
+    task.invalidate()
+    assert json.loads(task.to_json())["tags"] == ["direct"]
+
+
+def test_pickled_objects_rebuild_parent_links():
+    project, parent, child = project_with_tasks()
+    project.to_json()
+    copy = pickle.loads(pickle.dumps(project))
+    assert json.loads(copy.to_json()) == json.loads(project.to_json())
+    copy.tasks[0].subtasks[0].update_status("Done")
+    assert copy.to_dict()["tasks"][0]["subtasks"][0]["status"] == "Done"
+    assert project.to_dict()["tasks"][0]["subtasks"][0]["status"] == "Open"
@@ -0,0 +1,55 @@
+import pytest
+
+from agent_definition.skill import Skill, skill_closure
+
+
+def tree():
+    backend = Skill("backend", "expert")
+    python = Skill("python", "advanced")
+    asyncio = Skill("asyncio", "intermediate")
+    python.add_sub_skill(asyncio)
+    backend.add_sub_skill(python)
+    return backend, python, asyncio
+
+
+def test_closure_maps_names_to_shallowest_depth():
+    backend, python, asyncio = tree()
+    backend.add_sub_skill(Skill("asyncio", "novice"))
+    assert dict(backend.closure()) == {"backend": (0, "expert"), "python": (1, "advanced"),
+                                       "asyncio": (1, "novice")}
+
+
+def test_changes_below_invalidate_every_ancestor():
+    backend, python, asyncio = tree()
+    cached = backend.closure()
+    assert backend.closure() is cached
+    asyncio.proficiency_level = "expert"
+    assert backend.closure()["asyncio"] == (2, "expert")
+    assert python.closure()["asyncio"] == (1, "expert")
+    asyncio.skill_name = "trio"
+    assert "trio" in backend.closure() and "asyncio" not in backend.closure()
+    assert python.remove_sub_skill("trio")
+    assert set(backend.closure()) == {"backend", "python"}
+
+
+def test_in_place_edits_need_invalidate():
+    backend, python, _ = tree()
+    backend.closure()
+    python.sub_skills.append(Skill("typing", "advanced"))
+    assert "typing" not in backend.closure()
+    python.invalidate()
+    assert backend.closure()["typing"] == (2, "advanced")
+
+
+def test_cycles_are_rejected():
+    backend, python, asyncio = tree()
+    with pytest.raises(ValueError):
+        asyncio.add_sub_skill(backend)
+
+
+def test_skill_closure_merges_skills_and_plain_names():
+    backend, _, _ = tree()
+    merged = skill_closure([backend, "go", Skill("python", "expert")])
+    assert merged["python"] == (0, "expert")
+    assert merged["go"] == (0, None)
+    assert merged["asyncio"] == (2, "intermediate")
@@ -0,0 +1,94 @@
+import random
+
+import numpy as np
+
+from agent_definition.base_agent import BaseAgent
+from agent_definition.role_template import RoleTemplate
+from agent_definition.skill import Skill
+from agent_definition.skill_index import SkillIndex
+from data_storage.vector_db import DataStorage
+
+
+def agent(agent_id, skills):
+    obj = BaseAgent(agent_id, None, skills)
+    obj.id = agent_id
+    return obj
+
+
+def role(role_id, skills):
+    obj = RoleTemplate(role_id, skills, "")
+    obj.id = role_id
+    return obj
+
+
+def test_queries_match_subset_checks_across_words():
+    rng = random.Random(0)
+    vocabulary = [f"skill{i}" for i in range(150)]
+    agents = [agent(f"a{i}", rng.sample(vocabulary, 40)) for i in range(60)]
+    roles = [role(f"r{i}", rng.sample(vocabulary, rng.randint(0, 3))) for i in range(20)]
+    index = SkillIndex()
+    for obj in agents:
+        index.add_agent(obj)
+    for obj in roles:
+        index.add_role(obj)
+    assert index.get_info()["words"] == 3
+
+    agent_ids, role_ids, fits = index.compatibility()
+    expected = np.array([[set(r.skills_required) <= set(a.skills) for r in roles] for a in agents])
+    assert agent_ids == [a.id for a in agents] and role_ids == [r.id for r in roles]
+    assert np.array_equal(fits, expected)
+    for j, r in enumerate(roles):
+        assert index.agents_for_role(r) == [a.id for a, ok in zip(agents, expected[:, j]) if ok]
+    assert index.roles_for_agent(agents[0]) == [r.id for r, ok in zip(roles, expected[0]) if ok]
+
+
+def test_skill_objects_bring_their_sub_skills():
+    python = Skill("python", "advanced")
+    python.add_sub_skill(Skill("asyncio", "intermediate"))
+    index = SkillIndex()
+    index.add_agent(agent("a1", [python]))
+    index.add_agent(agent("a2", ["python"]))
+    assert index.agents_with_skills(["asyncio"]) == ["a1"]
+    assert index.agents_with_skills(["python"]) == ["a1", "a2"]
+    python.sub_skills[0].skill_name = "trio"
+    index.add_agent(agent("a1", [python]))
+    assert index.agents_with_skills(["asyncio"]) == []
+    assert index.agents_with_skills(["trio"]) == ["a1"]
+
+
+def test_removed_rows_are_reused():
+    index = SkillIndex()
+    index.add_agent(agent("a1", ["go"]))
+    index.add_agent(agent("a2", ["go"]))
+    assert index.remove_agent("a1") and not index.remove_agent("a1")
+    index.add_agent(agent("a3", ["go", "rust"]))
+    assert sorted(index.agents_with_skills(["go"])) == ["a2", "a3"]
+    assert index.agents_with_skills(["rust"]) == ["a3"]
+    assert index.get_info()["agents"] == 2
+
+
+def test_sync_follows_storage_changes():
+    storage = DataStorage()
+    storage.store_agent(agent("a1", ["go"]))
+    index = SkillIndex(storage)
+    assert index.agents_with_skills(["go"]) == ["a1"]
+    storage.store_agent(agent("a2", ["go", "python"]))
+    storage.store_agent(agent("a1", ["python"]))
+    storage.store_task(type("Task", (), {"id": "t1"})())
+    assert sorted(index.agents_with_skills(["python"])) == ["a1", "a2"]
+    assert index.agents_with_skills(["go"]) == ["a2"]
+    storage.delete_agent("a2")
+    assert index.agents_with_skills(["python"]) == ["a1"]
+
+
+def test_sync_rebuilds_when_the_log_cannot_be_followed():
+    storage = DataStorage(change_log_size=2)
+    index = SkillIndex(storage)
+    for i in range(5):
+        storage.store_agent(agent(f"a{i}", ["go"]))
+    assert index.agents_with_skills(["go"]) == [f"a{i}" for i in range(5)]
+
+    replacement = DataStorage()
+    replacement.store_agent(agent("b1", ["go"]))
+    index.storage = replacement
+    assert index.agents_with_skills(["go"]) == ["b1"]
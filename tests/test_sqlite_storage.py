@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from data_storage.sqlite_storage import SQLiteDataStorage
+from project_management.assignment import Assignment
+from project_management.task import Task
+
+
+def task(name, status='Open', tags=()):
+    obj = Task(name, f"{name} description", status)
+    obj.id = name
+    obj.tags = list(tags)
+    return obj
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'storage.db')
+
+
+def test_round_trip_and_reopen(path):
+    storage = SQLiteDataStorage(path)
+    storage.store_tasks([task(f"t{i}", 'Done' if i % 2 else 'Open', ['odd' if i % 2 else 'even']) for i in range(10)])
+    storage.store_task(task('t0', 'Done', ['even', 'urgent']))
+    assert storage.get_task('t0').to_dict()['tags'] == ['even', 'urgent']
+    assert storage.get_task('t0') is not storage.get_task('t0')
+    assert storage.delete_task('t9') and not storage.delete_task('t9')
+    epoch, version = storage.version_epoch, storage.version('task_repository')
+    assert version == 12
+    storage.close()
+
+    storage = SQLiteDataStorage(path)
+    assert (storage.version_epoch, storage.version('task_repository')) == (epoch, version)
+    assert [t.id for t in storage.list_tasks()] == [f"t{i}" for i in range(9)]
+    assert [t.id for t in storage.find_tasks(status='Done')] == ['t0', 't1', 't3', 't5', 't7']
+    assert [t.id for t in storage.find_tasks(tag='urgent')] == ['t0']
+    assert [t.id for t in storage.find_tasks(tag='even', status='Open')] == ['t2', 't4', 't6', 't8']
+    assert storage.object_version('task_repository', 't0') == 11
+    assert storage.object_version('task_repository', 't9') is None
+    storage.close()
+
+
+def test_pages_are_stable_across_upserts(path):
+    storage = SQLiteDataStorage(path)
+    storage.store_tasks([task(f"t{i}") for i in range(7)])
+    page, cursor = storage.page_tasks(limit=3)
+    assert [t.id for t in page] == ['t0', 't1', 't2']
+    storage.store_task(task('t1', 'Done'))
+    ids = [t.id for t in page]
+    while cursor is not None:
+        page, cursor = storage.page_tasks(after=cursor, limit=3)
+        ids.extend(t.id for t in page)
+    assert ids == [f"t{i}" for i in range(7)]
+    with pytest.raises(ValueError):
+        storage.page_tasks(limit=0)
+    storage.close()
+
+
+def test_apply_batch_is_one_transaction(path):
+    storage = SQLiteDataStorage(path)
+    assignment = Assignment('t1', 'a1')
+    with pytest.raises(ValueError):
+        storage.apply_batch([('store', 'task_repository', task('t1')), ('store', 'nowhere', task('t2'))])
+    assert storage.list_tasks() == []
+    assert storage.apply_batch([('store', 'task_repository', task('t1')),
+                                ('store', 'assignment_repository', assignment),
+                                ('delete', 'task_repository', 'missing')]) == [None, None, False]
+    assert [a.id for a in storage.find_assignments(agent_id='a1', task_id='t1')] == [assignment.id]
+    changes = storage.change_log.since(0)
+    assert [(c.op, c.repository, c.id) for c in changes] == [
+        ('store', 'task_repository', 't1'), ('store', 'assignment_repository', assignment.id)]
+    storage.close()
+
+
+def test_concurrent_writers_and_readers(path):
+    storage = SQLiteDataStorage(path, pool_size=2)
+    errors = []
+
+    def write(start):
+        try:
+            for i in range(start, start + 50):
+                storage.store_task(task(f"t{i}"))
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            for _ in range(50):
+                storage.find_tasks(status='Open')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(i * 50,)) for i in range(3)]
+    threads += [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(storage.list_tasks()) == 150
+    assert storage.version('task_repository') == 150
+    storage.close()
@@ -0,0 +1,111 @@
+import threading
+
+import numpy as np
+import pytest
+
+from data_storage.vector_db import VectorDB
+
+
+def embeddings(rows, dim=8, seed=0):
+    return np.random.default_rng(seed).normal(size=(rows, dim)).astype(np.float32)
+
+
+def fill(db, rows):
+    vectors = embeddings(rows)
+    db.add_embeddings([f"doc-{row}" for row in range(rows)], vectors,
+                      [{'row': row, 'text': f"document {row}"} for row in range(rows)])
+    return vectors
+
+
+def test_query_finds_exact_match():
+    db = VectorDB('memory', dim=8)
+    vectors = fill(db, 50)
+    assert db.query(vectors[7].tolist(), top_k=1)[0]['id'] == 'doc-7'
+    assert db.delete_embedding('doc-7')
+    assert all(hit['id'] != 'doc-7' for hit in db.query(vectors[7].tolist(), top_k=5))
+    assert db.compact() == 1
+    assert len(db) == 49
+    assert db.query(vectors[8].tolist(), top_k=1)[0]['id'] == 'doc-8'
+
+
+@pytest.mark.parametrize('metric', ['cosine', 'dot', 'l2'])
+def test_top_k_matches_brute_force(metric):
+    db = VectorDB('memory', dim=8, metric=metric, initial_capacity=4)
+    vectors = fill(db, 300)
+    db.delete_embedding('doc-5')
+    query = embeddings(1, seed=1)[0]
+    stored = vectors / np.linalg.norm(vectors, axis=1, keepdims=True) if metric == 'cosine' else vectors
+    if metric == 'l2':
+        expected = -((stored - query) ** 2).sum(axis=1)
+    else:
+        expected = stored @ (query / np.linalg.norm(query) if metric == 'cosine' else query)
+    expected[5] = -np.inf
+    order = np.argsort(-expected)[:10]
+    hits = db.query(query.tolist(), top_k=10)
+    assert [hit['id'] for hit in hits] == [f"doc-{row}" for row in order]
+    assert np.allclose([hit['score'] for hit in hits], expected[order], rtol=1e-4, atol=1e-4)
+    assert hits[0]['metadata'] == {'row': int(order[0]), 'text': f"document {order[0]}"}
+
+
+def test_dimension_mismatch_and_re_adding_an_id():
+    db = VectorDB('memory')
+    db.add_embedding('a', [1.0, 0.0, 0.0], {'v': 1})
+    with pytest.raises(ValueError):
+        db.add_embedding('b', [1.0, 0.0], {})
+    db.add_embedding('a', [0.0, 1.0, 0.0], {'v': 2})
+    assert len(db) == 1
+    assert db.query([0.0, 1.0, 0.0], top_k=5) == [{'id': 'a', 'score': pytest.approx(1.0), 'metadata': {'v': 2}}]
+
+
+def test_persistent_reopen_after_deletes_and_compaction(tmp_path):
+    path = str(tmp_path)
+    db = VectorDB('disk', dim=8, path=path, segment_rows=16)
+    vectors = fill(db, 40)
+    for row in (3, 17, 30):
+        db.delete_embedding(f"doc-{row}")
+    db.close()
+
+    db = VectorDB('disk', path=path, segment_rows=16)
+    assert len(db) == 37
+    assert db.query(vectors[17].tolist(), top_k=1)[0]['id'] != 'doc-17'
+    assert db.compact() == 3
+    db.delete_embedding('doc-4')
+    db.close()
+
+    db = VectorDB('disk', path=path, segment_rows=16)
+    assert len(db) == 36
+    for row in (5, 18, 39):
+        hit = db.query(vectors[row].tolist(), top_k=1)[0]
+        assert hit['id'] == f"doc-{row}"
+        assert hit['metadata']['row'] == row
+    assert 'doc-4' not in [hit['id'] for hit in db.query(vectors[4].tolist(), top_k=5)]
+    db.close()
+
+
+def test_queries_during_compaction_see_consistent_rows(tmp_path):
+    db = VectorDB('disk', dim=8, path=str(tmp_path), segment_rows=64)
+    vectors = fill(db, 512)
+    errors = []
+    done = threading.Event()
+
+    def query():
+        try:
+            while not done.is_set():
+                for row in (10, 200, 511):
+                    hit = db.query(vectors[row].tolist(), top_k=1)[0]
+                    assert hit['id'] == f"doc-{row}", hit
+                db.query_batch(vectors[:4], top_k=1)
+        except Exception as e:  # surfaced in the main thread below
+            errors.append(e)
+
+    threads = [threading.Thread(target=query) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for row in range(1, 10):
+        db.delete_embedding(f"doc-{row}")
+        db.compact(min_segment_rows=64)
+    done.set()
+    for thread in threads:
+        thread.join()
+    db.close()
+    assert errors == []